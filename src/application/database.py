@@ -1,5 +1,6 @@
 from contextlib import suppress
 from functools import wraps
+from time import perf_counter
 
 from loguru import logger
 from sqlalchemy.exc import IntegrityError, PendingRollbackError
@@ -11,18 +12,47 @@ from src.infrastructure.database.services.session import (
     get_session,
 )
 from src.infrastructure.errors import DatabaseError
+from src.infrastructure.metrics import Metrics
 
 
-def transaction(coro):
+def update_session(coro):
+    """Use a separate session for each update, so concurrent updates
+    do not share the connection outside of the transaction.
+    """
 
     @wraps(coro)
     async def inner(*args, **kwargs):
         session: AsyncSession = get_session()
-        CTX_SESSION.set(session)
+        token = CTX_SESSION.set(session)
+
+        try:
+            return await coro(*args, **kwargs)
+        finally:
+            CTX_SESSION.reset(token)
+            await session.close()
+
+    return inner
+
+
+def transaction(coro):
+
+    @wraps(coro)
+    async def inner(*args, **kwargs):
+        # NOTE: The session of the update (see `update_session`) is reused
+        #       to avoid holding two connections by the single update
+        try:
+            session: AsyncSession = CTX_SESSION.get()
+        except LookupError:
+            session = get_session()
+            CTX_SESSION.set(session)
+
+        started = perf_counter()
+        committed = False
 
         try:
             result = await coro(*args, **kwargs)
             await session.commit()
+            committed = True
             return result
         except DatabaseError as error:
             logger.error(f"Rolling back changes.\n{error}")
@@ -45,5 +75,11 @@ def transaction(coro):
             await session.rollback()
         finally:
             await session.close()
+            Metrics.observe(
+                f"transaction.latency:{coro.__qualname__}",
+                (perf_counter() - started) * 1000,
+            )
+            if not committed:
+                Metrics.increment(f"transaction.rollbacks:{coro.__qualname__}")
 
     return inner
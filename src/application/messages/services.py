@@ -1,10 +1,12 @@
 import asyncio
 from contextlib import suppress
+from typing import IO
 
 from telebot import types
 
 from src.application.messages.constants import DEFAULT_SEND_SETTINGS
-from src.infrastructure.telegram import bot
+from src.infrastructure.metrics import telegram_call
+from src.infrastructure.telegram import get_bot
 
 __all__ = ("CallbackMessages", "Messages")
 
@@ -17,19 +19,21 @@ class CallbackMessages:
         text: str,
         keyboard: types.InlineKeyboardMarkup | None = None,
     ):
-        await bot.edit_message_text(
-            chat_id=q.message.chat.id,
-            message_id=q.message.id,
-            text=text,
-            reply_markup=keyboard,
-            **DEFAULT_SEND_SETTINGS,
-        )
+        with telegram_call("edit_message_text"):
+            await get_bot().edit_message_text(
+                chat_id=q.message.chat.id,
+                message_id=q.message.id,
+                text=text,
+                reply_markup=keyboard,
+                **DEFAULT_SEND_SETTINGS,
+            )
 
     @staticmethod
     async def delete(q: types.CallbackQuery):
-        await bot.delete_message(
-            chat_id=q.message.chat.id, message_id=q.message.id
-        )
+        with telegram_call("delete_message"):
+            await get_bot().delete_message(
+                chat_id=q.message.chat.id, message_id=q.message.id
+            )
 
 
 class Messages:
@@ -49,13 +53,35 @@ class Messages:
         }
         kwargs = DEFAULT_SEND_SETTINGS | kwargs | telebot_payload
 
-        return await bot.send_message(**kwargs)
+        with telegram_call("send_message"):
+            return await get_bot().send_message(**kwargs)
+
+    @staticmethod
+    async def send_document(
+        chat_id: int,
+        document: IO[bytes],
+        file_name: str,
+        keyboard: types.ReplyKeyboardMarkup | types.InlineKeyboardMarkup,
+        caption: str | None = None,
+    ) -> types.Message:
+
+        with telegram_call("send_document"):
+            return await get_bot().send_document(
+                chat_id=chat_id,
+                document=document,
+                visible_file_name=file_name,
+                caption=caption,
+                reply_markup=keyboard,
+                **DEFAULT_SEND_SETTINGS,
+            )
 
     @staticmethod
     async def _delete(chat_id: int, message_id: int) -> None:
 
-        with suppress(Exception):
-            await bot.delete_message(chat_id=chat_id, message_id=message_id)
+        with suppress(Exception), telegram_call("delete_message"):
+            await get_bot().delete_message(
+                chat_id=chat_id, message_id=message_id
+            )
 
     @classmethod
     async def delete(cls, chat_id: int, *message_ids: int) -> None:
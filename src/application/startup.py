@@ -0,0 +1,143 @@
+"""
+This module includes the application startup pipeline.
+Phases are executed one by one and each of them is measured:
+    1. imports: the router and the startup services are imported
+    2. database: waits for the database and runs migrations if needed
+    3. bot: the bot is created and handlers are registered
+    4. warm-up: the pool connections, the reference data
+       and the handlers modules are prepared concurrently
+After the warm-up the bot is ready to start polling.
+"""
+
+import asyncio
+from contextlib import contextmanager
+from importlib import import_module
+from time import perf_counter
+from typing import TYPE_CHECKING, Coroutine, Generator
+
+from loguru import logger
+from pydantic import Field
+
+from src.infrastructure.models import InternalModel
+from src.settings import DATABASE_POOL_SIZE
+
+if TYPE_CHECKING:
+    from telebot.async_telebot import AsyncTeleBot
+
+__all__ = ("StartupPhase", "StartupReport", "startup", "warm_up")
+
+
+class StartupPhase(InternalModel):
+    name: str
+    duration: float
+    error: str | None = None
+
+
+class StartupReport(InternalModel):
+    phases: list[StartupPhase] = Field(default_factory=list)
+
+    @property
+    def ready(self) -> bool:
+        return not any(phase.error for phase in self.phases)
+
+    @contextmanager
+    def measure(self, name: str) -> Generator[None, None, None]:
+        started = perf_counter()
+
+        try:
+            yield
+        except Exception as error:
+            self._add(name, started, error)
+            raise
+
+        self._add(name, started)
+
+    async def measure_coro(self, name: str, coro: Coroutine) -> None:
+        """Warm-up steps are optional, so errors are only reported."""
+
+        started = perf_counter()
+
+        try:
+            await coro
+        except Exception as error:
+            logger.error(f"Startup phase {name} failed: {error}")
+            self._add(name, started, error)
+        else:
+            self._add(name, started)
+
+    def _add(
+        self, name: str, started: float, error: Exception | None = None
+    ) -> None:
+        self.phases.append(
+            StartupPhase(
+                name=name,
+                duration=perf_counter() - started,
+                error=repr(error) if error else None,
+            )
+        )
+
+    def represent(self) -> str:
+        return "\n".join(
+            f"{phase.name:<20} {phase.duration * 1000:>10.2f} ms"
+            + (f"  ❌ {phase.error}" if phase.error else "")
+            for phase in self.phases
+        )
+
+
+async def _preload_reference_data() -> None:
+    from src.domain.categories import services as categories_services
+    from src.infrastructure.database import (
+        CTX_SESSION,
+        create_categories_if_not_exist,
+        get_session,
+    )
+
+    # NOTE: The task has its own context, so the session is not shared
+    session = get_session()
+    CTX_SESSION.set(session)
+
+    try:
+        await create_categories_if_not_exist()
+        await categories_services.preload()
+    finally:
+        await session.close()
+
+
+async def warm_up(report: StartupReport) -> None:
+    from src.handlers.router import preload_callbacks
+    from src.infrastructure.database import open_pool_connections
+
+    await asyncio.gather(
+        report.measure_coro(
+            "pool", open_pool_connections(DATABASE_POOL_SIZE)
+        ),
+        report.measure_coro("reference data", _preload_reference_data()),
+        report.measure_coro("handlers", asyncio.to_thread(preload_callbacks)),
+    )
+
+
+async def startup(report: StartupReport | None = None) -> "AsyncTeleBot":
+    report = report or StartupReport()
+
+    with report.measure("imports"):
+        router = import_module("src.handlers.router")
+        migrations = import_module(
+            "src.infrastructure.database.services.migrations"
+        )
+
+    with report.measure("database"):
+        await migrations.wait_for_database()
+        await migrations.upgrade_if_needed()
+
+    with report.measure("bot"):
+        from src.infrastructure.telegram import get_bot
+
+        bot = get_bot()
+        router.register_handlers(bot)
+
+    with report.measure("warm-up"):
+        await warm_up(report)
+
+    logger.info(f"Startup report:\n{report.represent()}")
+
+    return bot
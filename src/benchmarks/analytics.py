@@ -0,0 +1,133 @@
+"""
+The latency of analytics services on the database from the settings.
+It is supposed to be run on the seeded ledger (see `seed`).
+
+The fetch of costs, incomes and currency exchanges is measured
+separately: sequentially on the single session (as analytics services do)
+and concurrently in the shared snapshot.
+Analytics are measured with the empty cache and with the cached range.
+
+Usage:
+    python -m src.benchmarks.analytics [--range 2025-03] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+from statistics import median
+from time import perf_counter
+from typing import Awaitable, Callable
+
+from src.domain.analytics import AnalyticsCRUD, ReportDocument
+from src.domain.analytics import services as analytics_services
+from src.domain.costs import CostsCRUD
+from src.domain.currency_exchange import CurrencyExchangeCRUD
+from src.domain.incomes import IncomesCRUD
+from src.infrastructure.cache import Cache
+from src.infrastructure.database.services.session import (
+    CTX_SESSION,
+    gather_in_snapshot,
+    get_engine,
+    get_session,
+)
+
+
+async def _measure(
+    call: Callable[[], Awaitable[object]], repeat: int
+) -> tuple[float, float]:
+    """Return the median and the best latency in milliseconds.
+    Each call has a fresh session as the update does.
+    """
+
+    timings: list[float] = []
+
+    for _ in range(repeat):
+        session = get_session()
+        token = CTX_SESSION.set(session)
+        started = perf_counter()
+
+        try:
+            await call()
+        finally:
+            timings.append((perf_counter() - started) * 1000)
+            CTX_SESSION.reset(token)
+            await session.close()
+
+    return median(timings), min(timings)
+
+
+async def _consume(frames) -> None:
+    async for frame in frames:
+        if isinstance(frame, ReportDocument):
+            frame.file.close()
+
+
+async def run(pattern: str, repeat: int) -> dict[str, tuple[float, float]]:
+    start, end = analytics_services.dates_range_by_pattern(pattern)
+
+    def cold(coro: Callable[[], Awaitable[object]]):
+        async def inner():
+            Cache.invalidate(AnalyticsCRUD.CACHE_NAMESPACE)
+            await coro()
+
+        return inner
+
+    async def sequential_fetch():
+        await CostsCRUD().in_dates_range(start, end)
+        await IncomesCRUD().in_dates_range(start, end)
+        await CurrencyExchangeCRUD().in_dates_range(start, end)
+
+    async def concurrent_fetch():
+        await gather_in_snapshot(
+            lambda: CostsCRUD().in_dates_range(start, end),
+            lambda: IncomesCRUD().in_dates_range(start, end),
+            lambda: CurrencyExchangeCRUD().in_dates_range(start, end),
+        )
+
+    async def basic():
+        await _consume(
+            analytics_services.get_basic_analytics_in_range(start, end)
+        )
+
+    async def detailed():
+        await _consume(
+            analytics_services.get_detailed_analytics_in_range(start, end)
+        )
+
+    # NOTE: Cached benchmarks are the switch between views
+    #       of the range which has been already requested
+    benchmarks = {
+        "fetch.sequential": sequential_fetch,
+        "fetch.concurrent": concurrent_fetch,
+        "analytics.basic": cold(basic),
+        "analytics.basic.cached": basic,
+        "analytics.detailed": cold(detailed),
+        "analytics.detailed.cached": detailed,
+    }
+
+    # Warm up the pool
+    await concurrent_fetch()
+
+    results = {
+        name: await _measure(benchmark, repeat)
+        for name, benchmark in benchmarks.items()
+    }
+    await get_engine().dispose()
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--range", default="2025-03")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.range, args.repeat))
+
+    print(f"{'benchmark':<24}{'p50 ms':>10}{'min ms':>10}")
+    for name, (p50, best) in results.items():
+        print(f"{name:<24}{p50:>10.1f}{best:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,533 @@
+"""
+The end-to-end load simulation.
+Virtual users concurrently walk the conversation flows through the real
+router (`any_message` and `any_callback_qeury`) and the local database
+from the settings, while the Telegram transport is replaced
+by `SimulatedBot`. Buttons are pressed by the callback data prefix
+from the last inline keyboard the user has received.
+
+Usage:
+    python -m src.benchmarks.load [--users 50] [--flows 10] [--seed 1]
+        [--telegram-latency 0] [--json report.json]
+        [--profiling-report profiling.json]
+"""
+
+import argparse
+import asyncio
+from contextvars import ContextVar
+from itertools import count
+from pathlib import Path
+from random import Random
+from statistics import mean, quantiles
+from time import perf_counter
+from typing import Callable, NamedTuple
+
+from sqlalchemy import event
+from telebot import types
+
+from src.domain.analytics import AnalyticsRootOption, BasicOption
+from src.domain.analytics import DetailedOption, LevelOption
+from src.domain.costs import AddCostCallbackOperation
+from src.domain.costs import DeleteCostCallbackOperation
+from src.domain.currency_exchange import CurrencyExchangeCallbackOperation
+from src.domain.incomes import AddIncomeCallbackOperation, IncomeRootOption
+from src.handlers.router import any_callback_qeury, any_message
+from src.infrastructure.metrics import Metrics
+from src.infrastructure.models import InternalModel
+from src.keyboards.constants import Commands, Menu
+
+ACCOUNT_ID_OFFSET = 1_900_000_000
+ERROR_TEXT = "Something went wrong"
+NAMES: tuple[str, ...] = (
+    "Кофе", "Продукты", "Такси", "Обед", "Аптека", "Кино", "Подарок",
+)  # fmt: skip
+QUICK_ADD_CATEGORIES: tuple[str, ...] = ("еда", "транспорт", "здоровье")
+
+
+class Send(NamedTuple):
+    text: str | Callable[[Random], str]
+
+
+class Press(NamedTuple):
+    prefix: str
+    like: str | None = None
+
+
+def _value(rng: Random) -> str:
+    return f"{rng.lognormvariate(6, 1):.2f}"
+
+
+def _name(rng: Random) -> str:
+    return rng.choice(NAMES)
+
+
+def _quick_add(rng: Random) -> str:
+    return (
+        f"{_value(rng)} {_name(rng)} @{rng.choice(QUICK_ADD_CATEGORIES)} "
+        f"{rng.choice(('сегодня', 'вчера'))}"
+    )
+
+
+FLOWS: dict[str, tuple[Send | Press, ...]] = {
+    "add_cost": (
+        Send(Menu.ADD_COST),
+        Send(_value),
+        Send(_name),
+        Press(AddCostCallbackOperation.SELECT_CATEGORY),
+        Press(AddCostCallbackOperation.SELECT_DATE),
+        Press(AddCostCallbackOperation.SELECT_YES),
+    ),
+    "quick_add_cost": (Send(_quick_add),),
+    "add_income": (
+        Send(Menu.INCOMES),
+        Press(IncomeRootOption.ADD_INCOME),
+        Send(_value),
+        Press(AddIncomeCallbackOperation.SELECT_CURRENCY),
+        Send(_name),
+        Press(AddIncomeCallbackOperation.SELECT_SOURCE),
+        Press(AddIncomeCallbackOperation.SELECT_DATE),
+        Press(AddIncomeCallbackOperation.SELECT_YES),
+    ),
+    "currency_exchange": (
+        Send(Menu.EXCHANGE),
+        Press(CurrencyExchangeCallbackOperation.SELECT_SRC_CURRENCY),
+        Send(_value),
+        Press(CurrencyExchangeCallbackOperation.SELECT_DST_CURRENCY),
+        Send(_value),
+        Press(CurrencyExchangeCallbackOperation.SELECT_DATE),
+        Press(CurrencyExchangeCallbackOperation.SELECT_YES),
+    ),
+    "delete_cost": (
+        Send(Menu.DELETE_COST),
+        Press(
+            DeleteCostCallbackOperation.SELECT_MONTH,
+            like=AddCostCallbackOperation.SELECT_DATE,
+        ),
+        Press(
+            DeleteCostCallbackOperation.SELECT_CATEGORY,
+            like=AddCostCallbackOperation.SELECT_CATEGORY,
+        ),
+        Press(DeleteCostCallbackOperation.SELECT_COST),
+        Press(DeleteCostCallbackOperation.SELECT_YES),
+    ),
+    "analytics_basic": (
+        Send(Menu.ANALYTICS),
+        Press(AnalyticsRootOption.THIS_MONTH),
+        Press(LevelOption.SELECT_BASIC_LEVEL),
+        Press(BasicOption.ALL),
+    ),
+    "analytics_detailed": (
+        Send(Menu.ANALYTICS),
+        Press(AnalyticsRootOption.THIS_MONTH),
+        Press(LevelOption.SELECT_DETAILED_LEVEL),
+        Press(DetailedOption.ALL),
+    ),
+}
+FLOWS_WEIGHTS: dict[str, int] = {
+    "add_cost": 4,
+    "quick_add_cost": 1,
+    "add_income": 1,
+    "currency_exchange": 1,
+    "delete_cost": 1,
+    "analytics_basic": 2,
+    "analytics_detailed": 1,
+}
+
+
+class FlowRun:
+    """Counters of the single flow run. It is available
+    in the handlers through the context variable.
+    """
+
+    __slots__ = ("statements", "telegram_calls", "error")
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.telegram_calls = 0
+        self.error = False
+
+
+CTX_FLOW: ContextVar[FlowRun | None] = ContextVar("flow_run", default=None)
+
+
+class SimulatedBot:
+    """The Telegram transport replacement.
+    The last inline keyboard is kept for each chat.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.keyboards: dict[int, tuple[int, types.InlineKeyboardMarkup]] = {}
+        self._ids = count(1)
+
+    async def _call(self, text: str | None = None) -> None:
+        if flow := CTX_FLOW.get():
+            flow.telegram_calls += 1
+            flow.error = flow.error or bool(text and ERROR_TEXT in text)
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _keep(self, chat_id: int, message_id: int, markup) -> None:
+        if isinstance(markup, types.InlineKeyboardMarkup):
+            self.keyboards[chat_id] = (message_id, markup)
+        elif self.keyboards.get(chat_id, (None,))[0] == message_id:
+            del self.keyboards[chat_id]
+
+    async def send_message(self, chat_id: int, text: str, **kwargs):
+        await self._call(text)
+        message_id = next(self._ids)
+        self._keep(chat_id, message_id, kwargs.get("reply_markup"))
+
+        return types.Message(
+            message_id=message_id,
+            from_user=None,
+            date=0,
+            chat=types.Chat(id=chat_id, type="private"),
+            content_type="text",
+            options={"text": text},
+            json_string="",
+        )
+
+    async def send_document(self, chat_id: int, document, **kwargs):
+        await self._call(kwargs.get("caption"))
+
+        return types.Message(
+            message_id=next(self._ids),
+            from_user=None,
+            date=0,
+            chat=types.Chat(id=chat_id, type="private"),
+            content_type="document",
+            options={},
+            json_string="",
+        )
+
+    async def edit_message_text(
+        self, chat_id: int, message_id: int, text: str, **kwargs
+    ):
+        await self._call(text)
+        self._keep(chat_id, message_id, kwargs.get("reply_markup"))
+
+    async def delete_message(self, chat_id: int, message_id: int, **_):
+        await self._call()
+
+
+class VirtualUser:
+    def __init__(self, index: int, bot: SimulatedBot, seed: int) -> None:
+        self.bot = bot
+        self.rng = Random(seed + index)
+        self.account_id = ACCOUNT_ID_OFFSET + index
+        self.telegram_user = types.User(
+            id=self.account_id,
+            is_bot=False,
+            first_name=f"Load {index}",
+            username=f"load_user_{index}",
+        )
+        self.chat = types.Chat(id=self.account_id, type="private")
+        self.pressed: dict[str, str] = {}
+        self._ids = count(1)
+
+    def message(self, text: str) -> types.Message:
+        return types.Message(
+            message_id=next(self._ids),
+            from_user=self.telegram_user,
+            date=0,
+            chat=self.chat,
+            content_type="text",
+            options={"text": text},
+            json_string="",
+        )
+
+    def callback_query(self, step: Press) -> types.CallbackQuery | None:
+        message_id, markup = self.bot.keyboards.get(
+            self.chat.id, (None, None)
+        )
+        if markup is None:
+            return None
+
+        suffixes = [
+            button.callback_data.removeprefix(step.prefix)
+            for row in markup.keyboard
+            for button in row
+            if button.callback_data
+            and button.callback_data.startswith(step.prefix)
+        ]
+        if not suffixes:
+            return None
+
+        if remembered := self.pressed.get(step.like or ""):
+            suffixes = [
+                suffix for suffix in suffixes if remembered.startswith(suffix)
+            ] or suffixes
+
+        suffix = self.rng.choice(suffixes)
+        self.pressed[step.prefix] = suffix
+
+        return types.CallbackQuery(
+            id=str(next(self._ids)),
+            from_user=self.telegram_user,
+            data=f"{step.prefix}{suffix}",
+            chat_instance="",
+            json_string="",
+            message=types.Message(
+                message_id=message_id,
+                from_user=None,
+                date=0,
+                chat=self.chat,
+                content_type="text",
+                options={},
+                json_string="",
+            ),
+        )
+
+
+class FlowReport(InternalModel):
+    """Latencies are in milliseconds. The flow is failed if the bot
+    replies with an error and aborted if the expected button is missing
+    (e.g. there is nothing to delete).
+    """
+
+    name: str
+    runs: int
+    failures: int
+    aborted: int
+    latency_p50: float
+    latency_p99: float
+    update_p50: float
+    update_p99: float
+    statements_avg: float
+    statements_max: int
+    telegram_calls_avg: float
+
+
+class LoadReport(InternalModel):
+    users: int
+    duration: float
+    updates: int
+    throughput: float
+    rollbacks: dict[str, int]
+    flows: list[FlowReport]
+
+    def represent(self) -> str:
+        lines = [
+            f"Users: {self.users}, updates: {self.updates}, "
+            f"duration: {self.duration:.2f}s, "
+            f"throughput: {self.throughput:.1f} updates/s",
+            *(
+                f"Rollbacks of {name}: {value}"
+                for name, value in sorted(self.rollbacks.items())
+            ),
+            f"{'flow':<20}{'runs':>6}{'fail':>6}{'abort':>6}"
+            f"{'p50 ms':>9}{'p99 ms':>9}"
+            f"{'upd p50':>9}{'upd p99':>9}{'db avg':>8}{'db max':>8}"
+            f"{'tg avg':>8}",
+        ]
+        lines += [
+            f"{f.name:<20}{f.runs:>6}{f.failures:>6}{f.aborted:>6}"
+            f"{f.latency_p50:>9.2f}{f.latency_p99:>9.2f}"
+            f"{f.update_p50:>9.2f}{f.update_p99:>9.2f}"
+            f"{f.statements_avg:>8.1f}{f.statements_max:>8}"
+            f"{f.telegram_calls_avg:>8.1f}"
+            for f in self.flows
+        ]
+
+        return "\n".join(lines)
+
+
+class _FlowStats:
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.updates: list[float] = []
+        self.statements: list[int] = []
+        self.telegram_calls: list[int] = []
+        self.failures = 0
+        self.aborted = 0
+
+
+def _percentiles(values: list[float]) -> tuple[float, float]:
+    if len(values) < 2:
+        return (values[0], values[0]) if values else (0.0, 0.0)
+
+    result = quantiles(values, n=100, method="inclusive")
+    return result[49], result[98]
+
+
+def _count_statement(*_) -> None:
+    if flow := CTX_FLOW.get():
+        flow.statements += 1
+
+
+async def _dispatch(user: VirtualUser, step: Send | Press) -> bool:
+    if isinstance(step, Send):
+        text = step.text(user.rng) if callable(step.text) else step.text
+        await any_message(user.message(text))
+        return True
+
+    if not (query := user.callback_query(step)):
+        return False
+
+    await any_callback_qeury(query)
+    return True
+
+
+async def run_flow(
+    user: VirtualUser, name: str, stats: dict[str, _FlowStats]
+) -> None:
+    flow = FlowRun()
+    token = CTX_FLOW.set(flow)
+    flow_stats = stats.setdefault(name, _FlowStats())
+    latency = 0.0
+
+    try:
+        for step in FLOWS[name]:
+            started = perf_counter()
+            dispatched = await _dispatch(user, step)
+            duration = (perf_counter() - started) * 1000
+
+            if not dispatched:
+                flow_stats.aborted += 1
+                return
+            if flow.error:
+                flow_stats.failures += 1
+                return
+
+            latency += duration
+            flow_stats.updates.append(duration)
+    finally:
+        CTX_FLOW.reset(token)
+
+    flow_stats.latencies.append(latency)
+    flow_stats.statements.append(flow.statements)
+    flow_stats.telegram_calls.append(flow.telegram_calls)
+
+
+async def simulate_user(
+    user: VirtualUser, flows: int, stats: dict[str, _FlowStats]
+) -> None:
+    names, weights = zip(*FLOWS_WEIGHTS.items())
+
+    for name in user.rng.choices(names, weights, k=flows):
+        await run_flow(user, name, stats)
+
+
+async def simulate(
+    users: int = 50,
+    flows: int = 10,
+    seed: int = 1,
+    telegram_latency: float = 0.0,
+) -> LoadReport:
+    """Run the simulation against the configured database.
+    The database is migrated if needed and users are registered
+    with the `/start` command before the measurement.
+    """
+
+    from src.infrastructure.database.services.migrations import (
+        upgrade_if_needed,
+        wait_for_database,
+    )
+    from src.infrastructure.database.services.session import get_engine
+    from src.infrastructure.telegram import set_bot
+
+    await wait_for_database()
+    await upgrade_if_needed()
+
+    event.listen(
+        get_engine().sync_engine, "after_cursor_execute", _count_statement
+    )
+    bot = SimulatedBot(latency=telegram_latency / 1000)
+    set_bot(bot)
+
+    virtual_users = [VirtualUser(index, bot, seed) for index in range(users)]
+    await asyncio.gather(
+        *(
+            _dispatch(user, Send(Commands.START))
+            for user in virtual_users
+        )
+    )
+
+    stats: dict[str, _FlowStats] = {}
+    Metrics.reset()
+    started = perf_counter()
+    await asyncio.gather(
+        *(simulate_user(user, flows, stats) for user in virtual_users)
+    )
+    duration = perf_counter() - started
+
+    reports: list[FlowReport] = []
+    for name in FLOWS:
+        if not (flow_stats := stats.get(name)):
+            continue
+
+        latency_p50, latency_p99 = _percentiles(flow_stats.latencies)
+        update_p50, update_p99 = _percentiles(flow_stats.updates)
+        reports.append(
+            FlowReport(
+                name=name,
+                runs=(
+                    len(flow_stats.latencies)
+                    + flow_stats.failures
+                    + flow_stats.aborted
+                ),
+                failures=flow_stats.failures,
+                aborted=flow_stats.aborted,
+                latency_p50=latency_p50,
+                latency_p99=latency_p99,
+                update_p50=update_p50,
+                update_p99=update_p99,
+                statements_avg=mean(flow_stats.statements or [0]),
+                statements_max=max(flow_stats.statements or [0]),
+                telegram_calls_avg=mean(flow_stats.telegram_calls or [0]),
+            )
+        )
+
+    updates = sum(len(s.updates) for s in stats.values())
+
+    return LoadReport(
+        users=users,
+        duration=duration,
+        updates=updates,
+        throughput=updates / duration if duration else 0.0,
+        rollbacks={
+            name.removeprefix("transaction.rollbacks:"): value
+            for name, value in Metrics.snapshot().counters.items()
+            if name.startswith("transaction.rollbacks:")
+        },
+        flows=reports,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--flows", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--telegram-latency",
+        type=float,
+        default=0.0,
+        help="simulated Telegram API latency in milliseconds",
+    )
+    parser.add_argument("--json", type=Path)
+    parser.add_argument("--profiling-report", type=Path)
+    args = parser.parse_args()
+
+    if args.profiling_report:
+        from src.infrastructure.database.services.session import get_engine
+        from src.infrastructure.profiling import Profiler
+
+        Profiler.instrument(get_engine())
+
+    report = asyncio.run(
+        simulate(args.users, args.flows, args.seed, args.telegram_latency)
+    )
+    print(report.represent())
+
+    if args.json:
+        args.json.write_text(report.model_dump_json(indent=2))
+
+    if args.profiling_report:
+        Profiler.report().dump(args.profiling_report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""
+The micro-benchmarks of the pure Python hot paths.
+Timings are normalized by the calibration workload to make baselines
+comparable between machines. The normalized timing above
+`baseline * threshold` is reported as a regression and the exit code
+is non-zero, so the suite could be used in CI.
+
+The dataset is a yearly report of a family (see `yearly_dataset`).
+
+Usage:
+    python -m src.benchmarks.micro [--filter analytics]
+        [--threshold 1.3] [--update-baselines]
+"""
+
+import argparse
+import json
+import sys
+from datetime import date
+from pathlib import Path
+from timeit import Timer
+from typing import Callable
+
+from src.benchmarks.seed import LedgerGenerator
+from src.domain.analytics import AnalyticsResult, AnalyticsTotals
+from src.domain.analytics import services as analytics_services
+from src.domain.categories import CategoryInDB
+from src.domain.costs import Cost
+from src.domain.currency_exchange import (
+    CurrencyExchange,
+    CurrencyExchangeInDB,
+    ExchangeRates,
+)
+from src.domain.dates import DateFormat
+from src.domain.dates import services as dates_services
+from src.domain.incomes import Income
+from src.domain.money import CurrencyInDB
+from src.domain.money import services as money_services
+from src.infrastructure.database import (
+    CategorySchema,
+    CostSchema,
+    CurrencySchema,
+)
+from src.infrastructure.models import InternalModel
+
+BASELINES_FILE = Path(__file__).parent / "baselines.json"
+DEFAULT_THRESHOLD = 1.3
+REPEAT = 5
+ROUNDS = 3
+
+# Thresholds of benchmarks which are noisier than others
+THRESHOLDS: dict[str, float] = {
+    "money.validate": 1.5,
+    "money.repr_value": 1.5,
+}
+
+DATES_PATTERNS: tuple[str, ...] = (
+    "2023",
+    "2021-2023",
+    "2023-04",
+    "2023-01 - 2023-06",
+    "2023-01-01 - 2023-03-31",
+)
+MONEY_INPUTS: tuple[str, ...] = (
+    "450", "1 200,50", "99.99", "12_000", "0.5", "3-500", "100000",
+)  # fmt: skip
+
+
+class Dataset(InternalModel):
+    currencies: list[CurrencyInDB]
+    categories: list[CategoryInDB]
+    analytics: AnalyticsResult
+    costs_schemas: list
+
+
+def yearly_dataset(seed: int = 1, users: int = 3) -> Dataset:
+    """Build the yearly ledger of the family in memory:
+    about 4 costs per user per day, monthly incomes and exchanges.
+    """
+
+    currencies = [
+        CurrencyInDB(id=1, name="USD", sign="$"),
+        CurrencyInDB(id=2, name="RUB", sign="₽"),
+        CurrencyInDB(id=3, name="EUR", sign="€"),
+    ]
+    categories = [
+        CategoryInDB(id=id_, name=f"Категория {id_}") for id_ in range(1, 21)
+    ]
+    generator = LedgerGenerator(
+        seed=seed,
+        users={id_: 1 + id_ % 2 for id_ in range(1, users + 1)},
+        categories=[category.id for category in categories],
+        currencies={1: 1.0, 2: 0.011, 3: 1.08},
+        first_date=date(2023, 1, 1),
+        last_date=date(2023, 12, 31),
+        costs_per_day=4,
+    )
+    currency_by_id = {currency.id: currency for currency in currencies}
+    category_by_id = {category.id: category for category in categories}
+
+    costs = [
+        Cost(
+            id=index,
+            name=name,
+            value=value,
+            date=date_,
+            user_id=user_id,
+            category=category_by_id[category_id],
+            currency=currency_by_id[currency_id],
+        )
+        for index, (name, value, date_, user_id, category_id, currency_id) in (
+            enumerate(generator.costs(), start=1)
+        )
+    ]
+    incomes = [
+        Income(
+            id=index,
+            name=name,
+            value=value,
+            source=source.lower(),
+            date=date_,
+            user_id=user_id,
+            currency=currency_by_id[currency_id],
+        )
+        for index, (name, value, source, date_, user_id, currency_id) in (
+            enumerate(generator.incomes(), start=1)
+        )
+    ]
+    currency_exchanges = [
+        CurrencyExchange(
+            source_value=source_value,
+            destination_value=destination_value,
+            date=date_,
+            user_id=user_id,
+            source_currency=currency_by_id[source_currency_id],
+            destination_currency=currency_by_id[destination_currency_id],
+        )
+        for (
+            source_value,
+            destination_value,
+            date_,
+            source_currency_id,
+            destination_currency_id,
+            user_id,
+        ) in generator.exchanges()
+    ]
+
+    # Detached ORM instances for the hydration benchmark
+    categories_schemas = {
+        category.id: CategorySchema(id=category.id, name=category.name)
+        for category in categories
+    }
+    currencies_schemas = {
+        currency.id: CurrencySchema(**currency.dict())
+        for currency in currencies
+    }
+    costs_schemas = [
+        CostSchema(
+            id=cost.id,
+            name=cost.name,
+            value=cost.value,
+            date=cost.date,
+            user_id=cost.user_id,
+            category=categories_schemas[cost.category.id],
+            currency=currencies_schemas[cost.currency.id],
+        )
+        for cost in costs
+    ]
+
+    return Dataset(
+        currencies=currencies,
+        categories=categories,
+        analytics=AnalyticsResult(
+            costs=costs,
+            incomes=incomes,
+            currency_exchanges=currency_exchanges,
+        ),
+        costs_schemas=costs_schemas,
+    )
+
+
+def get_benchmarks(dataset: Dataset) -> dict[str, Callable[[], object]]:
+    analytics = dataset.analytics
+    values = [cost.value for cost in analytics.costs[:1000]]
+
+    def basic_representation():
+        totals = AnalyticsTotals.from_result(analytics)
+
+        return [
+            totals._get_basic_representation(currency)
+            for currency in dataset.currencies
+        ]
+
+    def detailed_representation():
+        return list(analytics.get_detailed_representation(DateFormat.FULL))
+
+    def dates_range_by_pattern():
+        return [
+            analytics_services.dates_range_by_pattern(pattern)
+            for pattern in DATES_PATTERNS
+        ]
+
+    def validate():
+        return [money_services.validate(value) for value in MONEY_INPUTS]
+
+    def repr_value():
+        return [money_services.repr_value(value) for value in values]
+
+    def represent_dates_range():
+        return list(
+            dates_services.represent_dates_range(
+                date(2015, 1, 1), date(2025, 12, 31), DateFormat.MONTHLY
+            )
+        )
+
+    def costs_hydration():
+        return [Cost.from_orm(schema) for schema in dataset.costs_schemas]
+
+    costs_by_date = sorted(
+        (cost.date, cost.value)
+        for cost in analytics.costs
+        if cost.currency.id == 2
+    )
+    costs_dates = [day for day, _ in costs_by_date]
+    costs_values = [value for _, value in costs_by_date]
+
+    def exchange_rates_convert():
+        ExchangeRates.reset()
+        for index, exchange in enumerate(analytics.currency_exchanges, 1):
+            ExchangeRates._insert(
+                CurrencyExchangeInDB(
+                    id=index,
+                    source_value=exchange.source_value,
+                    destination_value=exchange.destination_value,
+                    date=exchange.date,
+                    source_currency_id=exchange.source_currency.id,
+                    destination_currency_id=exchange.destination_currency.id,
+                    user_id=exchange.user_id,
+                )
+            )
+
+        return ExchangeRates.convert(2, 1, costs_dates, costs_values)
+
+    return {
+        "analytics.basic_representation": basic_representation,
+        "analytics.detailed_representation": detailed_representation,
+        "analytics.dates_range_by_pattern": dates_range_by_pattern,
+        "money.validate": validate,
+        "money.repr_value": repr_value,
+        "dates.represent_dates_range": represent_dates_range,
+        "costs.hydration": costs_hydration,
+        "exchange_rates.convert": exchange_rates_convert,
+    }
+
+
+def _calibration_workload() -> None:
+    """The fixed mix of arithmetic, string formatting and dicts."""
+
+    data: dict[int, str] = {}
+    for index in range(20000):
+        data[index] = f"{index * 1.5:.2f}"
+    sorted(data.values())
+
+
+def measure(function: Callable[[], object]) -> float:
+    """Return the best time of the single call in seconds."""
+
+    timer = Timer(function)
+    number, _ = timer.autorange()
+
+    return min(timer.repeat(repeat=REPEAT, number=number)) / number
+
+
+def run(filter_: str = "") -> dict[str, float]:
+    """Return normalized timings of benchmarks."""
+
+    benchmarks = {
+        name: benchmark
+        for name, benchmark in get_benchmarks(yearly_dataset()).items()
+        if filter_ in name
+    }
+    calibrations: list[float] = []
+    timings: dict[str, list[float]] = {name: [] for name in benchmarks}
+
+    # NOTE: The noise only slows down the execution, so the best timing
+    #       of interleaved rounds is taken for both calibration and benchmarks
+    for _ in range(ROUNDS):
+        calibrations.append(measure(_calibration_workload))
+        for name, benchmark in benchmarks.items():
+            timings[name].append(measure(benchmark))
+
+    calibration = min(calibrations)
+    return {
+        name: min(values) / calibration for name, values in timings.items()
+    }
+
+
+def compare(
+    results: dict[str, float],
+    baselines: dict[str, float],
+    threshold: float,
+) -> tuple[list[str], list[str]]:
+    """Return the report lines and regressions."""
+
+    lines: list[str] = []
+    regressions: list[str] = []
+
+    for name, result in results.items():
+        if not (baseline := baselines.get(name)):
+            lines.append(f"{name:<40}{result:>10.3f}  (no baseline)")
+            continue
+
+        ratio = result / baseline
+        limit = THRESHOLDS.get(name, threshold)
+        status = "REGRESSION" if ratio > limit else "ok"
+        lines.append(
+            f"{name:<40}{result:>10.3f}{baseline:>10.3f}{ratio:>8.2f}x"
+            f"  {status}"
+        )
+        if ratio > limit:
+            regressions.append(name)
+
+    return lines, regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--filter", default="")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update-baselines", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.filter)
+    baselines: dict[str, float] = (
+        json.loads(BASELINES_FILE.read_text())
+        if BASELINES_FILE.exists()
+        else {}
+    )
+
+    if args.update_baselines:
+        baselines |= results
+        BASELINES_FILE.write_text(
+            json.dumps(dict(sorted(baselines.items())), indent=4) + "\n"
+        )
+
+    lines, regressions = compare(results, baselines, args.threshold)
+    print(f"{'benchmark':<40}{'current':>10}{'baseline':>10}{'ratio':>9}")
+    print("\n".join(lines))
+
+    if regressions and not args.update_baselines:
+        print(f"FAILED: {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
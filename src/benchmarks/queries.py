@@ -0,0 +1,57 @@
+"""
+The database profiling report check.
+The report is produced by the bot (or the load simulation) running with
+`DATABASE_PROFILING=True` and `DATABASE_PROFILING_REPORT=<path>`.
+The exit code is non-zero if the report exceeds the limits,
+so the check could be used in CI.
+
+Usage:
+    python -m src.benchmarks.queries report.json \
+        [--max-slow-queries 0] [--max-n-plus-one 0]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from src.infrastructure.profiling import ProfilingReport
+
+
+def check(
+    report: ProfilingReport, max_slow_queries: int, max_n_plus_one: int
+) -> list[str]:
+    errors: list[str] = []
+
+    if len(report.slow_queries) > max_slow_queries:
+        errors.append(
+            f"{len(report.slow_queries)} slow queries "
+            f"(allowed: {max_slow_queries})"
+        )
+    if len(report.n_plus_one) > max_n_plus_one:
+        errors.append(
+            f"{len(report.n_plus_one)} N+1 suspects "
+            f"(allowed: {max_n_plus_one})"
+        )
+
+    return errors
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("report", type=Path)
+    parser.add_argument("--max-slow-queries", type=int, default=0)
+    parser.add_argument("--max-n-plus-one", type=int, default=0)
+    args = parser.parse_args()
+
+    report = ProfilingReport.model_validate_json(args.report.read_text())
+    print(report.represent())
+
+    if errors := check(report, args.max_slow_queries, args.max_n_plus_one):
+        print("\n".join(f"FAILED: {error}" for error in errors))
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
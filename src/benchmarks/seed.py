@@ -0,0 +1,513 @@
+"""
+The synthetic ledger generator for benchmarks.
+Users with configurations and years of costs, incomes and currency
+exchanges are generated reproducibly by the seed and inserted with
+`COPY` in batches. Movements of equity are derived from entries
+inserted by the run once at the end, followed by the snapshot.
+
+Distributions:
+    - categories are skewed (Zipf-like weights in the seeded order)
+    - the number of costs per day follows weekly and yearly seasonality
+    - each user mostly spends in the default currency
+    - the monthly revenue slightly exceeds the expected costs
+
+Usage:
+    python -m src.benchmarks.seed --rows 1000000 [--users 20] [--years 3]
+        [--seed 1] [--end-date 2026-01-31] [--truncate]
+"""
+
+import argparse
+import asyncio
+import math
+from datetime import date, timedelta
+from itertools import islice
+from random import Random
+from time import perf_counter
+from typing import Iterable, Iterator
+
+import asyncpg
+
+from src.infrastructure.database import IncomeSource
+from src.settings import DATABASE_URL
+
+ACCOUNT_ID_OFFSET = 1_800_000_000
+BATCH_SIZE = 100_000
+INT_MAX = 2**31 - 1
+
+# The name, the sign and the USD value of the currency unit
+CURRENCIES: tuple[tuple[str, str, float], ...] = (
+    ("USD", "$", 1.0),
+    ("RUB", "₽", 0.011),
+    ("EUR", "€", 1.08),
+    ("GEL", "₾", 0.37),
+)
+WEEKDAY_FACTORS = (0.85, 0.85, 0.9, 0.95, 1.15, 1.5, 1.3)
+MONTH_FACTORS = (
+    0.9, 0.85, 0.95, 1.0, 1.0, 1.05, 1.15, 1.1, 1.0, 1.0, 1.05, 1.4,
+)  # fmt: skip
+CATEGORY_SKEW = 1.1
+DEFAULT_CURRENCY_SHARE = 0.85
+REVENUE_MARGIN = 1.02
+EXCHANGES_SHARE = 0.25
+COSTS_NAMES: tuple[str, ...] = (
+    "Кофе", "Продукты", "Такси", "Обед", "Аптека", "Кино", "Подписка",
+    "Бензин", "Рынок", "Ужин",
+)  # fmt: skip
+INCOMES_NAMES: dict[IncomeSource, str] = {
+    IncomeSource.REVENUE: "Зарплата",
+    IncomeSource.OTHER: "Кэшбэк",
+    IncomeSource.GIFT: "Подарок",
+    IncomeSource.DEBT: "Возврат долга",
+}
+
+COSTS_COLUMNS = (
+    "name", "value", "date", "user_id", "category_id", "currency_id",
+)  # fmt: skip
+INCOMES_COLUMNS = (
+    "name", "value", "source", "date", "user_id", "currency_id",
+)  # fmt: skip
+EXCHANGES_COLUMNS = (
+    "source_value",
+    "destination_value",
+    "date",
+    "source_currency_id",
+    "destination_currency_id",
+    "user_id",
+)
+LEDGER_TABLES = ("costs", "incomes", "currency_exchange")
+
+
+def _poisson(rng: Random, lambda_: float) -> int:
+    """Knuth's algorithm for small values and
+    the normal approximation for large ones.
+    """
+
+    if lambda_ > 30:
+        return max(0, round(rng.gauss(lambda_, math.sqrt(lambda_))))
+
+    threshold, result, product = math.exp(-lambda_), 0, rng.random()
+    while product > threshold:
+        result += 1
+        product *= rng.random()
+
+    return result
+
+
+class LedgerGenerator:
+    """Generate ledger rows as tuples in the `COPY` columns order.
+    Each table has its own random stream, so the result depends only
+    on the seed and the parameters.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        users: dict[int, int],
+        categories: list[int],
+        currencies: dict[int, float],
+        first_date: date,
+        last_date: date,
+        costs_per_day: float,
+    ) -> None:
+        self.seed = seed
+        self.users = users
+        self.currencies = currencies
+        self.first_date = first_date
+        self.last_date = last_date
+        self.costs_per_day = costs_per_day
+
+        rng = Random(f"{seed}:categories")
+        self.categories = rng.sample(categories, len(categories))
+        self.categories_weights = [
+            1 / (rank**CATEGORY_SKEW)
+            for rank in range(1, len(categories) + 1)
+        ]
+        # The average USD cents value of the cost of each category
+        self.categories_mu = [rng.uniform(6.0, 8.5) for _ in categories]
+        self.sigma = 0.9
+
+    def _days(self) -> Iterator[date]:
+        for offset in range((self.last_date - self.first_date).days + 1):
+            yield self.first_date + timedelta(days=offset)
+
+    def _months(self) -> Iterator[date]:
+        current = self.first_date.replace(day=1)
+        while current <= self.last_date:
+            yield current
+            current = (current + timedelta(days=32)).replace(day=1)
+
+    def _convert(self, usd_cents: float, currency_id: int) -> int:
+        value = round(usd_cents / self.currencies[currency_id])
+        return min(max(1, value), INT_MAX)
+
+    def expected_monthly_costs(self) -> float:
+        """The expected costs of the single user in USD cents."""
+
+        total_weight = sum(self.categories_weights)
+        average = sum(
+            weight * math.exp(mu + self.sigma**2 / 2)
+            for weight, mu in zip(self.categories_weights, self.categories_mu)
+        )
+
+        return self.costs_per_day * 30.4 * average / total_weight
+
+    def costs(self) -> Iterator[tuple]:
+        rng = Random(f"{self.seed}:costs")
+        indexes = range(len(self.categories))
+        currencies = list(self.currencies)
+        # Factors are normalized to keep the average amount per day
+        weekday_factors = [
+            factor / (sum(WEEKDAY_FACTORS) / 7) for factor in WEEKDAY_FACTORS
+        ]
+        month_factors = [
+            factor / (sum(MONTH_FACTORS) / 12) for factor in MONTH_FACTORS
+        ]
+
+        for day in self._days():
+            lambda_ = (
+                self.costs_per_day
+                * weekday_factors[day.weekday()]
+                * month_factors[day.month - 1]
+            )
+            for user_id, default_currency_id in self.users.items():
+                amount = _poisson(rng, lambda_)
+                for index in rng.choices(
+                    indexes, self.categories_weights, k=amount
+                ):
+                    currency_id = (
+                        default_currency_id
+                        if rng.random() < DEFAULT_CURRENCY_SHARE
+                        else rng.choice(currencies)
+                    )
+                    value = self._convert(
+                        rng.lognormvariate(
+                            self.categories_mu[index], self.sigma
+                        ),
+                        currency_id,
+                    )
+                    yield (
+                        rng.choice(COSTS_NAMES),
+                        value,
+                        day,
+                        user_id,
+                        self.categories[index],
+                        currency_id,
+                    )
+
+    def incomes(self) -> Iterator[tuple]:
+        rng = Random(f"{self.seed}:incomes")
+        revenue = self.expected_monthly_costs() * REVENUE_MARGIN
+
+        for month in self._months():
+            for user_id, currency_id in self.users.items():
+                sources = [IncomeSource.REVENUE] + rng.choices(
+                    (IncomeSource.OTHER, IncomeSource.GIFT, IncomeSource.DEBT),
+                    k=_poisson(rng, 0.5),
+                )
+                for source in sources:
+                    share = 1 if source == IncomeSource.REVENUE else 0.05
+                    value = self._convert(
+                        revenue * share * rng.uniform(0.9, 1.1), currency_id
+                    )
+                    day = month.replace(day=rng.randint(1, 28))
+                    if not self.first_date <= day <= self.last_date:
+                        continue
+
+                    yield (
+                        INCOMES_NAMES[source],
+                        value,
+                        source.name,
+                        day,
+                        user_id,
+                        currency_id,
+                    )
+
+    def exchanges(self) -> Iterator[tuple]:
+        rng = Random(f"{self.seed}:exchanges")
+        amount = self.expected_monthly_costs() * EXCHANGES_SHARE
+
+        for month in self._months():
+            for user_id, source_currency_id in self.users.items():
+                for _ in range(_poisson(rng, 1.0)):
+                    destination_currency_id = rng.choice(
+                        list(self.currencies)
+                    )
+                    if destination_currency_id == source_currency_id:
+                        continue
+
+                    usd_cents = amount * rng.uniform(0.2, 1.0)
+                    source_value = self._convert(usd_cents, source_currency_id)
+                    destination_value = self._convert(
+                        usd_cents * rng.uniform(0.97, 1.0),
+                        destination_currency_id,
+                    )
+                    day = month.replace(day=rng.randint(1, 28))
+                    if not self.first_date <= day <= self.last_date:
+                        continue
+
+                    yield (
+                        source_value,
+                        destination_value,
+                        day,
+                        source_currency_id,
+                        destination_currency_id,
+                        user_id,
+                    )
+
+
+def _batches(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def _copy(
+    connection: asyncpg.Connection,
+    table: str,
+    columns: tuple[str, ...],
+    rows: Iterable[tuple],
+) -> int:
+    total = 0
+
+    for batch in _batches(rows, BATCH_SIZE):
+        await connection.copy_records_to_table(
+            table, records=batch, columns=columns
+        )
+        total += len(batch)
+
+    return total
+
+
+async def _last_ids(connection: asyncpg.Connection) -> dict[str, int]:
+    return {
+        table: await connection.fetchval(
+            f"SELECT coalesce(max(id), 0) FROM {table}"
+        )
+        for table in LEDGER_TABLES
+    }
+
+
+async def _insert_equity(
+    connection: asyncpg.Connection, last_ids: dict[str, int]
+) -> None:
+    """Insert movements of entries after `last_ids`, since entries
+    of previous runs have them already, and the snapshot of equity.
+    """
+
+    await connection.execute(
+        "INSERT INTO equity_movements "
+        "(currency_id, value, date, source, entry_id) "
+        "SELECT currency_id, -value, date, 'costs', id FROM costs "
+        "WHERE id > $1 "
+        "UNION ALL SELECT currency_id, value, date, 'incomes', id "
+        "FROM incomes WHERE id > $2 "
+        "UNION ALL SELECT source_currency_id, -source_value, date, "
+        "'currency_exchange', id FROM currency_exchange WHERE id > $3 "
+        "UNION ALL SELECT destination_currency_id, "
+        "destination_value, date, 'currency_exchange', id "
+        "FROM currency_exchange WHERE id > $3",
+        *(last_ids[table] for table in LEDGER_TABLES),
+    )
+    await connection.execute(
+        "INSERT INTO equity_snapshots "
+        "(movement_id, currency_id, value) "
+        "SELECT (SELECT max(id) FROM equity_movements), "
+        "currency_id, sum(value) FROM equity_movements "
+        "GROUP BY currency_id "
+        "ON CONFLICT (movement_id, currency_id) DO NOTHING"
+    )
+
+
+async def _prepare_currencies(
+    connection: asyncpg.Connection,
+) -> dict[int, float]:
+    """Return the USD rates of the known currencies."""
+
+    await connection.executemany(
+        "INSERT INTO currencies (name, sign) VALUES ($1, $2) "
+        "ON CONFLICT DO NOTHING",
+        [(name, sign) for name, sign, _ in CURRENCIES],
+    )
+    rates = {name: rate for name, _, rate in CURRENCIES}
+    records = await connection.fetch("SELECT id, name FROM currencies")
+
+    return {
+        record["id"]: rates[record["name"]]
+        for record in records
+        if record["name"] in rates
+    }
+
+
+async def _create_users(
+    connection: asyncpg.Connection,
+    seed: int,
+    amount: int,
+    currencies: list[int],
+) -> dict[int, int]:
+    """Return default currencies of created users."""
+
+    rng = Random(f"{seed}:users")
+    offset = ACCOUNT_ID_OFFSET + seed * 10_000
+    records = await connection.fetch(
+        "INSERT INTO users (account_id, chat_id, username, full_name) "
+        "SELECT account_id, account_id, 'seed_' || account_id, "
+        "'Seed user ' || account_id "
+        "FROM unnest($1::integer[]) AS account_id RETURNING id",
+        list(range(offset, offset + amount)),
+    )
+    users = {
+        record["id"]: (
+            currencies[0] if rng.random() < 0.7 else rng.choice(currencies)
+        )
+        for record in records
+    }
+    await connection.copy_records_to_table(
+        "configurations",
+        records=[
+            (3, "", "", "", user_id, currency_id)
+            for user_id, currency_id in users.items()
+        ],
+        columns=(
+            "number_of_dates",
+            "costs_sources",
+            "incomes_sources",
+            "ignore_categories",
+            "user_id",
+            "default_currency_id",
+        ),
+    )
+
+    return users
+
+
+async def seed_ledger(
+    rows: int,
+    users: int = 20,
+    years: float = 3,
+    seed_: int = 1,
+    end_date: date | None = None,
+    truncate: bool = False,
+) -> dict[str, int]:
+    last_date = end_date or date.today()
+    first_date = last_date - timedelta(days=round(years * 365))
+    connection: asyncpg.Connection = await asyncpg.connect(
+        DATABASE_URL.replace("postgresql+asyncpg", "postgresql")
+    )
+
+    try:
+        async with connection.transaction():
+            if truncate:
+                await connection.execute(
+                    "TRUNCATE costs, incomes, currency_exchange, "
+                    "monthly_costs, equity_movements, equity_snapshots, "
+                    "reconciliation_checkpoints, "
+                    "reconciliation_discrepancies, configurations, users "
+                    "RESTART IDENTITY"
+                )
+
+            last_ids = await _last_ids(connection)
+            currencies = await _prepare_currencies(connection)
+            categories = [
+                record["id"]
+                for record in await connection.fetch(
+                    "SELECT id FROM categories ORDER BY id"
+                )
+            ]
+            if not categories:
+                raise ValueError("Categories do not exist. Run migrations")
+
+            generator = LedgerGenerator(
+                seed=seed_,
+                users=await _create_users(
+                    connection, seed_, users, list(currencies)
+                ),
+                categories=categories,
+                currencies=currencies,
+                first_date=first_date,
+                last_date=last_date,
+                costs_per_day=rows / (users * (last_date - first_date).days),
+            )
+            result = {
+                "users": users,
+                "costs": await _copy(
+                    connection, "costs", COSTS_COLUMNS, generator.costs()
+                ),
+                "incomes": await _copy(
+                    connection, "incomes", INCOMES_COLUMNS, generator.incomes()
+                ),
+                "currency_exchange": await _copy(
+                    connection,
+                    "currency_exchange",
+                    EXCHANGES_COLUMNS,
+                    generator.exchanges(),
+                ),
+            }
+
+            # NOTE: COPY bypasses costs services, so the monthly
+            #       aggregate and dates watermarks are recomputed
+            await connection.execute("DELETE FROM monthly_costs")
+            await connection.execute(
+                "INSERT INTO monthly_costs "
+                "(month, user_id, category_id, currency_id, value, entries) "
+                "SELECT date_trunc('month', date)::date, user_id, "
+                "category_id, currency_id, sum(value), count(*) FROM costs "
+                "GROUP BY 1, user_id, category_id, currency_id"
+            )
+            await connection.execute("DELETE FROM ledger_watermarks")
+            for table in LEDGER_TABLES:
+                await connection.execute(
+                    "INSERT INTO ledger_watermarks "
+                    "(ledger, first_date, last_date) "
+                    f"SELECT '{table}', min(date), max(date) FROM {table} "
+                    "HAVING count(*) > 0"
+                )
+
+            await _insert_equity(connection, last_ids)
+
+        await connection.execute(
+            "ANALYZE users, configurations, costs, incomes, "
+            "currency_exchange, monthly_costs, equity_movements"
+        )
+    finally:
+        await connection.close()
+
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--years", type=float, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--end-date", type=date.fromisoformat)
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="remove ALL users and ledger records before seeding",
+    )
+    args = parser.parse_args()
+
+    started = perf_counter()
+    result = asyncio.run(
+        seed_ledger(
+            args.rows,
+            args.users,
+            args.years,
+            args.seed,
+            args.end_date,
+            args.truncate,
+        )
+    )
+    duration = perf_counter() - started
+    total = sum(result.values())
+
+    print("\n".join(f"{table}: {amount}" for table, amount in result.items()))
+    print(
+        f"Inserted {total} rows in {duration:.2f}s "
+        f"({total / duration:.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
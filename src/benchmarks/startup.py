@@ -0,0 +1,84 @@
+"""
+The startup benchmark.
+Each module is imported in a fresh interpreter to get the cold import time,
+then the startup pipeline is executed and each phase cost is reported.
+
+Usage:
+    python -m src.benchmarks.startup
+"""
+
+import asyncio
+import subprocess
+import sys
+from statistics import median
+
+from src.settings import ROOT_FOLDER, TELEGRAM_BOT_API_KEY
+
+MODULES: tuple[str, ...] = (
+    "src.settings",
+    "src.infrastructure.database",
+    "src.infrastructure.telegram",
+    "src.domain.analytics",
+    "src.application.messages",
+    "src.handlers.router",
+    "src.handlers.add_cost",
+    "src.handlers.analytics",
+    "src.handlers.configurations",
+    "src.handlers.currency_exchange",
+    "src.handlers.delete_cost",
+    "src.handlers.incomes",
+    "src.infrastructure.database.services.migrations",
+)
+ROUNDS = 3
+
+_IMPORT_SNIPPET = (
+    "import time, importlib; started = time.perf_counter(); "
+    "importlib.import_module({module!r}); "
+    "print(time.perf_counter() - started)"
+)
+
+
+def cold_import_time(module: str) -> float:
+    results: list[float] = []
+
+    for _ in range(ROUNDS):
+        output = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c"]
+            + [_IMPORT_SNIPPET.format(module=module)],
+            cwd=ROOT_FOLDER,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        results.append(float(output.stdout.strip()))
+
+    return median(results)
+
+
+async def startup_phases() -> str:
+    from telebot.async_telebot import AsyncTeleBot
+
+    from src.application.startup import StartupReport, startup
+    from src.infrastructure.telegram import set_bot
+
+    if not TELEGRAM_BOT_API_KEY:
+        # NOTE: The bot does not call the API during the startup
+        set_bot(AsyncTeleBot(token="0:benchmark"))
+
+    report = StartupReport()
+    await startup(report)
+
+    return report.represent()
+
+
+def main():
+    print(f"Cold import time (median of {ROUNDS}):")
+    for module in MODULES:
+        print(f"{module:<50} {cold_import_time(module) * 1000:>10.2f} ms")
+
+    print("\nStartup phases:")
+    print(asyncio.run(startup_phases()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,3 @@
 from src.domain.analytics.constants import *  # noqa: F401, F403
 from src.domain.analytics.models import *  # noqa: F401, F403
+from src.domain.analytics.repository import *  # noqa: F401, F403
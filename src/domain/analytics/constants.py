@@ -2,14 +2,27 @@ from enum import StrEnum
 from uuid import uuid4
 
 __all__ = (
+    "ANALYTICS_CACHE_MAX_ENTRIES",
+    "DOCUMENT_SPOOL_MAX_SIZE",
+    "COMPARISON_MONTHS",
     "AnalyticsRootOption",
     "LevelOption",
     "DetailedOption",
     "BasicOption",
     "DetailAnalyticsCallbackOperation",
+    "ComparisonCallbackOperation",
     "DatesRangeRegex",
 )
 
+# Ranges, totals and forecasts which are kept in the analytics cache
+ANALYTICS_CACHE_MAX_ENTRIES = 64
+
+# The document is kept in memory up to this size in bytes
+DOCUMENT_SPOOL_MAX_SIZE = 1024 * 1024
+
+# Numbers of months which are offered for the comparison
+COMPARISON_MONTHS: tuple[int, ...] = (3, 6, 12)
+
 
 class DatesRangeRegex(StrEnum):
     YEAR = r"\d{4}"
@@ -25,6 +38,8 @@ class AnalyticsRootOption(StrEnum):
     PREVIOUS_MONTH = str(uuid4())
     THIS_MONTH = str(uuid4())
     BY_PATTERN = str(uuid4())
+    MONTHS_COMPARISON = str(uuid4())
+    EXPORT = str(uuid4())
 
 class LevelOption(StrEnum):
     SELECT_BASIC_LEVEL = str(uuid4())
@@ -47,5 +62,9 @@ class DetailAnalyticsCallbackOperation(StrEnum):
     SELECT_CATEGORY = str(uuid4())
 
 
+class ComparisonCallbackOperation(StrEnum):
+    SELECT_MONTHS = str(uuid4())
+
+
 class BasicAnalyticsCallbackOperation(StrEnum):
     SELECT_CATEGORY = str(uuid4())
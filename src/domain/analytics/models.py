@@ -1,18 +1,86 @@
+import calendar
+from collections import defaultdict
+from datetime import date
 from itertools import groupby
-from operator import attrgetter
-from typing import AsyncGenerator, Generator
+from operator import attrgetter, itemgetter
+from tempfile import SpooledTemporaryFile
+from typing import IO, AsyncGenerator, Generator, Iterable
 
+from src.domain.analytics.constants import DOCUMENT_SPOOL_MAX_SIZE
 from src.domain.costs import NOT_REAL_COSTS_CATEGORIES, Cost
-from src.domain.currency_exchange import CurrencyExchange
+from src.domain.currency_exchange import CurrencyExchange, ExchangeRates
 from src.domain.dates import DateFormat
 from src.domain.incomes import NOT_REAL_REVENUE_SOURCES, Income
 from src.domain.money import CurrenciesCRUD, CurrencyInDB
 from src.domain.money import services as money_services
 from src.infrastructure.database import IncomeSource
+from src.infrastructure.errors import NotFound
+from src.infrastructure.frames import FramesBuilder, escape_html
 from src.infrastructure.models import InternalModel
-from src.settings import TELEGRAM_MESSAGE_MAX_LEN
 
-__all__ = ("AnalyticsResult",)
+__all__ = (
+    "AnalyticsResult",
+    "AnalyticsTotals",
+    "CostsForecast",
+    "CostsTotal",
+    "CurrencyExchangesTotal",
+    "DailyTotal",
+    "IncomesTotal",
+    "MonthlyCostsTotal",
+    "MonthsComparison",
+    "ReportDocument",
+)
+
+_DOCUMENT_HEAD = (
+    "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+    "<title>{title}</title><style>"
+    "body{{font-family:sans-serif}}"
+    "table{{border-collapse:collapse}}"
+    "td{{padding:2px 12px}}"
+    "td:last-child{{text-align:right}}"
+    "</style></head><body>\n<h1>{title}</h1>\n"
+)
+_DOCUMENT_TAIL = "</body></html>\n"
+
+
+def _converted_sum(
+    currency_id: int, rows: Iterable[tuple[int, date, int]]
+) -> tuple[int, set[int]]:
+    """Sum (currency id, date, value) rows converted into the currency
+    by rates of their dates. Values of each currency are converted
+    by a single lookup. Ids of currencies without rates are returned.
+    """
+
+    by_currency: defaultdict[int, list[tuple[date, int]]] = defaultdict(list)
+    for row_currency_id, day, value in rows:
+        by_currency[row_currency_id].append((day, value))
+
+    total = 0
+    missing: set[int] = set()
+
+    for row_currency_id, items in by_currency.items():
+        items.sort(key=itemgetter(0))
+        converted = ExchangeRates.convert(
+            row_currency_id,
+            currency_id,
+            [day for day, _ in items],
+            [value for _, value in items],
+        )
+        if converted is None:
+            missing.add(row_currency_id)
+        else:
+            total += sum(converted)
+
+    return total, missing
+
+
+class ReportDocument(InternalModel):
+    """The report which is sent as a single file.
+    The file is rewound and should be closed by the receiver.
+    """
+
+    file_name: str
+    file: SpooledTemporaryFile
 
 
 class AnalyticsResult(InternalModel):
@@ -22,76 +90,462 @@ class AnalyticsResult(InternalModel):
     currency_exchanges: list[CurrencyExchange]
 
     def get_costs_to_revenue_ratio(self, currency: CurrencyInDB) -> float:
-
-        costs = sum(c.value for c in self.costs if c.currency == currency)
-        incomes = sum(i.value for i in self.incomes if i.currency == currency)
-        curr_exchanges_destination = sum(
-            curr_exchange.destination_value
-            for curr_exchange in self.currency_exchanges
-            if curr_exchange.destination_currency == currency
+        """The ratio of all costs to all incomes converted into the currency
+        by exchange rates of their dates, so `ExchangeRates` should be
+        loaded. Currency exchanges are transfers inside of the household
+        and they are not counted. Raises `NotFound` if any rate is missing,
+        the ratio is 0 without incomes.
+        """
+
+        costs, costs_missing = _converted_sum(
+            currency.id,
+            ((cost.currency.id, cost.date, cost.value) for cost in self.costs),
         )
-        curr_exchanges_source = sum(
-            curr_exchange.source_value
-            for curr_exchange in self.currency_exchanges
-            if curr_exchange.source_currency == currency
+        incomes, incomes_missing = _converted_sum(
+            currency.id,
+            (
+                (income.currency.id, income.date, income.value)
+                for income in self.incomes
+            ),
         )
 
-        return costs / (
-            incomes + curr_exchanges_destination - curr_exchanges_source
+        if missing := costs_missing | incomes_missing:
+            ids = ", ".join(map(str, sorted(missing)))
+            raise NotFound(f"курс обмена для валют {ids}")
+
+        try:
+            return costs / incomes
+        except ZeroDivisionError:
+            return 0.0
+
+    def by_user(self, user_id: int | None) -> "AnalyticsResult":
+        """Return the personal view. `None` stands for the household."""
+
+        if user_id is None:
+            return self
+
+        return AnalyticsResult(
+            costs=[cost for cost in self.costs if cost.user_id == user_id],
+            incomes=[
+                income for income in self.incomes if income.user_id == user_id
+            ],
+            currency_exchanges=[
+                currency_exchange
+                for currency_exchange in self.currency_exchanges
+                if currency_exchange.user_id == user_id
+            ],
         )
 
-    @property
-    def costs_by_currency(self) -> dict[int, list[Cost]]:
-        currency_attr_key = attrgetter("currency.id")
-        costs_by_currency = groupby(
-            sorted(self.costs, key=currency_attr_key), currency_attr_key
+    def get_detailed_representation(
+        self, date_format: DateFormat
+    ) -> Generator[str, None, None]:
+        """Yield frames of the report, each fits the Telegram message.
+        Sections share frames and headers are repeated after the split.
+        """
+
+        builder = FramesBuilder()
+
+        grouping_key = attrgetter("category.name")
+        costs_by_category = groupby(
+            sorted(self.costs, key=grouping_key), key=grouping_key
         )
-        return {k: list(v) for k, v in costs_by_currency}
 
-    @property
-    def incomes_by_currency(self) -> dict[int, list[Income]]:
-        currency_attr_key = attrgetter("currency.id")
-        incomes_by_currency = groupby(
-            sorted(self.incomes, key=currency_attr_key), currency_attr_key
+        builder.header("<b>🔥 Расходы</b>\n")
+
+        for category_name, costs in costs_by_category:
+            builder.header(
+                f"\n\n<b>{escape_html(category_name)}</b>", level=1
+            )
+
+            for cost in costs:
+                builder.add(
+                    f"\n👉 <i>{cost.date.strftime(date_format)}</i>  "
+                    f"{escape_html(cost.name)}  "
+                    f"{money_services.repr_value(cost.value)}"
+                    f"{cost.currency.sign}"
+                )
+
+        grouping_key = attrgetter("source")
+        incomes_by_source = groupby(
+            sorted(self.incomes, key=grouping_key), key=grouping_key
         )
-        return {k: list(v) for k, v in incomes_by_currency}
 
-    def _get_basic_representation(
+        builder.header("<b>💹 Доходы</b>\n")
+
+        for source, incomes in incomes_by_source:
+            builder.header(f"\n\n<b>{source.capitalize()}s</b>", level=1)
+
+            for income in incomes:
+                builder.add(
+                    f"\n👉 <i>{income.date.strftime(date_format)}</i>  "
+                    f"{escape_html(income.name)}  "
+                    f"{money_services.repr_value(income.value)}"
+                    f"{income.currency.sign}"
+                )
+
+        builder.header("<b>💱 Обмен валют</b>\n")
+
+        for currency_exchange in self.currency_exchanges:
+            builder.add(
+                f"\n👉 <i>{currency_exchange.date.strftime(date_format)}</i>  "
+                f"{money_services.repr_value(currency_exchange.source_value)}"
+                f"{currency_exchange.source_currency.sign}  🔀  "
+                f"{money_services.repr_value(currency_exchange.destination_value)}"  # noqa
+                f"{currency_exchange.destination_currency.sign} "
+            )
+
+        yield from builder.build()
+
+    def _write_table(
         self,
-        currency: CurrencyInDB,
-        costs: list[Cost] | None,
-        incomes: list[Income] | None,
-    ) -> str:
+        file: IO[bytes],
+        title: str | None,
+        rows: list[tuple[str, ...]],
+    ) -> None:
+        lines = [f"<h3>{escape_html(title)}</h3>\n"] if title else []
+        lines.append("<table>\n")
+        lines += [
+            "<tr>"
+            + "".join(f"<td>{escape_html(cell)}</td>" for cell in row)
+            + "</tr>\n"
+            for row in rows
+        ]
+        lines.append("</table>\n")
+        file.write("".join(lines).encode())
+
+    def get_detailed_document(self, start: date, end: date) -> ReportDocument:
+        """Write the detailed report into the HTML document.
+        The document is written by tables, so only the table is kept
+        in memory and the file is moved to the disk above the limit.
+        """
+
+        title = " - ".join(
+            edge.strftime(DateFormat.FULL) for edge in (start, end)
+        )
+        file = SpooledTemporaryFile(max_size=DOCUMENT_SPOOL_MAX_SIZE)
+        file.write(_DOCUMENT_HEAD.format(title=title).encode())
+
+        if self.costs:
+            file.write("<h2>🔥 Расходы</h2>\n".encode())
+
+            grouping_key = attrgetter("category.name")
+            for category_name, costs in groupby(
+                sorted(self.costs, key=grouping_key), key=grouping_key
+            ):
+                self._write_table(
+                    file,
+                    category_name,
+                    [
+                        (
+                            cost.date.strftime(DateFormat.FULL),
+                            cost.name,
+                            f"{money_services.repr_value(cost.value)}"
+                            f"{cost.currency.sign}",
+                        )
+                        for cost in costs
+                    ],
+                )
+
+        if self.incomes:
+            file.write("<h2>💹 Доходы</h2>\n".encode())
+
+            grouping_key = attrgetter("source")
+            for source, incomes in groupby(
+                sorted(self.incomes, key=grouping_key), key=grouping_key
+            ):
+                self._write_table(
+                    file,
+                    f"{source.capitalize()}s",
+                    [
+                        (
+                            income.date.strftime(DateFormat.FULL),
+                            income.name,
+                            f"{money_services.repr_value(income.value)}"
+                            f"{income.currency.sign}",
+                        )
+                        for income in incomes
+                    ],
+                )
+
+        if self.currency_exchanges:
+            file.write("<h2>💱 Обмен валют</h2>\n".encode())
+            self._write_table(
+                file,
+                None,
+                [
+                    (
+                        currency_exchange.date.strftime(DateFormat.FULL),
+                        f"{money_services.repr_value(currency_exchange.source_value)}"  # noqa
+                        f"{currency_exchange.source_currency.sign}",
+                        f"{money_services.repr_value(currency_exchange.destination_value)}"  # noqa
+                        f"{currency_exchange.destination_currency.sign}",
+                    )
+                    for currency_exchange in self.currency_exchanges
+                ],
+            )
+
+        file.write(_DOCUMENT_TAIL.encode())
+        file.seek(0)
+
+        return ReportDocument(file_name=f"report {title}.html", file=file)
+
+
+class CostsTotal(InternalModel):
+    user_id: int
+    currency_id: int
+    category_name: str
+    value: int
+
+
+class IncomesTotal(InternalModel):
+    user_id: int
+    currency_id: int
+    source: IncomeSource
+    value: int
+
+
+class DailyTotal(InternalModel):
+    user_id: int
+    currency_id: int
+    date: date
+    value: int
+    real_value: int
+
+
+class CurrencyExchangesTotal(InternalModel):
+    user_id: int
+    source_currency_id: int
+    destination_currency_id: int
+    source_value: int
+    destination_value: int
+
+
+class CostsForecast(InternalModel):
+    """Month-end costs projected by the run rate of the month so far.
+    Costs are month-to-date running totals (see `monthly_costs`).
+    """
+
+    today: date
+    costs: list[CostsTotal]
+
+    def by_user(self, user_id: int | None) -> "CostsForecast":
+        if user_id is None:
+            return self
+
+        return CostsForecast(
+            today=self.today,
+            costs=[total for total in self.costs if total.user_id == user_id],
+        )
+
+    def project(self, value: int) -> int:
+        _, days = calendar.monthrange(self.today.year, self.today.month)
+
+        return round(value * days / self.today.day)
+
+    def _get_representation(self, currency: CurrencyInDB) -> str:
+        costs_by_category: defaultdict[str, int] = defaultdict(int)
+        for total in self.costs:
+            if total.currency_id == currency.id:
+                costs_by_category[total.category_name] += total.value
+
+        if not (costs_total := sum(costs_by_category.values())):
+            return ""
+
+        message = (
+            "\n\n<b>🔮 Прогноз на конец месяца</b>\n"
+            f"\n🔥 Все расходы 👉 "
+            f"{money_services.repr_value(self.project(costs_total))}"
+        )
+        for category_name, value in sorted(costs_by_category.items()):
+            message += (
+                f"\n{category_name} 👉 "
+                f"{money_services.repr_value(self.project(value))}"
+            )
+
+        return message
+
+
+class AnalyticsTotals(InternalModel):
+    """Per-user partial sums of the dates range.
+    Both personal and household views are derived from them,
+    so the range is aggregated only once.
+    """
+
+    costs: list[CostsTotal]
+    incomes: list[IncomesTotal]
+    currency_exchanges: list[CurrencyExchangesTotal]
+
+    # Daily sums are converted by rates of their dates. They are loaded
+    # only for the consolidated report (see `consolidates`)
+    costs_daily: list[DailyTotal] = []
+    incomes_daily: list[DailyTotal] = []
+
+    @classmethod
+    def from_result(
+        cls, result: AnalyticsResult, daily: bool = False
+    ) -> "AnalyticsTotals":
+        costs: defaultdict[tuple[int, int, str], int] = defaultdict(int)
+        for cost in result.costs:
+            key = (cost.user_id, cost.currency.id, cost.category.name)
+            costs[key] += cost.value
+
+        incomes: defaultdict[tuple[int, int, str], int] = defaultdict(int)
+        for income in result.incomes:
+            key = (income.user_id, income.currency.id, income.source)
+            incomes[key] += income.value
+
+        currency_exchanges: defaultdict[tuple[int, int, int], list[int]] = (
+            defaultdict(lambda: [0, 0])
+        )
+        for currency_exchange in result.currency_exchanges:
+            values = currency_exchanges[
+                (
+                    currency_exchange.user_id,
+                    currency_exchange.source_currency.id,
+                    currency_exchange.destination_currency.id,
+                )
+            ]
+            values[0] += currency_exchange.source_value
+            values[1] += currency_exchange.destination_value
+
+        costs_daily: defaultdict[tuple[int, int, date], list[int]] = (
+            defaultdict(lambda: [0, 0])
+        )
+        for cost in result.costs if daily else ():
+            values = costs_daily[(cost.user_id, cost.currency.id, cost.date)]
+            values[0] += cost.value
+            if cost.category.name not in NOT_REAL_COSTS_CATEGORIES:
+                values[1] += cost.value
+
+        incomes_daily: defaultdict[tuple[int, int, date], list[int]] = (
+            defaultdict(lambda: [0, 0])
+        )
+        for income in result.incomes if daily else ():
+            values = incomes_daily[
+                (income.user_id, income.currency.id, income.date)
+            ]
+            values[0] += income.value
+            if income.source not in NOT_REAL_REVENUE_SOURCES:
+                values[1] += income.value
+
+        return cls(
+            costs=[
+                CostsTotal(
+                    user_id=user_id,
+                    currency_id=currency_id,
+                    category_name=category_name,
+                    value=value,
+                )
+                for (user_id, currency_id, category_name), value in (
+                    costs.items()
+                )
+            ],
+            incomes=[
+                IncomesTotal(
+                    user_id=user_id,
+                    currency_id=currency_id,
+                    source=source,
+                    value=value,
+                )
+                for (user_id, currency_id, source), value in incomes.items()
+            ],
+            currency_exchanges=[
+                CurrencyExchangesTotal(
+                    user_id=user_id,
+                    source_currency_id=source_currency_id,
+                    destination_currency_id=destination_currency_id,
+                    source_value=source_value,
+                    destination_value=destination_value,
+                )
+                for (
+                    user_id,
+                    source_currency_id,
+                    destination_currency_id,
+                ), (source_value, destination_value) in (
+                    currency_exchanges.items()
+                )
+            ],
+            costs_daily=[
+                DailyTotal(
+                    user_id=user_id,
+                    currency_id=currency_id,
+                    date=day,
+                    value=value,
+                    real_value=real_value,
+                )
+                for (user_id, currency_id, day), (value, real_value) in (
+                    costs_daily.items()
+                )
+            ],
+            incomes_daily=[
+                DailyTotal(
+                    user_id=user_id,
+                    currency_id=currency_id,
+                    date=day,
+                    value=value,
+                    real_value=real_value,
+                )
+                for (user_id, currency_id, day), (value, real_value) in (
+                    incomes_daily.items()
+                )
+            ],
+        )
+
+    def by_user(self, user_id: int | None) -> "AnalyticsTotals":
+        """Return the personal view. `None` stands for the household."""
+
+        if user_id is None:
+            return self
+
+        return AnalyticsTotals(
+            costs=[total for total in self.costs if total.user_id == user_id],
+            incomes=[
+                total for total in self.incomes if total.user_id == user_id
+            ],
+            currency_exchanges=[
+                total
+                for total in self.currency_exchanges
+                if total.user_id == user_id
+            ],
+            costs_daily=[
+                total for total in self.costs_daily if total.user_id == user_id
+            ],
+            incomes_daily=[
+                total
+                for total in self.incomes_daily
+                if total.user_id == user_id
+            ],
+        )
+
+    def _get_basic_representation(self, currency: CurrencyInDB) -> str:
         message = (
             f"📊 Аналитика для {currency.sign} {currency.name} "
             f"{currency.sign}\n"
         )
 
-        costs_total = 0
-        real_costs_total = 0
-        incomes_total = 0
-        real_revenue_total = 0
-        debts_total = 0
-        gifts_total = 0
-        exchanges_source_total = 0
-        exchanges_destination_total = 0
+        costs_by_category: defaultdict[str, int] = defaultdict(int)
+        for cost_total in self.costs:
+            if cost_total.currency_id == currency.id:
+                costs_by_category[cost_total.category_name] += cost_total.value
+
+        incomes_by_source: defaultdict[str, int] = defaultdict(int)
+        for income_total in self.incomes:
+            if income_total.currency_id == currency.id:
+                incomes_by_source[income_total.source] += income_total.value
+
+        costs_total = sum(costs_by_category.values())
+        real_costs_total = sum(
+            value
+            for category_name, value in costs_by_category.items()
+            if category_name not in NOT_REAL_COSTS_CATEGORIES
+        )
 
-        if costs:
+        if costs_by_category:
             message += "\n<b>🔥 Расходы</b>\n"
-            costs_total = sum((c.value for c in costs))
-            real_costs_total = sum(
-                (
-                    c.value
-                    for c in costs
-                    if c.category.name not in NOT_REAL_COSTS_CATEGORIES
-                )
-            )
 
-            grouping_key = attrgetter("category.name")
-            for category_name, category_costs in groupby(
-                sorted(costs, key=grouping_key), key=grouping_key
+            for category_name, category_costs_total in sorted(
+                costs_by_category.items()
             ):
-                category_costs_total = sum((c.value for c in category_costs))
                 try:
                     ratio: float = (
                         category_costs_total / real_costs_total
@@ -105,16 +559,8 @@ class AnalyticsResult(InternalModel):
                 if category_name not in NOT_REAL_COSTS_CATEGORIES:
                     message += f" <i>({ratio:.2f}%)</i>"
 
-        debts_total = (
-            sum((i.value for i in incomes if i.source == IncomeSource.DEBT))
-            if incomes
-            else 0
-        )
-        gifts_total = (
-            sum((i.value for i in incomes if i.source == IncomeSource.GIFT))
-            if incomes
-            else 0
-        )
+        debts_total = incomes_by_source.get(IncomeSource.DEBT, 0)
+        gifts_total = incomes_by_source.get(IncomeSource.GIFT, 0)
 
         if debts_total or gifts_total:
             message += "\n\n<b>🚌 ДРУГИЕ ДОХОДЫ:</b>\n\n"
@@ -131,14 +577,14 @@ class AnalyticsResult(InternalModel):
         )
 
         exchanges_source_total = sum(
-            ex.source_value
-            for ex in self.currency_exchanges
-            if ex.source_currency.id == currency.id
+            total.source_value
+            for total in self.currency_exchanges
+            if total.source_currency_id == currency.id
         )
         exchanges_destination_total = sum(
-            ex.destination_value
-            for ex in self.currency_exchanges
-            if ex.destination_currency.id == currency.id
+            total.destination_value
+            for total in self.currency_exchanges
+            if total.destination_currency_id == currency.id
         )
 
         if exchanges_source_total or exchanges_destination_total:
@@ -155,20 +601,14 @@ class AnalyticsResult(InternalModel):
             )
         )
 
-        if costs or incomes or self.currency_exchanges:
+        if costs_by_category or incomes_by_source or self.currency_exchanges:
             message += "\n\n<b>🚌 ОБЩИЕ ЗНАЧЕНИЯ:</b>\n\n"
 
-        incomes_total = sum((i.value for i in incomes)) if incomes else 0
-        real_revenue_total = (
-            sum(
-                (
-                    i.value
-                    for i in incomes
-                    if i.source not in NOT_REAL_REVENUE_SOURCES
-                )
-            )
-            if incomes
-            else 0
+        incomes_total = sum(incomes_by_source.values())
+        real_revenue_total = sum(
+            value
+            for source, value in incomes_by_source.items()
+            if source not in NOT_REAL_REVENUE_SOURCES
         )
 
         message += "\n".join(
@@ -189,7 +629,7 @@ class AnalyticsResult(InternalModel):
             )
         )
 
-        if costs or incomes or self.currency_exchanges:
+        if costs_by_category or incomes_by_source or self.currency_exchanges:
             message += "\n\n<b>🚌 ОБЩЕЕ СООТНОШЕНИЕ:</b>\n\n"
 
         try:
@@ -227,96 +667,198 @@ class AnalyticsResult(InternalModel):
 
         return message
 
-    async def get_basic_representation(self) -> AsyncGenerator[str, None]:
+    def consolidates(self, default_currency: CurrencyInDB) -> bool:
+        """Whether the consolidated report is added,
+        so daily sums should be loaded.
+        """
 
-        currencies: list[CurrencyInDB] = await CurrenciesCRUD().all()
+        used_currencies = {
+            total.currency_id for total in (*self.costs, *self.incomes)
+        }
 
-        for currency in currencies:
-            yield self._get_basic_representation(
-                currency,
-                costs=self.costs_by_currency.get(currency.id),
-                incomes=self.incomes_by_currency.get(currency.id),
-            )
+        return bool(used_currencies - {default_currency.id})
 
-    def get_detailed_representation(
-        self, date_format: DateFormat
-    ) -> Generator[str, None, None]:
-        grouping_key = attrgetter("category.name")
-        costs_by_category = groupby(
-            sorted(self.costs, key=grouping_key), key=grouping_key
+    def _get_consolidated_representation(
+        self, currency: CurrencyInDB, currencies: dict[int, CurrencyInDB]
+    ) -> str:
+        """All currencies converted into the one by exchange rates
+        of the operations dates (see `ExchangeRates`).
+        """
+
+        costs_total, costs_missing = _converted_sum(
+            currency.id,
+            ((t.currency_id, t.date, t.value) for t in self.costs_daily),
+        )
+        real_costs_total, _ = _converted_sum(
+            currency.id,
+            ((t.currency_id, t.date, t.real_value) for t in self.costs_daily),
+        )
+        incomes_total, incomes_missing = _converted_sum(
+            currency.id,
+            ((t.currency_id, t.date, t.value) for t in self.incomes_daily),
+        )
+        real_revenue_total, _ = _converted_sum(
+            currency.id,
+            (
+                (t.currency_id, t.date, t.real_value)
+                for t in self.incomes_daily
+            ),
         )
 
-        costs_title = "<b>🔥 Расходы</b>\n"
+        try:
+            real_costs_to_real_revenue = (
+                real_costs_total / real_revenue_total
+            ) * 100
+        except ZeroDivisionError:
+            real_costs_to_real_revenue = 0
 
-        message = costs_title
+        try:
+            all_costs_to_all_incomes = (costs_total / incomes_total) * 100
+        except ZeroDivisionError:
+            all_costs_to_all_incomes = 0
 
-        for category_name, costs in costs_by_category:
-            message += f"\n\n<b>{category_name}</b>"
+        message = "\n".join(
+            (
+                f"📊 Сводно в {currency.sign} {currency.name} "
+                f"{currency.sign}",
+                "<i>По курсам обмена валют на дату операции</i>\n",
+                f"💹 Все доходы 👉 {money_services.repr_value(incomes_total)}",
+                f"🔥 Все расходы 👉 {money_services.repr_value(costs_total)}",
+                f"💹 Реальный доход 👉 {money_services.repr_value(real_revenue_total)}",  # noqa
+                f"🔥 Реальные затраты 👉 {money_services.repr_value(real_costs_total)}",  # noqa
+                "\n<b>🚌 ОБЩЕЕ СООТНОШЕНИЕ:</b>\n",
+                "Соотношение реальных затрат и реальных доходов 👉 "
+                f"<b>{real_costs_to_real_revenue:.2f}%</b>",
+                "Отношение всех расходов ко всем доходам 👉 "
+                f"{all_costs_to_all_incomes:.2f}%",
+            )
+        )
 
-            for cost in costs:
-                cost_repr = (
-                    f"\n👉 <i>{cost.date.strftime(date_format)}</i>  "
-                    f"{cost.name}  {money_services.repr_value(cost.value)}"
-                    f"{cost.currency.sign}"
-                )
+        if missing := costs_missing | incomes_missing:
+            names = ", ".join(
+                sorted(currencies[currency_id].name for currency_id in missing)
+            )
+            message += (
+                f"\n\n⚠️ Нет курса обмена для {names}, "
+                "эти значения не учтены"
+            )
+
+        return message
 
-                if len(message) + len(cost_repr) > TELEGRAM_MESSAGE_MAX_LEN:
-                    yield message
-                    message = ""
+    async def get_basic_representation(
+        self,
+        default_currency: CurrencyInDB | None = None,
+        forecast: CostsForecast | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Yield the report of each currency. The consolidated report
+        in the default currency is added if there are several currencies.
+        """
+
+        currencies: list[CurrencyInDB] = await CurrenciesCRUD().all()
 
-                message += cost_repr
+        for currency in currencies:
+            message = self._get_basic_representation(currency)
+            if forecast:
+                message += forecast._get_representation(currency)
 
-        if message and message != costs_title:
             yield message
 
-        grouping_key = attrgetter("source")
-        incomes_by_source = groupby(
-            sorted(self.incomes, key=grouping_key), key=grouping_key
-        )
+        if default_currency and self.consolidates(default_currency):
+            await ExchangeRates.load()
+            yield self._get_consolidated_representation(
+                default_currency,
+                {currency.id: currency for currency in currencies},
+            )
 
-        incomes_title = "<b>💹 Доходы</b>\n"
 
-        message = incomes_title
+class MonthlyCostsTotal(InternalModel):
+    month: date
+    currency_id: int
+    category_name: str
+    value: int
 
-        for source, incomes in incomes_by_source:
-            message += f"\n\n<b>{source.capitalize()}s</b>"
 
-            for income in incomes:
-                cost_repr = (
-                    f"\n👉 <i>{income.date.strftime(date_format)}</i>  "
-                    f"{income.name}  {money_services.repr_value(income.value)}"
-                    f"{income.currency.sign}"
-                )
+def _repr_delta(value: int, previous: int) -> str:
+    if value == previous:
+        return "="
 
-                if len(message) + len(cost_repr) > TELEGRAM_MESSAGE_MAX_LEN:
-                    yield message
-                    message = ""
+    delta = value - previous
+    message = (
+        f"{'🔺' if delta > 0 else '🔻'} "
+        f"{money_services.repr_value(abs(delta))}"
+    )
+    if previous:
+        message += f" <i>({delta / previous * 100:+.1f}%)</i>"
 
-                message += cost_repr
+    return message
 
-        if message and message != incomes_title:
-            yield message
-            message = ""
 
-        currency_exchanges_title = "<b>💱 Обмен валют</b>\n"
+class MonthsComparison(InternalModel):
+    """Costs of each category month by month with deltas
+    to the previous month. Months without costs are zeros.
+    """
 
-        message = currency_exchanges_title
+    months: list[date]
+    totals: list[MonthlyCostsTotal]
 
-        for currency_exchange in self.currency_exchanges:
-            cost_repr = (
-                f"\n👉 <i>{currency_exchange.date.strftime(date_format)}</i>  "
-                f"{money_services.repr_value(currency_exchange.source_value)}"
-                f"{currency_exchange.source_currency.sign}  🔀  "
-                f"{money_services.repr_value(currency_exchange.destination_value)}"  # noqa
-                f"{currency_exchange.destination_currency.sign} "
+    def _get_lines(
+        self, values: dict[date, int]
+    ) -> Generator[str, None, None]:
+        previous: int | None = None
+
+        for month in self.months:
+            value = values.get(month, 0)
+            line = (
+                f"\n👉 <i>{month.strftime(DateFormat.MONTHLY)}</i>  "
+                f"{money_services.repr_value(value)}"
             )
+            if previous is not None:
+                line += f"  {_repr_delta(value, previous)}"
+
+            yield line
+            previous = value
 
-            if len(message) + len(cost_repr) > TELEGRAM_MESSAGE_MAX_LEN:
-                yield message
-                message = ""
+    def get_representation(
+        self, currencies: list[CurrencyInDB]
+    ) -> Generator[str, None, None]:
+        """Yield frames of the report for each currency with costs.
+        Categories are ordered by costs of the last month.
+        """
 
-            message += cost_repr
+        builder = FramesBuilder()
 
-        # Send last incomes frame befor moving forward
-        if message and message != currency_exchanges_title:
-            yield message
+        for currency in currencies:
+            by_category: defaultdict[str, dict[date, int]] = defaultdict(dict)
+            for total in self.totals:
+                if total.currency_id == currency.id:
+                    by_category[total.category_name][total.month] = (
+                        total.value
+                    )
+
+            if not by_category:
+                continue
+
+            overall: defaultdict[date, int] = defaultdict(int)
+            for values in by_category.values():
+                for month, value in values.items():
+                    overall[month] += value
+
+            builder.header(
+                f"<b>📈 Сравнение по месяцам для {currency.sign} "
+                f"{currency.name} {currency.sign}</b>\n"
+            )
+            builder.header("\n<b>🔥 Все расходы</b>", level=1)
+            for line in self._get_lines(overall):
+                builder.add(line)
+
+            for category_name, values in sorted(
+                by_category.items(),
+                key=lambda item: (-item[1].get(self.months[-1], 0), item[0]),
+            ):
+                builder.header(
+                    f"\n\n<b>{escape_html(category_name)}</b>", level=1
+                )
+                for line in self._get_lines(values):
+                    builder.add(line)
+
+        yield from builder.build()
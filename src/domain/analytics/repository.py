@@ -0,0 +1,386 @@
+from datetime import date, timedelta
+from functools import partial
+from typing import Any
+
+from sqlalchemy import Date, Result, cast, delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as upsert
+
+from src.domain.analytics.constants import ANALYTICS_CACHE_MAX_ENTRIES
+from src.domain.analytics.models import (
+    CostsTotal,
+    CurrencyExchangesTotal,
+    DailyTotal,
+    IncomesTotal,
+    MonthlyCostsTotal,
+)
+from src.domain.costs import NOT_REAL_COSTS_CATEGORIES
+from src.domain.incomes import NOT_REAL_REVENUE_SOURCES
+from src.infrastructure.cache import Cache
+from src.infrastructure.database import (
+    CategorySchema,
+    CostSchema,
+    CurrencyExchangeSchema,
+    IncomeSchema,
+    MonthlyCostSchema,
+    Session,
+    on_commit,
+)
+
+__all__ = ("AnalyticsCRUD",)
+
+
+class AnalyticsCRUD(Session):
+    """Per-user aggregates of the ledger in the dates range."""
+
+    CACHE_NAMESPACE = "analytics"
+
+    # NOTE: Generations of users' ledgers are bumped on each commit,
+    #       so the entry read before the commit is not stored after it
+    _GENERATIONS: dict[int, int] = {}
+
+    @classmethod
+    def generation(cls) -> dict[int, int]:
+        """Take generations before reading the ledger (see `cache`)."""
+
+        return dict(cls._GENERATIONS)
+
+    @classmethod
+    def cache(cls, key: str, instance: Any, generation: dict[int, int]):
+        """Store the entry unless any ledger changed since the generation
+        has been taken.
+        """
+
+        if generation != cls._GENERATIONS:
+            return
+
+        Cache.set(
+            cls.CACHE_NAMESPACE,
+            key,
+            instance,
+            limit=ANALYTICS_CACHE_MAX_ENTRIES,
+        )
+
+    @classmethod
+    def invalidate(cls, user_id: int) -> None:
+        cls._GENERATIONS[user_id] = cls._GENERATIONS.get(user_id, 0) + 1
+        Cache.invalidate(cls.CACHE_NAMESPACE)
+
+    @classmethod
+    def invalidate_on_commit(cls, user_id: int) -> None:
+        """Drop cached analytics once the ledger change is committed."""
+
+        on_commit(partial(cls.invalidate, user_id))
+
+    async def costs_totals(self, start: date, end: date) -> list[CostsTotal]:
+        query = (
+            select(
+                CostSchema.user_id,
+                CostSchema.currency_id,
+                CategorySchema.name.label("category_name"),
+                func.sum(CostSchema.value).label("value"),
+            )
+            .join(CategorySchema, CostSchema.category_id == CategorySchema.id)
+            .where(CostSchema.date >= start, CostSchema.date <= end)
+            .group_by(
+                CostSchema.user_id, CostSchema.currency_id, CategorySchema.name
+            )
+        )
+        result: Result = await self.execute(query)
+
+        return [CostsTotal.from_orm(row) for row in result.all()]
+
+    async def costs_daily(self, start: date, end: date) -> list[DailyTotal]:
+        query = (
+            select(
+                CostSchema.user_id,
+                CostSchema.currency_id,
+                CostSchema.date,
+                func.sum(CostSchema.value).label("value"),
+                func.coalesce(
+                    func.sum(CostSchema.value).filter(
+                        CategorySchema.name.notin_(NOT_REAL_COSTS_CATEGORIES)
+                    ),
+                    0,
+                ).label("real_value"),
+            )
+            .join(CategorySchema, CostSchema.category_id == CategorySchema.id)
+            .where(CostSchema.date >= start, CostSchema.date <= end)
+            .group_by(
+                CostSchema.user_id, CostSchema.currency_id, CostSchema.date
+            )
+        )
+        result: Result = await self.execute(query)
+
+        return [DailyTotal.from_orm(row) for row in result.all()]
+
+    async def incomes_totals(
+        self, start: date, end: date
+    ) -> list[IncomesTotal]:
+        query = (
+            select(
+                IncomeSchema.user_id,
+                IncomeSchema.currency_id,
+                IncomeSchema.source,
+                func.sum(IncomeSchema.value).label("value"),
+            )
+            .where(IncomeSchema.date >= start, IncomeSchema.date <= end)
+            .group_by(
+                IncomeSchema.user_id,
+                IncomeSchema.currency_id,
+                IncomeSchema.source,
+            )
+        )
+        result: Result = await self.execute(query)
+
+        return [IncomesTotal.from_orm(row) for row in result.all()]
+
+    async def incomes_daily(self, start: date, end: date) -> list[DailyTotal]:
+        query = (
+            select(
+                IncomeSchema.user_id,
+                IncomeSchema.currency_id,
+                IncomeSchema.date,
+                func.sum(IncomeSchema.value).label("value"),
+                func.coalesce(
+                    func.sum(IncomeSchema.value).filter(
+                        IncomeSchema.source.notin_(NOT_REAL_REVENUE_SOURCES)
+                    ),
+                    0,
+                ).label("real_value"),
+            )
+            .where(IncomeSchema.date >= start, IncomeSchema.date <= end)
+            .group_by(
+                IncomeSchema.user_id,
+                IncomeSchema.currency_id,
+                IncomeSchema.date,
+            )
+        )
+        result: Result = await self.execute(query)
+
+        return [DailyTotal.from_orm(row) for row in result.all()]
+
+    async def currency_exchanges_totals(
+        self, start: date, end: date
+    ) -> list[CurrencyExchangesTotal]:
+        schema = CurrencyExchangeSchema
+        query = (
+            select(
+                schema.user_id,
+                schema.source_currency_id,
+                schema.destination_currency_id,
+                func.sum(schema.source_value).label("source_value"),
+                func.sum(schema.destination_value).label("destination_value"),
+            )
+            .where(schema.date >= start, schema.date <= end)
+            .group_by(
+                schema.user_id,
+                schema.source_currency_id,
+                schema.destination_currency_id,
+            )
+        )
+        result: Result = await self.execute(query)
+
+        return [CurrencyExchangesTotal.from_orm(row) for row in result.all()]
+
+    async def monthly_costs(
+        self, first_month: date, last_month: date
+    ) -> list[MonthlyCostsTotal]:
+        """Household costs by months from the aggregate store."""
+
+        query = (
+            select(
+                MonthlyCostSchema.month,
+                MonthlyCostSchema.currency_id,
+                CategorySchema.name.label("category_name"),
+                func.sum(MonthlyCostSchema.value).label("value"),
+            )
+            .join(
+                CategorySchema,
+                MonthlyCostSchema.category_id == CategorySchema.id,
+            )
+            .where(
+                MonthlyCostSchema.month >= first_month,
+                MonthlyCostSchema.month <= last_month,
+            )
+            .group_by(
+                MonthlyCostSchema.month,
+                MonthlyCostSchema.currency_id,
+                CategorySchema.name,
+            )
+        )
+        result: Result = await self.execute(query)
+
+        return [MonthlyCostsTotal.from_orm(row) for row in result.all()]
+
+    async def month_costs(self, today: date) -> list[CostsTotal]:
+        """Month-to-date costs by users from the aggregate store.
+        Costs of the month dated after today are subtracted,
+        so the run rate is not inflated by planned costs.
+        """
+
+        month = today.replace(day=1)
+        next_month = (month + timedelta(days=32)).replace(day=1)
+
+        totals = (
+            select(
+                MonthlyCostSchema.user_id,
+                MonthlyCostSchema.currency_id,
+                MonthlyCostSchema.category_id,
+                MonthlyCostSchema.value,
+            )
+            .where(MonthlyCostSchema.month == month)
+            .union_all(
+                select(
+                    CostSchema.user_id,
+                    CostSchema.currency_id,
+                    CostSchema.category_id,
+                    -CostSchema.value,
+                ).where(CostSchema.date > today, CostSchema.date < next_month)
+            )
+            .subquery()
+        )
+        query = (
+            select(
+                totals.c.user_id,
+                totals.c.currency_id,
+                CategorySchema.name.label("category_name"),
+                func.sum(totals.c.value).label("value"),
+            )
+            .join(CategorySchema, totals.c.category_id == CategorySchema.id)
+            .group_by(
+                totals.c.user_id,
+                totals.c.currency_id,
+                CategorySchema.name,
+            )
+            .having(func.sum(totals.c.value) != 0)
+        )
+        result: Result = await self.execute(query)
+
+        return [CostsTotal.from_orm(row) for row in result.all()]
+
+    async def update_monthly_costs(
+        self,
+        day: date,
+        user_id: int,
+        category_id: int,
+        currency_id: int,
+        delta: int,
+        entries: int,
+    ) -> int:
+        """Add the delta and the number of costs (1 or -1)
+        to the aggregate of the cost's month.
+        The month-to-date total is returned.
+        """
+
+        query = upsert(MonthlyCostSchema).values(
+            month=day.replace(day=1),
+            user_id=user_id,
+            category_id=category_id,
+            currency_id=currency_id,
+            value=delta,
+            entries=entries,
+        )
+        result: Result = await self.execute(
+            query.on_conflict_do_update(
+                index_elements=(
+                    MonthlyCostSchema.month,
+                    MonthlyCostSchema.user_id,
+                    MonthlyCostSchema.category_id,
+                    MonthlyCostSchema.currency_id,
+                ),
+                set_={
+                    "value": MonthlyCostSchema.value + query.excluded.value,
+                    "entries": (
+                        MonthlyCostSchema.entries + query.excluded.entries
+                    ),
+                },
+            ).returning(MonthlyCostSchema.value)
+        )
+
+        return result.scalar_one()
+
+    async def update_monthly_costs_many(
+        self,
+        deltas: dict[tuple[date, int, int, int], int],
+        entries: dict[tuple[date, int, int, int], int],
+    ) -> dict[tuple[date, int, int, int], int]:
+        """Add deltas and numbers of costs by (month, user, category,
+        currency) in one statement. Months are first days of months.
+        Totals are returned by keys.
+        """
+
+        query = upsert(MonthlyCostSchema).values(
+            [
+                {
+                    "month": month,
+                    "user_id": user_id,
+                    "category_id": category_id,
+                    "currency_id": currency_id,
+                    "value": delta,
+                    "entries": entries[
+                        (month, user_id, category_id, currency_id)
+                    ],
+                }
+                for (month, user_id, category_id, currency_id), delta in (
+                    deltas.items()
+                )
+            ]
+        )
+        result: Result = await self.execute(
+            query.on_conflict_do_update(
+                index_elements=(
+                    MonthlyCostSchema.month,
+                    MonthlyCostSchema.user_id,
+                    MonthlyCostSchema.category_id,
+                    MonthlyCostSchema.currency_id,
+                ),
+                set_={
+                    "value": MonthlyCostSchema.value + query.excluded.value,
+                    "entries": (
+                        MonthlyCostSchema.entries + query.excluded.entries
+                    ),
+                },
+            ).returning(
+                MonthlyCostSchema.month,
+                MonthlyCostSchema.user_id,
+                MonthlyCostSchema.category_id,
+                MonthlyCostSchema.currency_id,
+                MonthlyCostSchema.value,
+            )
+        )
+
+        return {tuple(row[:4]): row[4] for row in result.all()}
+
+    async def rebuild_monthly_costs(self) -> None:
+        """Recompute the aggregate store from costs.
+        It is needed after bulk writes which bypass costs services.
+        """
+
+        month = cast(func.date_trunc("month", CostSchema.date), Date)
+
+        await self.execute(delete(MonthlyCostSchema))
+        await self.execute(
+            insert(MonthlyCostSchema).from_select(
+                (
+                    "month",
+                    "user_id",
+                    "category_id",
+                    "currency_id",
+                    "value",
+                    "entries",
+                ),
+                select(
+                    month,
+                    CostSchema.user_id,
+                    CostSchema.category_id,
+                    CostSchema.currency_id,
+                    func.sum(CostSchema.value),
+                    func.count(),
+                ).group_by(
+                    month,
+                    CostSchema.user_id,
+                    CostSchema.category_id,
+                    CostSchema.currency_id,
+                ),
+            )
+        )
@@ -10,13 +10,24 @@ from datetime import date, datetime
 from typing import AsyncGenerator
 
 from src.domain.analytics.constants import DatesRangeRegex
-from src.domain.analytics.models import AnalyticsResult
+from src.domain.analytics.models import (
+    AnalyticsResult,
+    AnalyticsTotals,
+    CostsForecast,
+    MonthsComparison,
+    ReportDocument,
+)
+from src.domain.analytics.repository import AnalyticsCRUD
 from src.domain.costs import Cost, CostsCRUD
 from src.domain.currency_exchange import CurrencyExchange, CurrencyExchangeCRUD
 from src.domain.dates import DateFormat
+from src.domain.dates import services as dates_services
 from src.domain.incomes import Income, IncomesCRUD
+from src.domain.money import CurrenciesCRUD, CurrencyInDB
 from src.domain.users import User
-from src.infrastructure.errors import UserError
+from src.infrastructure.cache import Cache
+from src.infrastructure.errors import NotFound, UserError
+from src.settings import TELEGRAM_REPORT_DOCUMENT_MAX_LINES
 
 dates_pattern_error = UserError(
     "⚠️ Некорректный шаблон даты.\n\n"
@@ -86,6 +97,108 @@ def dates_range_by_pattern(payload: str | None) -> tuple[date, date]:
     raise dates_pattern_error
 
 
+async def _get_analytics_result(
+    start: date, end: date, by_user: User | None = None
+) -> AnalyticsResult:
+    """Fetch costs, incomes and currency exchanges of the household.
+    The result is cached per range and the personal view
+    is derived from it.
+
+    NOTE: Queries run one by one on the session of the update.
+          Concurrent reads (see `gather_in_snapshot`) were not faster,
+          since the time is spent on the hydration, and they took
+          the extra pool connection per query
+    """
+
+    key = f"result:{start}:{end}"
+
+    try:
+        analytics_result = Cache.get(AnalyticsCRUD.CACHE_NAMESPACE, key)
+    except NotFound:
+        generation = AnalyticsCRUD.generation()
+        analytics_result = AnalyticsResult(
+            costs=await CostsCRUD().in_dates_range(start, end),
+            incomes=await IncomesCRUD().in_dates_range(start, end),
+            currency_exchanges=await CurrencyExchangeCRUD().in_dates_range(
+                start, end
+            ),
+        )
+        AnalyticsCRUD.cache(key, analytics_result, generation)
+
+    return analytics_result.by_user(by_user.id if by_user else None)
+
+
+async def _get_analytics_totals(
+    start: date, end: date, by_user: User | None = None
+) -> AnalyticsTotals:
+    """Aggregate the range by users in one grouped pass.
+    The totals are cached per range and both views are derived from them.
+    """
+
+    key = f"totals:{start}:{end}"
+
+    try:
+        totals = Cache.get(AnalyticsCRUD.CACHE_NAMESPACE, key)
+    except NotFound:
+        generation = AnalyticsCRUD.generation()
+        crud = AnalyticsCRUD()
+        totals = AnalyticsTotals(
+            costs=await crud.costs_totals(start, end),
+            incomes=await crud.incomes_totals(start, end),
+            currency_exchanges=await crud.currency_exchanges_totals(
+                start, end
+            ),
+        )
+        AnalyticsCRUD.cache(key, totals, generation)
+
+    return totals.by_user(by_user.id if by_user else None)
+
+
+async def _get_daily_totals(
+    start: date, end: date, by_user: User | None = None
+) -> AnalyticsTotals:
+    """Daily sums of the range for the consolidated report.
+    They are cached apart from totals, since most reports
+    are in the single currency and do not need them.
+    """
+
+    key = f"daily:{start}:{end}"
+
+    try:
+        daily = Cache.get(AnalyticsCRUD.CACHE_NAMESPACE, key)
+    except NotFound:
+        generation = AnalyticsCRUD.generation()
+        crud = AnalyticsCRUD()
+        daily = AnalyticsTotals(
+            costs=[],
+            incomes=[],
+            currency_exchanges=[],
+            costs_daily=await crud.costs_daily(start, end),
+            incomes_daily=await crud.incomes_daily(start, end),
+        )
+        AnalyticsCRUD.cache(key, daily, generation)
+
+    return daily.by_user(by_user.id if by_user else None)
+
+
+async def _get_costs_forecast(by_user: User | None = None) -> CostsForecast:
+    """The forecast of the current month by running totals."""
+
+    today = date.today()
+    key = f"forecast:{today}"
+
+    try:
+        forecast = Cache.get(AnalyticsCRUD.CACHE_NAMESPACE, key)
+    except NotFound:
+        generation = AnalyticsCRUD.generation()
+        forecast = CostsForecast(
+            today=today, costs=await AnalyticsCRUD().month_costs(today)
+        )
+        AnalyticsCRUD.cache(key, forecast, generation)
+
+    return forecast.by_user(by_user.id if by_user else None)
+
+
 async def get_detailed_costs_in_range(
     start: date,
     end: date,
@@ -135,41 +248,82 @@ async def get_detailed_analytics_in_range(
     end: date,
     date_format: DateFormat = DateFormat.FULL,
     by_user: User | None = None,
-) -> AsyncGenerator[str, None]:
-    """Get user's analytics result in specified range by frames."""
+    document_max_lines: int | None = TELEGRAM_REPORT_DOCUMENT_MAX_LINES,
+) -> AsyncGenerator[str | ReportDocument, None]:
+    """Get user's analytics result in specified range by frames.
+    The report with more lines than `document_max_lines` is yielded
+    as the single document instead. `None` disables the document.
+    """
 
-    costs: list[Cost] = await CostsCRUD().in_dates_range(start, end, by_user)
-    incomes: list[Income] = await IncomesCRUD().in_dates_range(
-        start, end, by_user
-    )
-    currency_exchanges: list[
-        CurrencyExchange
-    ] = await CurrencyExchangeCRUD().in_dates_range(start, end, by_user)
+    analytics_result = await _get_analytics_result(start, end, by_user)
 
-    analytics_result = AnalyticsResult(
-        costs=costs, incomes=incomes, currency_exchanges=currency_exchanges
+    lines = (
+        len(analytics_result.costs)
+        + len(analytics_result.incomes)
+        + len(analytics_result.currency_exchanges)
     )
+    if document_max_lines is not None and lines > document_max_lines:
+        yield analytics_result.get_detailed_document(start, end)
+        return
 
     for frame in analytics_result.get_detailed_representation(date_format):
         yield frame
 
 
 async def get_basic_analytics_in_range(
-    start: date, end: date, by_user: User | None = None
+    start: date,
+    end: date,
+    by_user: User | None = None,
+    default_currency: CurrencyInDB | None = None,
 ) -> AsyncGenerator[str, None]:
-    """Get user's analytics result in specified range by frames."""
+    """Get user's analytics result in specified range by frames.
+    All currencies are consolidated into the default currency.
+    The month-end forecast is added if the range includes today.
+    """
 
-    costs: list[Cost] = await CostsCRUD().in_dates_range(start, end, by_user)
-    incomes: list[Income] = await IncomesCRUD().in_dates_range(
-        start, end, by_user
+    totals = await _get_analytics_totals(start, end, by_user)
+    forecast = (
+        await _get_costs_forecast(by_user)
+        if start <= date.today() <= end
+        else None
     )
-    currency_exchanges: list[
-        CurrencyExchange
-    ] = await CurrencyExchangeCRUD().in_dates_range(start, end, by_user)
 
-    analytics_result = AnalyticsResult(
-        costs=costs, incomes=incomes, currency_exchanges=currency_exchanges
-    )
+    if default_currency and totals.consolidates(default_currency):
+        daily = await _get_daily_totals(start, end, by_user)
+        totals = totals.copy(
+            update={
+                "costs_daily": daily.costs_daily,
+                "incomes_daily": daily.incomes_daily,
+            }
+        )
+
+    async for frame in totals.get_basic_representation(
+        default_currency, forecast
+    ):
+        yield frame
+
+
+async def get_months_comparison(
+    months: int,
+) -> AsyncGenerator[str, None]:
+    """Compare costs of the last months by categories.
+    Totals are read from the monthly aggregate store by a single query,
+    so the latency does not depend on the number of months.
+    """
+
+    months_range = dates_services.last_months(months)
+    key = f"months:{months_range[0]}:{months_range[-1]}"
+
+    try:
+        totals = Cache.get(AnalyticsCRUD.CACHE_NAMESPACE, key)
+    except NotFound:
+        generation = AnalyticsCRUD.generation()
+        totals = await AnalyticsCRUD().monthly_costs(
+            months_range[0], months_range[-1]
+        )
+        AnalyticsCRUD.cache(key, totals, generation)
+
+    comparison = MonthsComparison(months=months_range, totals=totals)
 
-    async for frame in analytics_result.get_basic_representation():
+    for frame in comparison.get_representation(await CurrenciesCRUD().all()):
         yield frame
@@ -0,0 +1,3 @@
+from src.domain.budgets.constants import *  # noqa: F401, F403
+from src.domain.budgets.models import *  # noqa: F401, F403
+from src.domain.budgets.repository import *  # noqa: F401, F403
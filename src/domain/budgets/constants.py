@@ -0,0 +1,4 @@
+__all__ = ("BUDGET_THRESHOLDS",)
+
+# Percents of the monthly limit which are alerted once they are crossed
+BUDGET_THRESHOLDS: tuple[int, ...] = (100, 80)
@@ -0,0 +1,44 @@
+from src.domain.money import services as money_services
+from src.infrastructure.models import InternalModel
+
+__all__ = ("BudgetUncommited", "BudgetInDB", "BudgetAlert")
+
+
+class BudgetUncommited(InternalModel):
+    value: int
+    configuration_id: int
+    category_id: int
+    currency_id: int
+
+
+class BudgetInDB(BudgetUncommited):
+    id: int
+
+
+class BudgetAlert(InternalModel):
+    threshold: int
+    total: int
+    limit: int
+    category_name: str
+    currency_sign: str
+
+    def repr(self) -> str:
+        total = money_services.repr_value(self.total)
+        limit = money_services.repr_value(self.limit)
+        percent = self.total * 100 // self.limit
+
+        if self.threshold >= 100:
+            title = f"🚨 Лимит категории {self.category_name} превышен"
+        else:
+            title = (
+                f"⚠️ Лимит категории {self.category_name} "
+                f"израсходован на {percent}%"
+            )
+
+        return "\n".join(
+            (
+                title,
+                f"За месяц 👉 {total}{self.currency_sign} "
+                f"из {limit}{self.currency_sign}",
+            )
+        )
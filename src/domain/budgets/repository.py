@@ -0,0 +1,67 @@
+from functools import partial
+
+from sqlalchemy import Result, delete, select
+from sqlalchemy.dialects.postgresql import insert as upsert
+
+from src.domain.budgets.models import BudgetInDB, BudgetUncommited
+from src.infrastructure.cache import Cache
+from src.infrastructure.database import (
+    BaseCRUD,
+    BudgetSchema,
+    ConfigurationSchema,
+    on_commit,
+)
+
+__all__ = ("BudgetsCRUD",)
+
+
+class BudgetsCRUD(BaseCRUD[BudgetSchema]):
+    schema_class = BudgetSchema
+
+    CACHE_NAMESPACE = "budgets"
+
+    async def by_user(self, user_id: int) -> list[BudgetInDB]:
+        query = (
+            select(self.schema_class)
+            .join(
+                ConfigurationSchema,
+                self.schema_class.configuration_id == ConfigurationSchema.id,
+            )
+            .where(ConfigurationSchema.user_id == user_id)
+        )
+        result: Result = await self.execute(query)
+
+        return [
+            BudgetInDB.from_orm(_schema) for _schema in result.scalars().all()
+        ]
+
+    async def save(self, schema: BudgetUncommited) -> BudgetInDB:
+        """Create the budget or replace the limit of the category."""
+
+        query = upsert(self.schema_class).values(**schema.dict())
+        result: Result = await self.execute(
+            query.on_conflict_do_update(
+                index_elements=(
+                    self.schema_class.configuration_id,
+                    self.schema_class.category_id,
+                ),
+                set_={
+                    "value": query.excluded.value,
+                    "currency_id": query.excluded.currency_id,
+                },
+            ).returning(self.schema_class)
+        )
+        on_commit(partial(Cache.invalidate, self.CACHE_NAMESPACE))
+
+        return BudgetInDB.from_orm(result.scalar_one())
+
+    async def delete_by_category(
+        self, configuration_id: int, category_id: int
+    ) -> None:
+        await self.execute(
+            delete(self.schema_class).where(
+                self.schema_class.configuration_id == configuration_id,
+                self.schema_class.category_id == category_id,
+            )
+        )
+        on_commit(partial(Cache.invalidate, self.CACHE_NAMESPACE))
@@ -0,0 +1,75 @@
+from src.domain.budgets.constants import BUDGET_THRESHOLDS
+from src.domain.budgets.models import (
+    BudgetAlert,
+    BudgetInDB,
+    BudgetUncommited,
+)
+from src.domain.budgets.repository import BudgetsCRUD
+from src.domain.costs import Cost
+from src.infrastructure.cache import Cache
+from src.infrastructure.errors import NotFound
+
+
+async def by_user(user_id: int) -> dict[int, BudgetInDB]:
+    """User's budgets by categories ids.
+    They are read on each cost, so they are kept in the cache.
+    """
+
+    try:
+        return Cache.get(BudgetsCRUD.CACHE_NAMESPACE, user_id)
+    except NotFound:
+        budgets = {
+            budget.category_id: budget
+            for budget in await BudgetsCRUD().by_user(user_id)
+        }
+        Cache.set(BudgetsCRUD.CACHE_NAMESPACE, user_id, budgets)
+
+    return budgets
+
+
+async def check(
+    cost: Cost, total: int, delta: int | None = None
+) -> BudgetAlert | None:
+    """Return the alert if the cost crossed the threshold of the budget.
+    The total is the month-to-date costs of the category
+    including the cost, so the check does not query the ledger.
+    The delta is the change of the total, the cost value by default.
+    """
+
+    budget = (await by_user(cost.user_id)).get(cost.category.id)
+
+    if not budget or budget.currency_id != cost.currency.id:
+        return None
+
+    previous = total - (cost.value if delta is None else delta)
+
+    for threshold in BUDGET_THRESHOLDS:
+        if previous * 100 < budget.value * threshold <= total * 100:
+            return BudgetAlert(
+                threshold=threshold,
+                total=total,
+                limit=budget.value,
+                category_name=cost.category.name,
+                currency_sign=cost.currency.sign,
+            )
+
+    return None
+
+
+async def set_limit(
+    configuration_id: int, category_id: int, currency_id: int, value: int
+) -> BudgetInDB | None:
+    """Set the monthly limit of the category. Zero removes the budget."""
+
+    if not value:
+        await BudgetsCRUD().delete_by_category(configuration_id, category_id)
+        return None
+
+    return await BudgetsCRUD().save(
+        BudgetUncommited(
+            value=value,
+            configuration_id=configuration_id,
+            category_id=category_id,
+            currency_id=currency_id,
+        )
+    )
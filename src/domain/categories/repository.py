@@ -1,6 +1,7 @@
 from sqlalchemy import Result, select
 
 from src.domain.categories.models import CategoryInDB, CategoryUncommited
+from src.infrastructure.cache import Cache
 from src.infrastructure.database import BaseCRUD, CategorySchema
 
 __all__ = ("CategoriesCRUD",)
@@ -9,10 +10,13 @@ __all__ = ("CategoriesCRUD",)
 class CategoriesCRUD(BaseCRUD[CategorySchema]):
     schema_class = CategorySchema
 
+    CACHE_NAMESPACE = "categories"
+
     async def create(self, schema: CategoryUncommited) -> CategoryInDB:
         _schema: CategorySchema = await self._save(
             CategorySchema(**schema.dict())
         )
+        Cache.invalidate(self.CACHE_NAMESPACE)
 
         return CategoryInDB.from_orm(_schema)
 
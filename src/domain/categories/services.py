@@ -1,16 +1,77 @@
+import re
+
 from src.domain.categories.models import CategoryInDB
 from src.domain.categories.repository import CategoriesCRUD
+from src.infrastructure.cache import Cache
+from src.infrastructure.errors import NotFound
+
+
+async def _all() -> list[CategoryInDB]:
+    """Categories are the reference data, so they are kept in the cache.
+    The cache is invalidated by the repository on changes.
+    """
+
+    try:
+        return Cache.get(CategoriesCRUD.CACHE_NAMESPACE, "all")
+    except NotFound:
+        categories = await CategoriesCRUD().all()
+        Cache.set(CategoriesCRUD.CACHE_NAMESPACE, "all", categories)
+
+    return categories
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase words of the name without emoji and punctuation."""
+
+    return " ".join(re.sub(r"[^\w\s]", " ", name.lower()).split())
+
+
+async def _index() -> dict[str, CategoryInDB]:
+    try:
+        return Cache.get(CategoriesCRUD.CACHE_NAMESPACE, "index")
+    except NotFound:
+        index = {normalize_name(c.name): c for c in await _all()}
+        Cache.set(CategoriesCRUD.CACHE_NAMESPACE, "index", index)
+
+    return index
+
+
+async def search(query: str) -> list[CategoryInDB]:
+    """Find categories by the name or by the beginning of its word.
+    The exact match wins over others.
+    """
+
+    index = await _index()
+    query = normalize_name(query)
+
+    if not query:
+        return []
+
+    if category := index.get(query):
+        return [category]
+
+    return [
+        category
+        for name, category in index.items()
+        if name.startswith(query)
+        or any(word.startswith(query) for word in name.split())
+    ]
 
 
 async def filter_by_ids(ids: list[int]) -> list[CategoryInDB]:
-    categories = await CategoriesCRUD().exclude(ids)
+    excluded = set(ids)
+    categories = [c for c in await _all() if c.id not in excluded]
     categories.reverse()
 
     return categories
 
 
 async def get_all() -> list[CategoryInDB]:
-    categories = await CategoriesCRUD().all()
+    categories = list(await _all())
     categories.reverse()
 
     return categories
+
+
+async def preload() -> None:
+    await _all()
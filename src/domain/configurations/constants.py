@@ -20,3 +20,5 @@ class ConfigurationUpdateOption(StrEnum):
     IGNORE_CATEGORIES = str(uuid4())
     DEFAULT_CURRENCY = str(uuid4())
     SELECT_CURRENCY = str(uuid4())
+    BUDGETS = str(uuid4())
+    SELECT_BUDGET_CATEGORY = str(uuid4())
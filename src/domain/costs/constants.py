@@ -1,3 +1,19 @@
-__all__ = ("NOT_REAL_COSTS_CATEGORIES",)
+import re
 
-NOT_REAL_COSTS_CATEGORIES: set[str] = {"💼 Бизнес", "💸 Долг", "💸 Налоги"}
\ No newline at end of file
+__all__ = (
+    "NOT_REAL_COSTS_CATEGORIES",
+    "QUICK_ADD_REGEX",
+    "QUICK_ADD_MAX_LINES",
+)
+
+NOT_REAL_COSTS_CATEGORIES: set[str] = {"💼 Бизнес", "💸 Долг", "💸 Налоги"}
+
+# The one-message cost: `<value> <name> @<category> [date]`,
+# e.g. `450 кофе @еда вчера`
+QUICK_ADD_REGEX = re.compile(
+    r"\s*(?P<value>\d+(?:[.,]\d{1,2})?)\s+(?P<name>[^@]*?\S)"
+    r"\s+@(?P<category>\S+)(?:\s+(?P<date>\S+))?\s*"
+)
+
+# Each line of the message is the quick-add cost
+QUICK_ADD_MAX_LINES = 50
@@ -3,6 +3,7 @@ from enum import StrEnum
 from uuid import uuid4
 
 from src.domain.categories import CategoryInDB
+from src.domain.dates import DateFormat
 from src.domain.money import CurrencyInDB
 from src.domain.money import services as money_services
 from src.infrastructure.models import InternalModel
@@ -11,6 +12,7 @@ __all__ = (
     "CostUncommited",
     "CostInDB",
     "Cost",
+    "CostLabel",
     "AddCostCallbackOperation",
     "DeleteCostCallbackOperation",
 )
@@ -35,6 +37,7 @@ class Cost(InternalModel):
     name: str
     value: int
     date: date
+    user_id: int
 
     category: CategoryInDB
     currency: CurrencyInDB
@@ -50,6 +53,22 @@ class Cost(InternalModel):
             )
         )
 
+class CostLabel(InternalModel):
+    """The cost as the button of the picker."""
+
+    id: int
+    name: str
+    value: int
+    date: date
+    currency_sign: str
+
+    def repr(self) -> str:
+        return (
+            f"({self.date.strftime(DateFormat.DAILY)}) {self.name}: "
+            f"{money_services.repr_value(self.value)}{self.currency_sign}"
+        )
+
+
 class AddCostCallbackOperation(StrEnum):
     SELECT_CATEGORY = str(uuid4())
     SELECT_DATE = str(uuid4())
@@ -62,6 +81,7 @@ class DeleteCostCallbackOperation(StrEnum):
     SELECT_MONTH = str(uuid4())
     SELECT_CATEGORY = str(uuid4())
     SELECT_COST = str(uuid4())
+    SELECT_PAGE = str(uuid4())
     SELECT_CONFIRMATION = str(uuid4())
     SELECT_YES = str(uuid4())
     SELECT_NO = str(uuid4())
@@ -2,14 +2,20 @@ import calendar
 from datetime import date, datetime
 from typing import AsyncGenerator
 
-from sqlalchemy import Result, asc, select
+from sqlalchemy import Result, insert, select
 from sqlalchemy.orm import joinedload
 
-from src.domain.costs.models import Cost, CostInDB, CostUncommited
+from src.domain.costs.models import (
+    Cost,
+    CostInDB,
+    CostLabel,
+    CostUncommited,
+)
 from src.domain.dates import DateFormat
 from src.domain.users import User
-from src.infrastructure.database import BaseCRUD, CostSchema
-from src.infrastructure.errors import DatabaseError, NotFound
+from src.infrastructure.database import BaseCRUD, CostSchema, CurrencySchema
+from src.infrastructure.errors import NotFound
+from src.infrastructure.pagination import Cursor, Page
 
 __all__ = ("CostsCRUD",)
 
@@ -37,6 +43,31 @@ class CostsCRUD(BaseCRUD[CostSchema]):
         _schema: CostSchema = await self._save(CostSchema(**schema.dict()))
         return CostInDB.from_orm(_schema)
 
+    async def create_many(
+        self, schemas: list[CostUncommited]
+    ) -> list[CostInDB]:
+        """Insert costs with the single multi-row statement."""
+
+        query = (
+            insert(self.schema_class)
+            .values([schema.dict() for schema in schemas])
+            .returning(
+                self.schema_class.id,
+                self.schema_class.name,
+                self.schema_class.value,
+                self.schema_class.date,
+                self.schema_class.user_id,
+                self.schema_class.category_id,
+                self.schema_class.currency_id,
+            )
+        )
+        result: Result = await self.execute(query)
+
+        return sorted(
+            (CostInDB.from_orm(row) for row in result.all()),
+            key=lambda cost: cost.id,
+        )
+
     async def by_user(self, user: User) -> AsyncGenerator[Cost, None]:
         query = (
             select(self.schema_class)
@@ -60,9 +91,12 @@ class CostsCRUD(BaseCRUD[CostSchema]):
         _schema: CostSchema = await self._last(by="date")
         return CostInDB.from_orm(_schema)
 
-    async def filter_for_delete(
-        self, month: str, category_id: int
-    ) -> AsyncGenerator[Cost, None]:
+    async def page_for_delete(
+        self, month: str, category_id: int, cursor: Cursor | None = None
+    ) -> Page:
+        """Labels of costs of the month in the category by pages.
+        Only columns of the label are selected.
+        """
 
         first_date: date = datetime.strptime(month, DateFormat.MONTHLY).date()
         _, last_day = calendar.monthrange(first_date.year, first_date.month)
@@ -71,26 +105,27 @@ class CostsCRUD(BaseCRUD[CostSchema]):
         )
 
         query = (
-            select(self.schema_class)
+            select(
+                self.schema_class.id,
+                self.schema_class.name,
+                self.schema_class.value,
+                self.schema_class.date,
+                CurrencySchema.sign.label("currency_sign"),
+            )
+            .join(
+                CurrencySchema,
+                self.schema_class.currency_id == CurrencySchema.id,
+            )
             .filter(
                 self.schema_class.date >= first_date,
                 self.schema_class.date <= last_date,
                 self.schema_class.category_id == category_id,
             )
-            .order_by(asc("date"))
-            .options(
-                joinedload(self.schema_class.category),
-                joinedload(self.schema_class.currency),
-            )
         )
+        page: Page = await self._keyset_page(query, cursor)
+        page.items = [CostLabel.from_orm(row) for row in page.items]
 
-        try:
-            result: Result = await self._session.execute(query)
-        except self._ERRORS:
-            raise DatabaseError
-
-        for element in result.scalars().all():
-            yield Cost.from_orm(element)
+        return page
 
     async def in_dates_range(
         self,
@@ -1,62 +1,262 @@
-import asyncio
-from typing import AsyncGenerator
+from collections import Counter, defaultdict
+from datetime import date
 
+from src.domain.analytics import AnalyticsCRUD
+from src.domain.budgets import BudgetAlert
+from src.domain.budgets import services as budgets_services
+from src.domain.categories import services as categories_services
+from src.domain.costs.constants import QUICK_ADD_MAX_LINES, QUICK_ADD_REGEX
 from src.domain.costs.models import Cost, CostInDB, CostUncommited
 from src.domain.costs.repository import CostsCRUD
-from src.domain.dates import DateFormat
+from src.domain.dates import DateFormat, LedgerTable
 from src.domain.dates import services as dates_services
-from src.domain.money import CurrenciesCRUD
-from src.infrastructure.cache import Cache
-from src.infrastructure.errors import NotFound
+from src.domain.money import (
+    CurrenciesCRUD,
+    EquityCRUD,
+    EquityMovementUncommited,
+    EquitySource,
+)
+from src.domain.money import services as money_services
+from src.infrastructure.errors import NotFound, UserError, ValidationError
+from src.infrastructure.frames import escape_html
 
+quick_add_error = UserError(
+    "⚠️ Некорректный быстрый ввод.\n\n"
+    "Формат: <i>значение название @категория [дата]</i>\n"
+    "Например: <i>450 кофе @еда вчера</i>\n"
+    "Дата: сегодня, вчера, позавчера, 15.04 или 2024-04-15"
+)
 
-async def add(schema: CostUncommited) -> Cost:
+
+def _movement(cost_in_db: CostInDB) -> EquityMovementUncommited:
+    return EquityMovementUncommited(
+        currency_id=cost_in_db.currency_id,
+        value=-cost_in_db.value,
+        date=cost_in_db.date,
+        source=EquitySource.COSTS,
+        entry_id=cost_in_db.id,
+    )
+
+
+async def add(schema: CostUncommited) -> tuple[Cost, BudgetAlert | None]:
+    """Save the cost and check the budget of its category
+    by the running total of the month.
+    """
 
     cost_in_db: CostInDB = await CostsCRUD().create(schema)
 
-    await CurrenciesCRUD().decrease_equity(
-        id_=cost_in_db.currency_id, value=cost_in_db.value
+    await EquityCRUD().append([_movement(cost_in_db)])
+    total = await AnalyticsCRUD().update_monthly_costs(
+        day=cost_in_db.date,
+        user_id=cost_in_db.user_id,
+        category_id=cost_in_db.category_id,
+        currency_id=cost_in_db.currency_id,
+        delta=cost_in_db.value,
+        entries=1,
     )
     cost: Cost = await CostsCRUD().get(id_=cost_in_db.id)
+    AnalyticsCRUD.invalidate_on_commit(cost_in_db.user_id)
+    dates_services.add_ledger_months(
+        LedgerTable.COSTS, cost_in_db.user_id, (cost_in_db.date,)
+    )
+    await dates_services.extend_ledger_watermarks(
+        LedgerTable.COSTS, (cost_in_db.date,)
+    )
 
-    return cost
+    return cost, await budgets_services.check(cost, total)
 
 
-async def delete(cost: Cost):
+async def parse_quick_add(
+    text: str, user_id: int, currency_id: int
+) -> CostUncommited:
+    """Parse the one-message cost (see `QUICK_ADD_REGEX`).
+    The category is resolved by the in-memory index of names.
+    """
+
+    if not (parsed := QUICK_ADD_REGEX.fullmatch(text)):
+        raise quick_add_error
+
+    try:
+        value = money_services.validate(parsed["value"])
+        date_ = (
+            dates_services.parse_date(parsed["date"])
+            if parsed["date"]
+            else date.today()
+        )
+    except ValidationError:
+        raise quick_add_error
 
-    await CurrenciesCRUD().increase_equity(
-        id_=cost.currency.id, value=cost.value
+    match await categories_services.search(parsed["category"]):
+        case [category]:
+            pass
+        case []:
+            raise UserError(
+                f"⚠️ Категория {escape_html(parsed['category'])} не найдена"
+            )
+        case categories:
+            names = ", ".join(c.name for c in categories)
+            raise UserError(f"🤔 Уточните категорию: {names}")
+
+    return CostUncommited(
+        name=parsed["name"],
+        value=value,
+        date=date_,
+        user_id=user_id,
+        category_id=category.id,
+        currency_id=currency_id,
     )
-    await CostsCRUD().delete(id_=cost.id)
 
 
-async def get_last_months(
-    limit: int | None = None,
-) -> AsyncGenerator[str, None]:
+async def parse_quick_add_lines(
+    text: str, user_id: int, currency_id: int
+) -> list[CostUncommited]:
+    """Parse each non-empty line as the quick-add cost.
+    Errors of all lines are reported together.
+    """
 
-    try:
-        first = Cache.get(namespace="costs", key="first_date")
-        last = Cache.get(namespace="costs", key="last_date")
-    except NotFound:
-        crud = CostsCRUD()
-        first, last = await asyncio.gather(crud.first(), crud.last())
-        Cache.set(
-            namespace="costs",
-            key="first_date",
-            instance=first,
+    lines = [line for line in text.splitlines() if line.strip()]
+
+    if len(lines) > QUICK_ADD_MAX_LINES:
+        raise UserError(
+            f"⚠️ Не больше {QUICK_ADD_MAX_LINES} расходов в сообщении"
+        )
+
+    schemas: list[CostUncommited] = []
+    errors: list[str] = []
+
+    for number, line in enumerate(lines, start=1):
+        try:
+            schemas.append(await parse_quick_add(line, user_id, currency_id))
+        except UserError as error:
+            message = (
+                "некорректный ввод" if error is quick_add_error else error
+            )
+            errors.append(f"{number}. {message}")
+
+    if errors:
+        raise UserError(
+            "⚠️ Расходы не были сохранены\n\n"
+            + "\n".join(errors)
+            + f"\n\n{quick_add_error}"
+        )
+
+    return schemas
+
+
+async def add_many(
+    schemas: list[CostUncommited],
+) -> tuple[list[Cost], list[BudgetAlert]]:
+    """Save costs with one statement per table: costs and movements
+    of equity are inserted by multi-row inserts, monthly totals
+    get net deltas.
+    """
+
+    costs_in_db = await CostsCRUD().create_many(schemas)
+
+    monthly_deltas: defaultdict[tuple[date, int, int, int], int] = (
+        defaultdict(int)
+    )
+    monthly_entries: Counter[tuple[date, int, int, int]] = Counter()
+    for cost_in_db in costs_in_db:
+        key = (
+            cost_in_db.date.replace(day=1),
+            cost_in_db.user_id,
+            cost_in_db.category_id,
+            cost_in_db.currency_id,
         )
-        Cache.set(
-            namespace="costs",
-            key="last_date",
-            instance=last,
+        monthly_deltas[key] += cost_in_db.value
+        monthly_entries[key] += 1
+
+    await EquityCRUD().append(
+        [_movement(cost_in_db) for cost_in_db in costs_in_db]
+    )
+    currencies = {
+        currency.id: currency for currency in await CurrenciesCRUD().all()
+    }
+    totals = await AnalyticsCRUD().update_monthly_costs_many(
+        monthly_deltas, monthly_entries
+    )
+    for user_id in {cost_in_db.user_id for cost_in_db in costs_in_db}:
+        AnalyticsCRUD.invalidate_on_commit(user_id)
+    for user_id in {cost_in_db.user_id for cost_in_db in costs_in_db}:
+        dates_services.add_ledger_months(
+            LedgerTable.COSTS,
+            user_id,
+            (c.date for c in costs_in_db if c.user_id == user_id),
         )
+    await dates_services.extend_ledger_watermarks(
+        LedgerTable.COSTS, (cost_in_db.date for cost_in_db in costs_in_db)
+    )
 
-    for index, item in enumerate(
-        dates_services.represent_dates_range(
-            first.date, last.date, DateFormat.MONTHLY
+    categories = {c.id: c for c in await categories_services.get_all()}
+    costs = [
+        Cost(
+            id=cost_in_db.id,
+            name=cost_in_db.name,
+            value=cost_in_db.value,
+            date=cost_in_db.date,
+            user_id=cost_in_db.user_id,
+            category=categories[cost_in_db.category_id],
+            currency=currencies[cost_in_db.currency_id],
         )
-    ):
-        if limit and index > limit:
-            break
+        for cost_in_db in costs_in_db
+    ]
+
+    alerts: list[BudgetAlert] = []
+    checked: set[tuple[date, int, int, int]] = set()
+    for cost in costs:
+        key = (
+            cost.date.replace(day=1),
+            cost.user_id,
+            cost.category.id,
+            cost.currency.id,
+        )
+        if key in checked:
+            continue
+
+        checked.add(key)
+        if alert := await budgets_services.check(
+            cost, totals[key], delta=monthly_deltas[key]
+        ):
+            alerts.append(alert)
+
+    return costs, alerts
+
+
+async def delete(cost: Cost):
+
+    await EquityCRUD().append(
+        [
+            EquityMovementUncommited(
+                currency_id=cost.currency.id,
+                value=cost.value,
+                date=cost.date,
+                source=EquitySource.COSTS,
+                entry_id=cost.id,
+            )
+        ]
+    )
+    await CostsCRUD().delete(id_=cost.id)
+    await AnalyticsCRUD().update_monthly_costs(
+        day=cost.date,
+        user_id=cost.user_id,
+        category_id=cost.category.id,
+        currency_id=cost.currency.id,
+        delta=-cost.value,
+        entries=-1,
+    )
+    AnalyticsCRUD.invalidate_on_commit(cost.user_id)
+    dates_services.invalidate_ledger_months(LedgerTable.COSTS)
+    await dates_services.shrink_ledger_watermarks(LedgerTable.COSTS, cost.date)
+
+
+async def get_last_months(limit: int | None = None) -> list[str]:
+    """Months with costs from the latest one."""
+
+    if not (months := await dates_services.ledger_months(LedgerTable.COSTS)):
+        raise NotFound
 
-        yield item
+    return [
+        month.strftime(DateFormat.MONTHLY)
+        for month in reversed(months[-limit:] if limit else months)
+    ]
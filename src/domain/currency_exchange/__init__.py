@@ -1,3 +1,4 @@
 from src.domain.currency_exchange.constants import *  # noqa: F401, F403
 from src.domain.currency_exchange.models import *  # noqa: F401, F403
 from src.domain.currency_exchange.repository import *  # noqa: F401, F403
+from src.domain.currency_exchange.rates import *  # noqa: F401, F403
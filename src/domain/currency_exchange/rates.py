@@ -0,0 +1,138 @@
+"""
+This module includes the in-memory index of exchange rates
+which are implied by the currency exchanges history.
+
+Each exchange gives the rate of its pair in both directions. The rate
+of the date is the rate of the last exchange on or before that date,
+and the first known rate is used for dates before the history.
+"""
+
+from bisect import bisect_right
+from datetime import date
+from typing import Sequence
+
+from src.domain.currency_exchange.models import CurrencyExchangeInDB
+from src.domain.currency_exchange.repository import CurrencyExchangeCRUD
+
+__all__ = ("ExchangeRates",)
+
+
+class ExchangeRates:
+    """The as-of rates index per currency pair.
+
+    Usage:
+        await ExchangeRates.load()
+        ExchangeRates.rate(source_id, destination_id, day)
+        ExchangeRates.convert(source_id, destination_id, dates, values)
+    """
+
+    # (source currency id, destination currency id) -> (dates, rates)
+    _PAIRS: dict[tuple[int, int], tuple[list[date], list[float]]] = {}
+    _LOADED: bool = False
+    _LAST_ID: int = 0
+
+    @classmethod
+    def _insert(cls, record: CurrencyExchangeInDB) -> None:
+        if not (record.source_value and record.destination_value):
+            return
+
+        for pair, rate in (
+            (
+                (record.source_currency_id, record.destination_currency_id),
+                record.destination_value / record.source_value,
+            ),
+            (
+                (record.destination_currency_id, record.source_currency_id),
+                record.source_value / record.destination_value,
+            ),
+        ):
+            dates, rates = cls._PAIRS.setdefault(pair, ([], []))
+            index = bisect_right(dates, record.date)
+            dates.insert(index, record.date)
+            rates.insert(index, rate)
+
+        cls._LAST_ID = max(cls._LAST_ID, record.id)
+
+    @classmethod
+    async def load(cls, force: bool = False) -> None:
+        """Build the index from the whole history once."""
+
+        if cls._LOADED and not force:
+            return
+
+        records = await CurrencyExchangeCRUD().records()
+
+        cls._PAIRS = {}
+        cls._LAST_ID = 0
+        for record in records:
+            cls._insert(record)
+
+        cls._LOADED = True
+
+    @classmethod
+    def add(cls, record: CurrencyExchangeInDB) -> None:
+        """Update the index with the saved exchange.
+        Records which are already loaded are skipped.
+        """
+
+        if cls._LOADED and record.id > cls._LAST_ID:
+            cls._insert(record)
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._PAIRS = {}
+        cls._LOADED = False
+        cls._LAST_ID = 0
+
+    @classmethod
+    def rate(
+        cls, source_id: int, destination_id: int, day: date
+    ) -> float | None:
+        if source_id == destination_id:
+            return 1.0
+
+        if not (pair := cls._PAIRS.get((source_id, destination_id))):
+            return None
+
+        dates, rates = pair
+        return rates[max(bisect_right(dates, day) - 1, 0)]
+
+    @classmethod
+    def convert(
+        cls,
+        source_id: int,
+        destination_id: int,
+        dates: Sequence[date],
+        values: Sequence[int],
+    ) -> list[int] | None:
+        """Convert values of the source currency by rates of their dates.
+        Dates are matched with the rates history in a single merge pass
+        if they are sorted. `None` is returned if the pair is unknown.
+        """
+
+        if source_id == destination_id:
+            return list(values)
+
+        if not (pair := cls._PAIRS.get((source_id, destination_id))):
+            return None
+
+        rates_dates, rates = pair
+        result: list[int] = []
+        index = 0
+        previous: date | None = None
+
+        for day, value in zip(dates, values):
+            if previous is not None and day >= previous:
+                # NOTE: The pointer only moves forward for sorted dates
+                while (
+                    index + 1 < len(rates_dates)
+                    and rates_dates[index + 1] <= day
+                ):
+                    index += 1
+            else:
+                index = max(bisect_right(rates_dates, day) - 1, 0)
+
+            result.append(round(value * rates[index]))
+            previous = day
+
+        return result
@@ -1,6 +1,6 @@
 from datetime import date
 
-from sqlalchemy import Result, select
+from sqlalchemy import Result, asc, select
 from sqlalchemy.orm import joinedload
 
 from src.domain.currency_exchange.models import (
@@ -62,3 +62,19 @@ class CurrencyExchangeCRUD(BaseCRUD):
             CurrencyExchange.from_orm(_schema)
             for _schema in result.scalars().all()
         ]
+
+    async def records(self) -> list[CurrencyExchangeInDB]:
+        """Return the whole history in the chronological order."""
+
+        query = select(
+            self.schema_class.id,
+            self.schema_class.source_value,
+            self.schema_class.destination_value,
+            self.schema_class.date,
+            self.schema_class.source_currency_id,
+            self.schema_class.destination_currency_id,
+            self.schema_class.user_id,
+        ).order_by(asc(self.schema_class.date), asc(self.schema_class.id))
+        result: Result = await self.execute(query)
+
+        return [CurrencyExchangeInDB.from_orm(row) for row in result.all()]
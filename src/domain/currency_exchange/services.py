@@ -1,26 +1,51 @@
+from functools import partial
+
+from src.domain.analytics import AnalyticsCRUD
 from src.domain.currency_exchange.models import (
     CurrencyExchange,
     CurrencyExchangeUncommited,
 )
+from src.domain.currency_exchange.rates import ExchangeRates
 from src.domain.currency_exchange.repository import CurrencyExchangeCRUD
-from src.domain.money import CurrenciesCRUD
+from src.domain.dates import LedgerTable
+from src.domain.dates import services as dates_services
+from src.domain.money import (
+    EquityCRUD,
+    EquityMovementUncommited,
+    EquitySource,
+)
+from src.infrastructure.database import on_commit
 
 
 async def save(schema: CurrencyExchangeUncommited) -> CurrencyExchange:
 
     exchange_crud = CurrencyExchangeCRUD()
-    currencies_crud = CurrenciesCRUD()
 
     currency_exchange_in_db = await exchange_crud.create(schema)
     currency_exchange = await exchange_crud.get(currency_exchange_in_db.id)
 
-    await currencies_crud.decrease_equity(
-        id_=currency_exchange.source_currency.id,
-        value=currency_exchange.source_value,
+    await EquityCRUD().append(
+        [
+            EquityMovementUncommited(
+                currency_id=currency_exchange_in_db.source_currency_id,
+                value=-currency_exchange_in_db.source_value,
+                date=currency_exchange_in_db.date,
+                source=EquitySource.CURRENCY_EXCHANGE,
+                entry_id=currency_exchange_in_db.id,
+            ),
+            EquityMovementUncommited(
+                currency_id=currency_exchange_in_db.destination_currency_id,
+                value=currency_exchange_in_db.destination_value,
+                date=currency_exchange_in_db.date,
+                source=EquitySource.CURRENCY_EXCHANGE,
+                entry_id=currency_exchange_in_db.id,
+            ),
+        ]
     )
-    await currencies_crud.increase_equity(
-        id_=currency_exchange.destination_currency.id,
-        value=currency_exchange.destination_value,
+    AnalyticsCRUD.invalidate_on_commit(currency_exchange_in_db.user_id)
+    on_commit(partial(ExchangeRates.add, currency_exchange_in_db))
+    await dates_services.extend_ledger_watermarks(
+        LedgerTable.CURRENCY_EXCHANGE, (currency_exchange_in_db.date,)
     )
 
     return currency_exchange
@@ -1,2 +1,3 @@
 from src.domain.dates.constants import *  # noqa: F401, F403
+from src.domain.dates.models import *  # noqa: F401, F403
 from src.domain.dates.repository import *  # noqa: F401, F403
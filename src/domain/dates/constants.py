@@ -1,6 +1,15 @@
 from enum import StrEnum
 
-__all__ = ("DateFormat",)
+__all__ = ("DateFormat", "LedgerTable", "RELATIVE_DAYS")
+
+# Words of dates relative to today by the number of days ago
+RELATIVE_DAYS: dict[str, int] = {
+    "сегодня": 0,
+    "today": 0,
+    "вчера": 1,
+    "yesterday": 1,
+    "позавчера": 2,
+}
 
 
 class DateFormat(StrEnum):
@@ -8,3 +17,13 @@ class DateFormat(StrEnum):
     MONTHLY = "%Y-%m"
     ANNUALLY = "%Y"
     DAILY = "%d"
+
+
+class LedgerTable(StrEnum):
+    """Tables of the ledger which are indexed by months
+    (costs and incomes) and by date watermarks (all of them).
+    """
+
+    COSTS = "costs"
+    INCOMES = "incomes"
+    CURRENCY_EXCHANGE = "currency_exchange"
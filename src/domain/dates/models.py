@@ -0,0 +1,12 @@
+from datetime import date
+
+from src.domain.dates.constants import LedgerTable
+from src.infrastructure.models import InternalModel
+
+__all__ = ("LedgerWatermark",)
+
+
+class LedgerWatermark(InternalModel):
+    ledger: LedgerTable
+    first_date: date
+    last_date: date
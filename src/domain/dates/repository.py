@@ -1,61 +1,172 @@
 from contextlib import suppress
 from datetime import date
 
-from sqlalchemy import asc, desc, select
+from sqlalchemy import Date, Select, cast, delete, func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as upsert
 from sqlalchemy.engine import Result
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.domain.dates.constants import LedgerTable
+from src.domain.dates.models import LedgerWatermark
 from src.infrastructure.cache import Cache
 from src.infrastructure.database import (
     CostSchema,
     CurrencyExchangeSchema,
     IncomeSchema,
+    LedgerWatermarkSchema,
+    MonthlyCostSchema,
 )
-from src.infrastructure.database.services.session import CTX_SESSION
+from src.infrastructure.database.services.session import current_session
 from src.infrastructure.errors import NotFound
 
+__all__ = ("DatesCRUD",)
+
+
+_BOUNDS: dict[LedgerTable, Select] = {
+    LedgerTable.COSTS: select(
+        func.min(CostSchema.date), func.max(CostSchema.date)
+    ),
+    LedgerTable.INCOMES: select(
+        func.min(IncomeSchema.date), func.max(IncomeSchema.date)
+    ),
+    LedgerTable.CURRENCY_EXCHANGE: select(
+        func.min(CurrencyExchangeSchema.date),
+        func.max(CurrencyExchangeSchema.date),
+    ),
+}
+
+
 class DatesCRUD:
 
     CACHE_NAMESPACE = "dates"
+    WATERMARKS_CACHE_NAMESPACE = f"{CACHE_NAMESPACE}:watermarks"
 
     def __init__(self) -> None:
-        self._session: AsyncSession = CTX_SESSION.get()
+        self._session: AsyncSession = current_session()
+
+    async def watermarks(self) -> dict[LedgerTable, LedgerWatermark]:
+        """Dates bounds of ledger tables which have entries."""
 
-    async def first(self) -> date:
         with suppress(NotFound):
-            return Cache.get(self.CACHE_NAMESPACE, "first")
+            return Cache.get(self.WATERMARKS_CACHE_NAMESPACE, "all")
 
-        query = (
-            select(CostSchema.date)
-            .union(
-                select(IncomeSchema.date), select(CurrencyExchangeSchema.date)
-            )
-            .order_by(asc("date"))
-            .limit(1)
+        results: Result = await self._session.execute(
+            select(LedgerWatermarkSchema)
         )
-        results: Result = await self._session.execute(query)
+        watermarks = {
+            LedgerTable(schema.ledger): LedgerWatermark.from_orm(schema)
+            for schema in results.scalars().all()
+        }
+        Cache.set(self.WATERMARKS_CACHE_NAMESPACE, "all", watermarks)
+
+        return watermarks
 
-        if not (result := results.scalar_one_or_none()):
+    async def first(self) -> date:
+        if not (watermarks := await self.watermarks()):
             raise NotFound
 
-        return result
+        return min(watermark.first_date for watermark in watermarks.values())
 
     async def last(self) -> date:
-        with suppress(NotFound):
-            return Cache.get(self.CACHE_NAMESPACE, "last")
+        if not (watermarks := await self.watermarks()):
+            raise NotFound
+
+        return max(watermark.last_date for watermark in watermarks.values())
 
-        query = (
-            select(CostSchema.date)
-            .union(
-                select(IncomeSchema.date), select(CurrencyExchangeSchema.date)
+    async def extend(
+        self, table: LedgerTable, first_date: date, last_date: date
+    ) -> None:
+        """Widen watermarks of the table to include the dates range."""
+
+        query = upsert(LedgerWatermarkSchema).values(
+            ledger=table, first_date=first_date, last_date=last_date
+        )
+
+        await self._session.execute(
+            query.on_conflict_do_update(
+                index_elements=(LedgerWatermarkSchema.ledger,),
+                set_={
+                    "first_date": func.least(
+                        LedgerWatermarkSchema.first_date,
+                        query.excluded.first_date,
+                    ),
+                    "last_date": func.greatest(
+                        LedgerWatermarkSchema.last_date,
+                        query.excluded.last_date,
+                    ),
+                },
             )
-            .order_by(desc("date"))
-            .limit(1)
         )
 
-        results: Result = await self._session.execute(query)
+    async def rebuild(self, table: LedgerTable) -> None:
+        """Recompute watermarks of the table from its entries."""
 
-        if not (result := results.scalar_one_or_none()):
-            raise NotFound
+        results: Result = await self._session.execute(_BOUNDS[table])
+        first_date, last_date = results.one()
+
+        if first_date is None:
+            await self._session.execute(
+                delete(LedgerWatermarkSchema).where(
+                    LedgerWatermarkSchema.ledger == table
+                )
+            )
+            return
+
+        query = upsert(LedgerWatermarkSchema).values(
+            ledger=table, first_date=first_date, last_date=last_date
+        )
+        await self._session.execute(
+            query.on_conflict_do_update(
+                index_elements=(LedgerWatermarkSchema.ledger,),
+                set_={
+                    "first_date": query.excluded.first_date,
+                    "last_date": query.excluded.last_date,
+                },
+            )
+        )
+
+    async def months(
+        self, table: LedgerTable, user_id: int | None = None
+    ) -> list[date]:
+        """First days of months which contain entries of the table
+        in ascending order. Months of costs are taken from the monthly
+        aggregates and months of incomes from incomes.
+
+        NOTE: Months are found by the loose index scan (the recursive
+              query jumps to the next month by the index), so the query
+              costs one index probe per month instead of the scan
+        """
+
+        if table == LedgerTable.COSTS:
+            day = MonthlyCostSchema.month
+            conditions = [MonthlyCostSchema.entries > 0]
+            if user_id is not None:
+                conditions.append(MonthlyCostSchema.user_id == user_id)
+        else:
+            day = IncomeSchema.date
+            conditions = []
+            if user_id is not None:
+                conditions.append(IncomeSchema.user_id == user_id)
+
+        months = (
+            select(func.min(day).label("day"))
+            .where(*conditions)
+            .cte("months", recursive=True)
+        )
+        next_month = func.date_trunc("month", months.c.day) + literal_column(
+            "interval '1 month'"
+        )
+        months = months.union_all(
+            select(
+                select(func.min(day))
+                .where(*conditions, day >= next_month)
+                .scalar_subquery()
+            ).where(months.c.day.is_not(None))
+        )
+        month = cast(func.date_trunc("month", months.c.day), Date)
+
+        results: Result = await self._session.execute(
+            select(month).where(months.c.day.is_not(None)).order_by(month)
+        )
 
-        return result
+        return list(results.scalars().all())
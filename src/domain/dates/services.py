@@ -1,9 +1,14 @@
 import calendar
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from functools import partial
-from typing import Generator
+from typing import Generator, Iterable
 
-from src.domain.dates.constants import DateFormat
+from src.domain.dates.constants import RELATIVE_DAYS, DateFormat, LedgerTable
+from src.domain.dates.models import LedgerWatermark
+from src.domain.dates.repository import DatesCRUD
+from src.infrastructure.cache import Cache
+from src.infrastructure.database import on_commit
+from src.infrastructure.errors import NotFound, ValidationError
 
 
 def month_dates_range(year: int, month: int) -> tuple[date, date]:
@@ -30,17 +35,175 @@ def previous_month_edge_dates() -> tuple[date, date]:
     )
 
 
+def last_months(amount: int) -> list[date]:
+    """First days of the last months in ascending order.
+    The current month is the last one.
+    """
+
+    today = date.today()
+    index = today.year * 12 + today.month - 1
+
+    return [
+        date(year=month_index // 12, month=month_index % 12 + 1, day=1)
+        for month_index in range(index - amount + 1, index + 1)
+    ]
+
+
 def represent_dates_range(
     first_date: date, last_date: date, date_format: DateFormat
 ) -> Generator[str, None, None]:
+    """Months of the range from the last one. Months are stepped
+    by their indexes, so the month of the first date is never skipped.
+    """
+
+    first_index = first_date.year * 12 + first_date.month - 1
+    last_index = last_date.year * 12 + last_date.month - 1
+
+    for month_index in range(last_index, first_index - 1, -1):
+        yield date(
+            year=month_index // 12, month=month_index % 12 + 1, day=1
+        ).strftime(date_format)
+
+
+def _months_namespace(table: LedgerTable) -> str:
+    return f"{DatesCRUD.CACHE_NAMESPACE}:months:{table}"
+
+
+async def ledger_months(
+    table: LedgerTable, user_id: int | None = None
+) -> list[date]:
+    """First days of months which contain entries of the table
+    in ascending order. The index is cached and is kept updated
+    by writes (see `add_ledger_months`, `invalidate_ledger_months`).
+    """
+
+    namespace = _months_namespace(table)
+
+    try:
+        return Cache.get(namespace, user_id)
+    except NotFound:
+        months = await DatesCRUD().months(table, user_id)
+        Cache.set(namespace, user_id, months)
+
+    return months
+
+
+def _add_months(
+    table: LedgerTable, user_id: int, months: set[date]
+) -> None:
+    namespace = _months_namespace(table)
+
+    for key in (None, user_id):
+        try:
+            cached: list[date] = Cache.get(namespace, key)
+        except NotFound:
+            continue
+
+        if not months.issubset(cached):
+            Cache.set(namespace, key, sorted(months.union(cached)))
+
+
+def add_ledger_months(
+    table: LedgerTable, user_id: int, dates: Iterable[date]
+) -> None:
+    """Add months of new entries to the index once they are committed."""
+
+    months = {day.replace(day=1) for day in dates}
+    on_commit(partial(_add_months, table, user_id, months))
+
+
+def invalidate_ledger_months(table: LedgerTable) -> None:
+    """Deleted entries may leave months empty,
+    so the index of the table is fetched again after the commit.
+    """
+
+    on_commit(partial(Cache.invalidate, _months_namespace(table)))
+
 
-    if first_date == last_date:
-        yield last_date.strftime(date_format)
+def _invalidate_watermarks() -> None:
+    on_commit(partial(Cache.invalidate, DatesCRUD.WATERMARKS_CACHE_NAMESPACE))
+
+
+async def extend_ledger_watermarks(
+    table: LedgerTable, dates: Iterable[date]
+) -> None:
+    """Widen watermarks by dates of new entries. The database is
+    not touched while dates are inside of the cached bounds.
+    """
+
+    if not (dates := list(dates)):
+        return
+
+    first_date, last_date = min(dates), max(dates)
+    crud = DatesCRUD()
+    watermark = (await crud.watermarks()).get(table)
+
+    if (
+        watermark is not None
+        and watermark.first_date <= first_date
+        and last_date <= watermark.last_date
+    ):
+        return
+
+    await crud.extend(table, first_date, last_date)
+    _invalidate_watermarks()
+
+
+async def shrink_ledger_watermarks(table: LedgerTable, day: date) -> None:
+    """Recompute watermarks if the deleted entry was on their edge.
+    It is supposed to be called after the entry is deleted.
+    """
+
+    crud = DatesCRUD()
+    watermark = (await crud.watermarks()).get(table)
+
+    if watermark is not None and (
+        watermark.first_date < day < watermark.last_date
+    ):
         return
 
-    while last_date > first_date:
-        yield last_date.strftime(date_format)
-        last_date -= timedelta(days=last_date.day)
+    await crud.rebuild(table)
+    _invalidate_watermarks()
+
+
+async def rebuild_ledger_watermarks() -> dict[LedgerTable, LedgerWatermark]:
+    crud = DatesCRUD()
+
+    for table in LedgerTable:
+        await crud.rebuild(table)
+
+    # NOTE: Rebuilt watermarks are read back for the report
+    #       and are dropped from the cache again after the commit
+    Cache.invalidate(DatesCRUD.WATERMARKS_CACHE_NAMESPACE)
+    _invalidate_watermarks()
+
+    return await crud.watermarks()
+
+
+def parse_date(payload: str, full: bool = False) -> date:
+    """Parse the relative word, the full date or the day with the month
+    of the current year (`15.04`). Only the full date is accepted
+    if `full`, since records of files are not related to today.
+    """
+
+    payload = payload.lower()
+    formats = [(DateFormat.FULL, payload), ("%d.%m.%Y", payload)]
+
+    if not full:
+        if (days := RELATIVE_DAYS.get(payload)) is not None:
+            return date.today() - timedelta(days=days)
+
+        # NOTE: The current year is appended before parsing, since 29.02
+        #       does not exist in the default year of `strptime`
+        formats.append(("%d.%m.%Y", f"{payload}.{date.today().year}"))
+
+    for date_format, value in formats:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+
+    raise ValidationError(f"Unknown date {payload}")
 
 
 def get_last_dates(amount: int) -> Generator[str, None, None]:
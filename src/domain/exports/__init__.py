@@ -0,0 +1,2 @@
+from src.domain.exports.constants import *  # noqa: F401, F403
+from src.domain.exports.repository import *  # noqa: F401, F403
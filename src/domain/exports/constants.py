@@ -0,0 +1,4 @@
+__all__ = ("EXPORT_VALUE_FORMAT",)
+
+# Cents are exported as the decimal value which is accepted by the import
+EXPORT_VALUE_FORMAT = "FM999999999990.00"
@@ -0,0 +1,118 @@
+from datetime import date
+from typing import IO
+
+from sqlalchemy import Select, String, cast, func, select
+from sqlalchemy.orm import aliased
+
+from src.domain.exports.constants import EXPORT_VALUE_FORMAT
+from src.infrastructure.database import (
+    CategorySchema,
+    CostSchema,
+    CurrencyExchangeSchema,
+    CurrencySchema,
+    IncomeSchema,
+    Session,
+    UserSchema,
+)
+
+__all__ = ("ExportsCRUD",)
+
+
+def _value(column):
+    return func.to_char(column / 100.0, EXPORT_VALUE_FORMAT)
+
+
+class ExportsCRUD(Session):
+    """The ledger in the dates range as CSV.
+    Rows are streamed by the server-side COPY straight into the file,
+    so they are never loaded into Python objects.
+    """
+
+    def costs(self, start: date, end: date) -> Select:
+        return (
+            select(
+                CostSchema.date,
+                _value(CostSchema.value).label("value"),
+                CostSchema.name,
+                CategorySchema.name.label("category"),
+                CurrencySchema.name.label("currency"),
+                UserSchema.username.label("user"),
+            )
+            .join(CategorySchema, CostSchema.category_id == CategorySchema.id)
+            .join(CurrencySchema, CostSchema.currency_id == CurrencySchema.id)
+            .join(UserSchema, CostSchema.user_id == UserSchema.id)
+            .where(CostSchema.date.between(start, end))
+            .order_by(CostSchema.date, CostSchema.id)
+        )
+
+    def incomes(self, start: date, end: date) -> Select:
+        return (
+            select(
+                IncomeSchema.date,
+                _value(IncomeSchema.value).label("value"),
+                IncomeSchema.name,
+                func.lower(cast(IncomeSchema.source, String)).label("source"),
+                CurrencySchema.name.label("currency"),
+                UserSchema.username.label("user"),
+            )
+            .join(
+                CurrencySchema, IncomeSchema.currency_id == CurrencySchema.id
+            )
+            .join(UserSchema, IncomeSchema.user_id == UserSchema.id)
+            .where(IncomeSchema.date.between(start, end))
+            .order_by(IncomeSchema.date, IncomeSchema.id)
+        )
+
+    def currency_exchanges(self, start: date, end: date) -> Select:
+        source = aliased(CurrencySchema)
+        destination = aliased(CurrencySchema)
+
+        return (
+            select(
+                CurrencyExchangeSchema.date,
+                _value(CurrencyExchangeSchema.source_value).label(
+                    "source_value"
+                ),
+                source.name.label("source_currency"),
+                _value(CurrencyExchangeSchema.destination_value).label(
+                    "destination_value"
+                ),
+                destination.name.label("destination_currency"),
+                UserSchema.username.label("user"),
+            )
+            .join(
+                source,
+                CurrencyExchangeSchema.source_currency_id == source.id,
+            )
+            .join(
+                destination,
+                CurrencyExchangeSchema.destination_currency_id
+                == destination.id,
+            )
+            .join(UserSchema, CurrencyExchangeSchema.user_id == UserSchema.id)
+            .where(CurrencyExchangeSchema.date.between(start, end))
+            .order_by(CurrencyExchangeSchema.date, CurrencyExchangeSchema.id)
+        )
+
+    async def copy(self, query: Select, file: IO[bytes]) -> int:
+        """Write rows of the query with the header into the file
+        by COPY ... TO STDOUT. The number of rows is returned.
+        """
+
+        connection = await self._session.connection()
+        raw_connection = await connection.get_raw_connection()
+        sql = str(
+            query.compile(
+                dialect=connection.dialect,
+                compile_kwargs={"literal_binds": True},
+            )
+        )
+
+        async def write(chunk: bytes) -> None:
+            file.write(chunk)
+
+        status: str = await raw_connection.driver_connection.copy_from_query(
+            sql, output=write, format="csv", header=True
+        )
+
+        return int(status.split()[-1])
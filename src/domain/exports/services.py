@@ -0,0 +1,32 @@
+from datetime import date
+from tempfile import SpooledTemporaryFile
+from typing import AsyncGenerator
+
+from src.domain.analytics import DOCUMENT_SPOOL_MAX_SIZE, ReportDocument
+from src.domain.dates import DateFormat
+from src.domain.exports.repository import ExportsCRUD
+
+
+async def export_in_range(
+    start: date, end: date
+) -> AsyncGenerator[ReportDocument, None]:
+    """Yield the CSV document per table of the ledger.
+    Tables without rows in the range are skipped.
+    """
+
+    crud = ExportsCRUD()
+    title = " - ".join(edge.strftime(DateFormat.FULL) for edge in (start, end))
+
+    for name, query in (
+        ("costs", crud.costs(start, end)),
+        ("incomes", crud.incomes(start, end)),
+        ("currency exchanges", crud.currency_exchanges(start, end)),
+    ):
+        file = SpooledTemporaryFile(max_size=DOCUMENT_SPOOL_MAX_SIZE)
+
+        if not await crud.copy(query, file):
+            file.close()
+            continue
+
+        file.seek(0)
+        yield ReportDocument(file_name=f"{name} {title}.csv", file=file)
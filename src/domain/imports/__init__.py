@@ -0,0 +1,3 @@
+from src.domain.imports.constants import *  # noqa: F401, F403
+from src.domain.imports.models import *  # noqa: F401, F403
+from src.domain.imports.repository import *  # noqa: F401, F403
@@ -0,0 +1,48 @@
+from enum import StrEnum
+
+__all__ = (
+    "ImportKind",
+    "IMPORT_BATCH_SIZE",
+    "IMPORT_ERRORS_LIMIT",
+    "IMPORT_COLUMNS",
+    "IMPORT_REQUIRED_COLUMNS",
+)
+
+# Rows which are parsed and copied at once. It bounds the memory
+# of the import regardless of the file size
+IMPORT_BATCH_SIZE = 10_000
+
+# Invalid rows which are described in the report
+IMPORT_ERRORS_LIMIT = 20
+
+
+class ImportKind(StrEnum):
+    COSTS = "costs"
+    INCOMES = "incomes"
+
+
+# Header aliases of bank exports -> columns of the import
+IMPORT_COLUMNS: dict[str, str] = {
+    "date": "date",
+    "дата": "date",
+    "дата операции": "date",
+    "value": "value",
+    "amount": "value",
+    "сумма": "value",
+    "сумма операции": "value",
+    "name": "name",
+    "description": "name",
+    "название": "name",
+    "описание": "name",
+    "category": "category",
+    "категория": "category",
+    "currency": "currency",
+    "валюта": "currency",
+    "source": "source",
+    "источник": "source",
+}
+
+IMPORT_REQUIRED_COLUMNS: dict[ImportKind, tuple[str, ...]] = {
+    ImportKind.COSTS: ("date", "value", "name", "category"),
+    ImportKind.INCOMES: ("date", "value", "name"),
+}
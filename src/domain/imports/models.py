@@ -0,0 +1,36 @@
+from src.domain.imports.constants import IMPORT_ERRORS_LIMIT, ImportKind
+from src.infrastructure.models import InternalModel
+
+__all__ = ("ImportReport",)
+
+
+class ImportReport(InternalModel):
+    kind: ImportKind
+    read: int = 0
+    invalid: int = 0
+    duplicates: int = 0
+    imported: int = 0
+    errors: list[str] = []
+
+    def reject(self, line: int, reason: str) -> None:
+        self.invalid += 1
+
+        if len(self.errors) < IMPORT_ERRORS_LIMIT:
+            self.errors.append(f"{line}: {reason}")
+
+    def repr(self) -> str:
+        lines = [
+            f"Импорт {self.kind}",
+            f"Прочитано строк 👉 {self.read}",
+            f"Добавлено 👉 {self.imported}",
+            f"Дубликаты 👉 {self.duplicates}",
+            f"Ошибки 👉 {self.invalid}",
+        ]
+
+        if self.errors:
+            lines += ["", *self.errors]
+
+        if self.invalid > len(self.errors):
+            lines.append(f"... и еще {self.invalid - len(self.errors)}")
+
+        return "\n".join(lines)
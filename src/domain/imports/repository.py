@@ -0,0 +1,255 @@
+from datetime import date
+
+from sqlalchemy import (
+    Column,
+    Date,
+    Integer,
+    MetaData,
+    Result,
+    String,
+    Table,
+    and_,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import insert as upsert
+from sqlalchemy.schema import CreateTable
+
+from src.domain.imports.constants import ImportKind
+from src.domain.money import EquitySource
+from src.infrastructure.database import (
+    CostSchema,
+    EquityMovementSchema,
+    IncomeSchema,
+    MonthlyCostSchema,
+    Session,
+)
+
+__all__ = ("ImportsCRUD", "STAGING_TABLES")
+
+
+_metadata = MetaData()
+
+# NOTE: Staging tables are temporary, so concurrent imports
+#       do not see each other's rows and tables are dropped on commit
+STAGING_TABLES: dict[ImportKind, Table] = {
+    ImportKind.COSTS: Table(
+        "import_costs",
+        _metadata,
+        Column("line", Integer, nullable=False),
+        Column("name", String, nullable=False),
+        Column("value", Integer, nullable=False),
+        Column("date", Date, nullable=False),
+        Column("category_id", Integer, nullable=False),
+        Column("currency_id", Integer, nullable=False),
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    ),
+    ImportKind.INCOMES: Table(
+        "import_incomes",
+        _metadata,
+        Column("line", Integer, nullable=False),
+        Column("name", String, nullable=False),
+        Column("value", Integer, nullable=False),
+        Column("source", String, nullable=False),
+        Column("date", Date, nullable=False),
+        Column("currency_id", Integer, nullable=False),
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    ),
+}
+
+_TARGETS = {
+    ImportKind.COSTS: CostSchema,
+    ImportKind.INCOMES: IncomeSchema,
+}
+
+
+class ImportsCRUD(Session):
+    """The set-based merge of the imported rows.
+    Rows are copied into the staging table of the transaction
+    and are merged into the ledger by a few statements.
+    """
+
+    def __init__(self, kind: ImportKind) -> None:
+        super().__init__()
+
+        self.kind = kind
+        self.table: Table = STAGING_TABLES[kind]
+        self.target = _TARGETS[kind]
+
+    async def create_staging(self) -> None:
+        await self.execute(CreateTable(self.table))
+
+    async def copy(self, records: list[tuple]) -> None:
+        """Copy records with the binary COPY protocol of asyncpg
+        on the connection of the current transaction.
+        """
+
+        connection = await self._session.connection()
+        raw_connection = await connection.get_raw_connection()
+
+        await raw_connection.driver_connection.copy_records_to_table(
+            self.table.name,
+            records=records,
+            columns=[column.name for column in self.table.columns],
+        )
+
+    async def analyze(self) -> None:
+        # NOTE: Temporary tables are not analyzed by the autovacuum
+        await self.execute(text(f"ANALYZE {self.table.name}"))
+
+    async def delete_duplicates(self, user_id: int) -> int:
+        """Drop staged rows which already exist in the ledger of the user
+        by (date, value, name). Repeated rows of the file are kept
+        as long as the ledger has fewer of them.
+        """
+
+        staging = self.table.c
+        key = (staging.date, staging.value, staging.name)
+        numbered = select(
+            staging.line,
+            *key,
+            func.row_number().over(partition_by=key).label("number"),
+        ).cte("numbered")
+        existing = (
+            select(
+                self.target.date,
+                self.target.value,
+                self.target.name,
+                func.count().label("amount"),
+            )
+            .where(
+                self.target.user_id == user_id,
+                self.target.date.between(
+                    select(func.min(staging.date)).scalar_subquery(),
+                    select(func.max(staging.date)).scalar_subquery(),
+                ),
+            )
+            .group_by(self.target.date, self.target.value, self.target.name)
+            .cte("existing")
+        )
+        duplicates = (
+            select(numbered.c.line)
+            .join(
+                existing,
+                and_(
+                    numbered.c.date == existing.c.date,
+                    numbered.c.value == existing.c.value,
+                    numbered.c.name == existing.c.name,
+                ),
+            )
+            .where(numbered.c.number <= existing.c.amount)
+        )
+        result: Result = await self.execute(
+            delete(self.table).where(staging.line.in_(duplicates))
+        )
+
+        return result.rowcount
+
+    async def merge(self, user_id: int) -> int:
+        """Insert staged rows into the ledger in the order of the file
+        with movements of equity by the same statement.
+        """
+
+        staging = self.table.c
+
+        if self.kind == ImportKind.COSTS:
+            columns = ("category_id",)
+            values = (staging.category_id,)
+        else:
+            columns = ("source",)
+            values = (cast(staging.source, IncomeSchema.source.type),)
+
+        merged = (
+            insert(self.target)
+            .from_select(
+                ("name", "value", "date", "user_id", "currency_id", *columns),
+                select(
+                    staging.name,
+                    staging.value,
+                    staging.date,
+                    literal(user_id),
+                    staging.currency_id,
+                    *values,
+                ).order_by(staging.line),
+            )
+            .returning(
+                self.target.id,
+                self.target.value,
+                self.target.date,
+                self.target.currency_id,
+            )
+            .cte("merged")
+        )
+        sign = -1 if self.kind == ImportKind.COSTS else 1
+        query = (
+            insert(EquityMovementSchema)
+            .from_select(
+                ("currency_id", "value", "date", "source", "entry_id"),
+                select(
+                    merged.c.currency_id,
+                    sign * merged.c.value,
+                    merged.c.date,
+                    literal(EquitySource(self.kind)),
+                    merged.c.id,
+                ),
+            )
+            .add_cte(merged)
+        )
+        result: Result = await self.execute(query)
+
+        return result.rowcount
+
+    async def dates_range(self) -> tuple[date, date]:
+        result: Result = await self.execute(
+            select(func.min(self.table.c.date), func.max(self.table.c.date))
+        )
+
+        return result.one()
+
+    async def merge_monthly_costs(self, user_id: int) -> None:
+        """Add staged costs to the monthly aggregates by one upsert."""
+
+        staging = self.table.c
+        month = cast(func.date_trunc("month", staging.date), Date)
+        query = upsert(MonthlyCostSchema).from_select(
+            (
+                "month",
+                "user_id",
+                "category_id",
+                "currency_id",
+                "value",
+                "entries",
+            ),
+            select(
+                month,
+                literal(user_id),
+                staging.category_id,
+                staging.currency_id,
+                func.sum(staging.value),
+                func.count(),
+            ).group_by(month, staging.category_id, staging.currency_id),
+        )
+
+        await self.execute(
+            query.on_conflict_do_update(
+                index_elements=(
+                    MonthlyCostSchema.month,
+                    MonthlyCostSchema.user_id,
+                    MonthlyCostSchema.category_id,
+                    MonthlyCostSchema.currency_id,
+                ),
+                set_={
+                    "value": MonthlyCostSchema.value + query.excluded.value,
+                    "entries": (
+                        MonthlyCostSchema.entries + query.excluded.entries
+                    ),
+                },
+            )
+        )
@@ -0,0 +1,215 @@
+import csv
+from datetime import date
+from itertools import chain
+from typing import AsyncGenerator, Iterable
+
+from src.domain.categories import services as categories_services
+from src.domain.dates import LedgerTable
+from src.domain.dates import services as dates_services
+from src.domain.imports.constants import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_COLUMNS,
+    IMPORT_REQUIRED_COLUMNS,
+    ImportKind,
+)
+from src.domain.imports.models import ImportReport
+from src.domain.imports.repository import ImportsCRUD
+from src.domain.money import CurrenciesCRUD
+from src.domain.money import services as money_services
+from src.domain.users import User
+from src.infrastructure.database import IncomeSource
+from src.infrastructure.errors import UserError, ValidationError
+
+DELIMITERS = (",", ";", "\t")
+
+
+def _columns(header: list[str], kind: ImportKind) -> dict[str, int]:
+    """Map columns of the import to positions in the header."""
+
+    columns: dict[str, int] = {}
+    for position, title in enumerate(header):
+        title = title.strip().lstrip("\ufeff").lower()
+        if (column := IMPORT_COLUMNS.get(title)) and column not in columns:
+            columns[column] = position
+
+    if missing := [
+        column
+        for column in IMPORT_REQUIRED_COLUMNS[kind]
+        if column not in columns
+    ]:
+        raise UserError(f"⚠️ В файле нет колонок: {', '.join(missing)}")
+
+    return columns
+
+
+class _Resolver:
+    """Resolve values of the file which repeat from row to row.
+    Results are memoized, so each distinct date, category
+    and currency is looked up once per file.
+    """
+
+    def __init__(self, default_currency_id: int) -> None:
+        self.default_currency_id = default_currency_id
+        self._dates: dict[str, date] = {}
+        self._categories: dict[str, int] = {}
+        self._currencies: dict[str, int] = {}
+
+    async def load(self) -> None:
+        for currency in await CurrenciesCRUD().all():
+            self._currencies[currency.name.lower()] = currency.id
+            self._currencies[currency.sign] = currency.id
+
+    def date(self, payload: str) -> date:
+        if not payload:
+            raise UserError("нет даты")
+
+        try:
+            return self._dates[payload]
+        except KeyError:
+            # NOTE: Bank exports may include the time of the operation
+            parsed = dates_services.parse_date(
+                payload.split()[0], full=True
+            )
+            self._dates[payload] = parsed
+
+            return parsed
+
+    async def category(self, payload: str) -> int:
+        try:
+            return self._categories[payload]
+        except KeyError:
+            pass
+
+        match await categories_services.search(payload):
+            case [category]:
+                self._categories[payload] = category.id
+                return category.id
+            case []:
+                raise UserError(f"категория {payload} не найдена")
+            case _:
+                raise UserError(f"категория {payload} неоднозначна")
+
+    def currency(self, payload: str) -> int:
+        if not payload:
+            return self.default_currency_id
+
+        try:
+            return self._currencies[payload.lower()]
+        except KeyError:
+            raise UserError(f"валюта {payload} не найдена")
+
+
+async def parse(
+    lines: Iterable[str],
+    kind: ImportKind,
+    default_currency_id: int,
+    report: ImportReport,
+) -> AsyncGenerator[list[tuple], None]:
+    """Parse the CSV file lazily into batches of staging records.
+    The delimiter is detected by the header. Invalid rows
+    are counted by the report and are skipped.
+    """
+
+    lines = iter(lines)
+    if not (first := next(lines, "")).strip():
+        raise UserError("⚠️ Файл пуст")
+
+    delimiter = max(DELIMITERS, key=first.count)
+    reader = csv.reader(chain((first,), lines), delimiter=delimiter)
+    columns = _columns(next(reader), kind)
+
+    resolver = _Resolver(default_currency_id)
+    await resolver.load()
+
+    def _field(row: list[str], column: str) -> str:
+        position = columns.get(column)
+        if position is None or position >= len(row):
+            return ""
+
+        return row[position].replace("\xa0", " ").strip()
+
+    batch: list[tuple] = []
+    for row in reader:
+        if not any(row):
+            continue
+
+        report.read += 1
+        line = reader.line_num
+
+        try:
+            if not (name := _field(row, "name")):
+                raise UserError("нет названия")
+
+            value = money_services.validate(_field(row, "value"))
+            if not value:
+                raise UserError("нулевое значение")
+
+            day = resolver.date(_field(row, "date"))
+            currency_id = resolver.currency(_field(row, "currency"))
+
+            if kind == ImportKind.COSTS:
+                category_id = await resolver.category(
+                    _field(row, "category")
+                )
+                record = (line, name, value, day, category_id, currency_id)
+            else:
+                source = (
+                    _field(row, "source").lower() or IncomeSource.REVENUE
+                )
+                record = (
+                    line,
+                    name,
+                    value,
+                    IncomeSource(source).name,
+                    day,
+                    currency_id,
+                )
+        except (UserError, ValidationError, ValueError) as error:
+            report.reject(line, str(error))
+            continue
+
+        batch.append(record)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+async def run(
+    lines: Iterable[str], kind: ImportKind, user: User
+) -> ImportReport:
+    """Import the CSV file into the ledger of the user.
+    It is supposed to be run in the transaction: rows are copied
+    into the staging table by batches, deduplicated and merged
+    with movements of equity, monthly aggregates and dates watermarks
+    are updated once at the end.
+    """
+
+    report = ImportReport(kind=kind)
+    crud = ImportsCRUD(kind)
+
+    await crud.create_staging()
+    async for batch in parse(
+        lines, kind, user.configuration.default_currency.id, report
+    ):
+        await crud.copy(batch)
+
+    await crud.analyze()
+    report.duplicates = await crud.delete_duplicates(user.id)
+    report.imported = await crud.merge(user.id)
+
+    if not report.imported:
+        return report
+
+    if kind == ImportKind.COSTS:
+        await crud.merge_monthly_costs(user.id)
+
+    # NOTE: Caches are not invalidated here, since they are in-memory
+    #       caches of the bot process (see `src.import_csv`)
+    await dates_services.extend_ledger_watermarks(
+        LedgerTable(kind), await crud.dates_range()
+    )
+
+    return report
@@ -35,6 +35,7 @@ class AddIncomeCallbackOperation(StrEnum):
 class DeleteIncomeCallbackOperation(StrEnum):
     SELECT_MONTH = str(uuid4())
     SELECT_INCOME = str(uuid4())
+    SELECT_PAGE = str(uuid4())
     SELECT_CONFIRMATION = str(uuid4())
     SELECT_YES = str(uuid4())
     SELECT_NO = str(uuid4())
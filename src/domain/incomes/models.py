@@ -9,6 +9,7 @@ __all__ = (
     "IncomeUncommited",
     "IncomeInDB",
     "Income",
+    "IncomeLabel",
 )
 
 
@@ -32,6 +33,7 @@ class Income(InternalModel):
     value: int
     source: IncomeSource
     date: date
+    user_id: int
 
     currency: CurrencyInDB
 
@@ -45,3 +47,20 @@ class Income(InternalModel):
                 f"Дата 👉 {self.date}",
             )
         )
+
+
+class IncomeLabel(InternalModel):
+    """The income as the button of the picker."""
+
+    id: int
+    name: str
+    value: int
+    date: date
+    currency_sign: str
+
+    def repr(self) -> str:
+        return (
+            f"{self.name}: "
+            f"{money_services.repr_value(self.value)}{self.currency_sign} "
+            f"({self.date.strftime('%m-%d')})"
+        )
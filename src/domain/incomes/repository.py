@@ -2,14 +2,20 @@ import calendar
 from datetime import date, datetime
 from typing import AsyncGenerator
 
-from sqlalchemy import Result, asc, select
+from sqlalchemy import Result, select
 from sqlalchemy.orm import joinedload
 
 from src.domain.dates import DateFormat
-from src.domain.incomes.models import Income, IncomeInDB, IncomeUncommited
+from src.domain.incomes.models import (
+    Income,
+    IncomeInDB,
+    IncomeLabel,
+    IncomeUncommited,
+)
 from src.domain.users import User
-from src.infrastructure.database import BaseCRUD, IncomeSchema
-from src.infrastructure.errors import DatabaseError, NotFound
+from src.infrastructure.database import BaseCRUD, CurrencySchema, IncomeSchema
+from src.infrastructure.errors import NotFound
+from src.infrastructure.pagination import Cursor, Page
 
 __all__ = ("IncomesCRUD",)
 
@@ -54,9 +60,12 @@ class IncomesCRUD(BaseCRUD[IncomeSchema]):
         _schema: IncomeSchema = await self._last(by="date")
         return IncomeInDB.from_orm(_schema)
 
-    async def filter_for_delete(
-        self, month: str
-    ) -> AsyncGenerator[Income, None]:
+    async def page_for_delete(
+        self, month: str, cursor: Cursor | None = None
+    ) -> Page:
+        """Labels of incomes of the month by pages.
+        Only columns of the label are selected.
+        """
 
         first_date: date = datetime.strptime(month, DateFormat.MONTHLY).date()
         _, last_day = calendar.monthrange(first_date.year, first_date.month)
@@ -65,22 +74,26 @@ class IncomesCRUD(BaseCRUD[IncomeSchema]):
         )
 
         query = (
-            select(self.schema_class)
+            select(
+                self.schema_class.id,
+                self.schema_class.name,
+                self.schema_class.value,
+                self.schema_class.date,
+                CurrencySchema.sign.label("currency_sign"),
+            )
+            .join(
+                CurrencySchema,
+                self.schema_class.currency_id == CurrencySchema.id,
+            )
             .filter(
                 self.schema_class.date >= first_date,
                 self.schema_class.date <= last_date,
             )
-            .order_by(asc("date"))
-            .options(joinedload(self.schema_class.currency))
         )
+        page: Page = await self._keyset_page(query, cursor)
+        page.items = [IncomeLabel.from_orm(row) for row in page.items]
 
-        try:
-            result: Result = await self._session.execute(query)
-        except self._ERRORS:
-            raise DatabaseError
-
-        for element in result.scalars().all():
-            yield Income.from_orm(element)
+        return page
 
     async def in_dates_range(
         self, start: date, end: date, user: User | None = None
@@ -1,12 +1,13 @@
-import asyncio
-from typing import AsyncGenerator
-
-from src.domain.dates import DateFormat
+from src.domain.analytics import AnalyticsCRUD
+from src.domain.dates import DateFormat, LedgerTable
 from src.domain.dates import services as dates_services
 from src.domain.incomes.models import Income, IncomeInDB, IncomeUncommited
 from src.domain.incomes.repository import IncomesCRUD
-from src.domain.money import CurrenciesCRUD
-from src.infrastructure.cache import Cache
+from src.domain.money import (
+    EquityCRUD,
+    EquityMovementUncommited,
+    EquitySource,
+)
 from src.infrastructure.errors import NotFound
 
 
@@ -14,49 +15,59 @@ async def add(schema: IncomeUncommited) -> Income:
 
     income_in_db: IncomeInDB = await IncomesCRUD().create(schema)
 
-    await CurrenciesCRUD().increase_equity(
-        id_=income_in_db.currency_id, value=income_in_db.value
+    await EquityCRUD().append(
+        [
+            EquityMovementUncommited(
+                currency_id=income_in_db.currency_id,
+                value=income_in_db.value,
+                date=income_in_db.date,
+                source=EquitySource.INCOMES,
+                entry_id=income_in_db.id,
+            )
+        ]
     )
     income: Income = await IncomesCRUD().get(id_=income_in_db.id)
+    AnalyticsCRUD.invalidate_on_commit(income_in_db.user_id)
+    dates_services.add_ledger_months(
+        LedgerTable.INCOMES, income_in_db.user_id, (income_in_db.date,)
+    )
+    await dates_services.extend_ledger_watermarks(
+        LedgerTable.INCOMES, (income_in_db.date,)
+    )
 
     return income
 
 
 async def delete(cost: Income):
 
-    await CurrenciesCRUD().decrease_equity(
-        id_=cost.currency.id, value=cost.value
+    await EquityCRUD().append(
+        [
+            EquityMovementUncommited(
+                currency_id=cost.currency.id,
+                value=-cost.value,
+                date=cost.date,
+                source=EquitySource.INCOMES,
+                entry_id=cost.id,
+            )
+        ]
     )
     await IncomesCRUD().delete(id_=cost.id)
+    AnalyticsCRUD.invalidate_on_commit(cost.user_id)
+    dates_services.invalidate_ledger_months(LedgerTable.INCOMES)
+    await dates_services.shrink_ledger_watermarks(
+        LedgerTable.INCOMES, cost.date
+    )
+
 
+async def get_last_months(limit: int | None = None) -> list[str]:
+    """Months with incomes from the latest one."""
 
-async def get_last_months(
-    limit: int | None = None,
-) -> AsyncGenerator[str, None]:
-
-    try:
-        first = Cache.get(namespace="incomes", key="first_date")
-        last = Cache.get(namespace="incomes", key="last_date")
-    except NotFound:
-        crud = IncomesCRUD()
-        first, last = await asyncio.gather(crud.first(), crud.last())
-        Cache.set(
-            namespace="incomes",
-            key="first_date",
-            instance=first,
-        )
-        Cache.set(
-            namespace="incomes",
-            key="last_date",
-            instance=last,
-        )
-
-    for index, item in enumerate(
-        dates_services.represent_dates_range(
-            first.date, last.date, DateFormat.MONTHLY
-        )
+    if not (
+        months := await dates_services.ledger_months(LedgerTable.INCOMES)
     ):
-        if limit and index > limit:
-            break
+        raise NotFound
 
-        yield item
+    return [
+        month.strftime(DateFormat.MONTHLY)
+        for month in reversed(months[-limit:] if limit else months)
+    ]
@@ -1,2 +1,3 @@
+from src.domain.money.constants import *  # noqa: F401, F403
 from src.domain.money.models import *  # noqa: F401, F403
 from src.domain.money.repository import *  # noqa: F401, F403
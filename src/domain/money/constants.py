@@ -0,0 +1,23 @@
+from enum import StrEnum
+
+__all__ = (
+    "EquitySource",
+    "EQUITY_SNAPSHOT_INTERVAL",
+    "EQUITY_SNAPSHOT_LOCK_TIMEOUT",
+)
+
+# The number of movements after the latest snapshot
+# which triggers the next one on the equity read
+EQUITY_SNAPSHOT_INTERVAL = 1000
+
+# The snapshot gives up instead of stalling writers for long
+EQUITY_SNAPSHOT_LOCK_TIMEOUT = "2s"
+
+
+class EquitySource(StrEnum):
+    """What has caused the movement of equity."""
+
+    OPENING = "opening"
+    COSTS = "costs"
+    INCOMES = "incomes"
+    CURRENCY_EXCHANGE = "currency_exchange"
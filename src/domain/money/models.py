@@ -1,8 +1,16 @@
+from datetime import date
+
 from pydantic import Field
 
+from src.domain.money.constants import EquitySource
 from src.infrastructure.models import InternalModel
 
-__all__ = ("CurrencyUncommited", "CurrencyInDB")
+__all__ = (
+    "CurrencyUncommited",
+    "CurrencyInDB",
+    "EquityMovementUncommited",
+    "Equity",
+)
 
 
 class CurrencyUncommited(InternalModel):
@@ -12,4 +20,16 @@ class CurrencyUncommited(InternalModel):
 
 class CurrencyInDB(CurrencyUncommited):
     id: int
-    equity: int
+
+
+class EquityMovementUncommited(InternalModel):
+    currency_id: int
+    value: int
+    date: date
+    source: EquitySource
+    entry_id: int | None = None
+
+
+class Equity(InternalModel):
+    currency: CurrencyInDB
+    value: int
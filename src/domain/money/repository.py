@@ -1,15 +1,40 @@
-from sqlalchemy import Result, select
-
-from src.domain.money.models import CurrencyInDB, CurrencyUncommited
-from src.infrastructure.database import BaseCRUD, CurrencySchema
+from sqlalchemy import (
+    BigInteger,
+    Result,
+    Subquery,
+    cast,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    union_all,
+)
+
+from src.domain.money.constants import EQUITY_SNAPSHOT_LOCK_TIMEOUT
+from src.domain.money.models import (
+    CurrencyInDB,
+    CurrencyUncommited,
+    EquityMovementUncommited,
+)
+from src.infrastructure.cache import Cache
+from src.infrastructure.database import (
+    BaseCRUD,
+    CurrencySchema,
+    EquityMovementSchema,
+    EquitySnapshotSchema,
+    Session,
+)
 from src.infrastructure.errors import DatabaseError
 
-__all__ = ("CurrenciesCRUD",)
+__all__ = ("CurrenciesCRUD", "EquityCRUD")
 
 
 class CurrenciesCRUD(BaseCRUD[CurrencySchema]):
     schema_class = CurrencySchema
 
+    CACHE_NAMESPACE = "currencies"
+
     async def get(self, id_: int) -> CurrencyInDB:
         _schema = await self._get(key="id", value=id_)
         return CurrencyInDB.from_orm(_schema)
@@ -31,6 +56,7 @@ class CurrenciesCRUD(BaseCRUD[CurrencySchema]):
         _schema: CurrencySchema = await self._save(
             CurrencySchema(**schema.dict())
         )
+        Cache.invalidate(self.CACHE_NAMESPACE)
 
         return CurrencyInDB.from_orm(_schema)
 
@@ -47,22 +73,116 @@ class CurrenciesCRUD(BaseCRUD[CurrencySchema]):
         _schema: CurrencySchema = await self._last()
         return CurrencyInDB.from_orm(_schema)
 
-    async def increase_equity(self, id_: int, value: int) -> CurrencyInDB:
-        schema: CurrencySchema = await self._get(key="id", value=id_)
-        updated_schema: CurrencySchema = await self._update(
-            key="id",
-            value=schema.id,
-            payload={"equity": schema.equity + value},
+
+class EquityCRUD(Session):
+    """Equity is the sum of append-only movements. Balances are read
+    from the latest snapshot plus movements after it, so writers
+    only append rows and never lock rows of currencies.
+    """
+
+    async def append(self, movements: list[EquityMovementUncommited]) -> None:
+        await self.execute(
+            insert(EquityMovementSchema).values(
+                [movement.dict() for movement in movements]
+            )
+        )
+
+    def _balances(self, last_movement_id: int | None = None) -> Subquery:
+        """Balances by currencies with the number of movements
+        which are added to the latest snapshot.
+        """
+
+        snapshot_id = func.coalesce(
+            select(func.max(EquitySnapshotSchema.movement_id))
+            .scalar_subquery(),
+            0,
+        )
+        tail_conditions = [EquityMovementSchema.id > snapshot_id]
+        if last_movement_id is not None:
+            tail_conditions.append(
+                EquityMovementSchema.id <= last_movement_id
+            )
+
+        rows = union_all(
+            select(
+                EquitySnapshotSchema.currency_id,
+                EquitySnapshotSchema.value,
+                literal(0).label("movements"),
+            ).where(EquitySnapshotSchema.movement_id == snapshot_id),
+            select(
+                EquityMovementSchema.currency_id,
+                EquityMovementSchema.value,
+                literal(1).label("movements"),
+            ).where(*tail_conditions),
+        ).subquery()
+
+        return (
+            select(
+                rows.c.currency_id,
+                cast(func.sum(rows.c.value), BigInteger).label("value"),
+                cast(func.sum(rows.c.movements), BigInteger).label(
+                    "movements"
+                ),
+            )
+            .group_by(rows.c.currency_id)
+            .subquery()
         )
 
-        return CurrencyInDB.from_orm(updated_schema)
+    async def balances(self) -> dict[int, tuple[int, int]]:
+        """Balances by currencies ids with lengths of their tails."""
 
-    async def decrease_equity(self, id_: int, value: int) -> CurrencyInDB:
-        schema: CurrencySchema = await self._get(key="id", value=id_)
-        updated_schema: CurrencySchema = await self._update(
-            key="id",
-            value=schema.id,
-            payload={"equity": schema.equity - value},
+        balances = self._balances()
+        result: Result = await self.execute(select(balances))
+
+        return {
+            currency_id: (value, movements)
+            for currency_id, value, movements in result.all()
+        }
+
+    async def snapshot(self) -> int | None:
+        """Save balances including all committed movements.
+        The id of the last included movement is returned.
+
+        NOTE: Ids of movements are taken before the commit, so the SHARE
+              lock waits for in-flight appends. Otherwise the movement
+              with the lower id could be committed after the snapshot
+              and would be missed by it forever
+        """
+
+        await self.execute(
+            text(f"SET LOCAL lock_timeout = '{EQUITY_SNAPSHOT_LOCK_TIMEOUT}'")
+        )
+        await self.execute(
+            text(
+                f"LOCK TABLE {EquityMovementSchema.__tablename__} "
+                "IN SHARE MODE"
+            )
+        )
+
+        result: Result = await self.execute(
+            select(
+                func.max(EquityMovementSchema.id),
+                select(func.max(EquitySnapshotSchema.movement_id))
+                .scalar_subquery(),
+            )
+        )
+        last_movement_id, snapshot_id = result.one()
+
+        if last_movement_id is None or (
+            snapshot_id is not None and last_movement_id <= snapshot_id
+        ):
+            return None
+
+        balances = self._balances(last_movement_id)
+        await self.execute(
+            insert(EquitySnapshotSchema).from_select(
+                ("movement_id", "currency_id", "value"),
+                select(
+                    literal(last_movement_id),
+                    balances.c.currency_id,
+                    balances.c.value,
+                ),
+            )
         )
 
-        return CurrencyInDB.from_orm(updated_schema)
+        return last_movement_id
@@ -1,7 +1,17 @@
+import asyncio
 from decimal import Decimal, InvalidOperation
 
+from loguru import logger
+
+from src.domain.money.constants import EQUITY_SNAPSHOT_INTERVAL
+from src.domain.money.models import Equity
+from src.domain.money.repository import CurrenciesCRUD, EquityCRUD
+from src.infrastructure.database import CTX_SESSION, get_session, on_commit
 from src.infrastructure.errors import ValidationError
 
+# NOTE: References keep running tasks from the garbage collector
+_snapshot_tasks: set[asyncio.Task] = set()
+
 
 def validate(value: str | None = None) -> int:
 
@@ -33,3 +43,56 @@ def repr_value(value: int) -> str:
     cents = value % 100
 
     return "{:,.2f}".format(float(solid_part + cents / 100)).replace(",", " ")
+
+
+async def take_equity_snapshot() -> int | None:
+    """Take the snapshot in the separate short transaction,
+    so the lock of movements is not held by the update.
+    """
+
+    session = get_session()
+    token = CTX_SESSION.set(session)
+
+    try:
+        movement_id = await EquityCRUD().snapshot()
+        await session.commit()
+    except Exception as error:
+        logger.error(f"Equity snapshot is failed: {error}")
+        await session.rollback()
+        return None
+    finally:
+        CTX_SESSION.reset(token)
+        await session.close()
+
+    if movement_id is not None:
+        logger.info(f"Equity snapshot is taken at the movement {movement_id}")
+
+    return movement_id
+
+
+def _schedule_equity_snapshot() -> None:
+    if _snapshot_tasks:
+        return
+
+    task = asyncio.get_running_loop().create_task(take_equity_snapshot())
+    _snapshot_tasks.add(task)
+    task.add_done_callback(_snapshot_tasks.discard)
+
+
+async def get_equity() -> list[Equity]:
+    """Equity of all currencies by the latest snapshot and its tail.
+    The next snapshot is scheduled once the tail becomes long.
+    """
+
+    balances = await EquityCRUD().balances()
+
+    if (
+        sum(movements for _, movements in balances.values())
+        >= EQUITY_SNAPSHOT_INTERVAL
+    ):
+        on_commit(_schedule_equity_snapshot)
+
+    return [
+        Equity(currency=currency, value=balances.get(currency.id, (0, 0))[0])
+        for currency in await CurrenciesCRUD().all()
+    ]
@@ -0,0 +1,3 @@
+from src.domain.reconciliation.constants import *  # noqa: F401, F403
+from src.domain.reconciliation.models import *  # noqa: F401, F403
+from src.domain.reconciliation.repository import *  # noqa: F401, F403
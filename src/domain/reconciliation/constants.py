@@ -0,0 +1,29 @@
+from enum import StrEnum
+
+from src.domain.money import EquitySource
+
+__all__ = (
+    "Checkpoint",
+    "RECONCILED_SOURCES",
+    "RECONCILIATION_REPORT_LIMIT",
+)
+
+# Sources of movements which are checked against ledger entries
+RECONCILED_SOURCES: tuple[EquitySource, ...] = (
+    EquitySource.COSTS,
+    EquitySource.INCOMES,
+    EquitySource.CURRENCY_EXCHANGE,
+)
+
+# Discrepancies which are described in the report
+RECONCILIATION_REPORT_LIMIT = 20
+
+
+class Checkpoint(StrEnum):
+    """Tables which are reconciled incrementally by ids."""
+
+    COSTS = "costs"
+    INCOMES = "incomes"
+    CURRENCY_EXCHANGE = "currency_exchange"
+    MOVEMENTS = "equity_movements"
+    SNAPSHOTS = "equity_snapshots"
@@ -0,0 +1,86 @@
+from src.domain.money import EquitySource
+from src.domain.reconciliation.constants import (
+    RECONCILIATION_REPORT_LIMIT,
+    Checkpoint,
+)
+from src.infrastructure.models import InternalModel
+
+__all__ = (
+    "CheckpointRange",
+    "EntryDiscrepancy",
+    "SnapshotDiscrepancy",
+    "ReconciliationReport",
+)
+
+
+class CheckpointRange(InternalModel):
+    """Ids in (last_id, horizon_id] are reconciled by the run."""
+
+    last_id: int
+    horizon_id: int
+
+
+class EntryDiscrepancy(InternalModel):
+    source: EquitySource
+    entry_id: int
+    currency_id: int
+    expected: int
+    actual: int
+
+    def repr(self) -> str:
+        return (
+            f"{self.source} #{self.entry_id}, валюта {self.currency_id}: "
+            f"ожидалось {self.expected}, в движениях {self.actual}"
+        )
+
+
+class SnapshotDiscrepancy(InternalModel):
+    movement_id: int
+    currency_id: int
+    expected: int
+    actual: int
+
+    def repr(self) -> str:
+        return (
+            f"Снимок #{self.movement_id}, валюта {self.currency_id}: "
+            f"ожидалось {self.expected}, в снимке {self.actual}"
+        )
+
+
+class ReconciliationReport(InternalModel):
+    ranges: dict[Checkpoint, CheckpointRange] = {}
+    entries: list[EntryDiscrepancy] = []
+    snapshots: list[SnapshotDiscrepancy] = []
+    repaired: bool = False
+
+    def repr(self) -> str:
+        lines = [
+            f"{name}: {range_.last_id} < id <= {range_.horizon_id}"
+            for name, range_ in self.ranges.items()
+        ]
+        lines += [
+            f"Расхождения записей 👉 {len(self.entries)}",
+            f"Расхождения снимков 👉 {len(self.snapshots)}",
+        ]
+
+        discrepancies = [*self.entries, *self.snapshots]
+        if discrepancies:
+            lines += [
+                "",
+                *(
+                    discrepancy.repr()
+                    for discrepancy in discrepancies[
+                        :RECONCILIATION_REPORT_LIMIT
+                    ]
+                ),
+            ]
+
+        if len(discrepancies) > RECONCILIATION_REPORT_LIMIT:
+            lines.append(
+                f"... и еще {len(discrepancies) - RECONCILIATION_REPORT_LIMIT}"
+            )
+
+        if self.repaired:
+            lines.append("Исправлено ✅")
+
+        return "\n".join(lines)
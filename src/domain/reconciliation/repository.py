@@ -0,0 +1,315 @@
+from typing import Callable, Sequence
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    CompoundSelect,
+    Result,
+    Select,
+    and_,
+    cast,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import insert as upsert
+
+from src.domain.money import EquitySource
+from src.domain.reconciliation.constants import Checkpoint
+from src.domain.reconciliation.models import (
+    CheckpointRange,
+    EntryDiscrepancy,
+)
+from src.infrastructure.database import (
+    CostSchema,
+    CurrencyExchangeSchema,
+    EquityMovementSchema,
+    EquitySnapshotSchema,
+    IncomeSchema,
+    ReconciliationCheckpointSchema,
+    ReconciliationDiscrepancySchema,
+    Session,
+)
+
+__all__ = ("ReconciliationCRUD",)
+
+_IdsCondition = Callable[[ColumnElement], ColumnElement]
+
+_MAX_IDS: dict[Checkpoint, ColumnElement] = {
+    Checkpoint.COSTS: func.max(CostSchema.id),
+    Checkpoint.INCOMES: func.max(IncomeSchema.id),
+    Checkpoint.CURRENCY_EXCHANGE: func.max(CurrencyExchangeSchema.id),
+    Checkpoint.MOVEMENTS: func.max(EquityMovementSchema.id),
+    Checkpoint.SNAPSHOTS: func.max(EquitySnapshotSchema.movement_id),
+}
+
+
+def _expected(
+    source: EquitySource, condition: _IdsCondition
+) -> Select | CompoundSelect:
+    """Movements which entries of the source should have."""
+
+    if source == EquitySource.COSTS:
+        return select(
+            CostSchema.id.label("entry_id"),
+            CostSchema.currency_id.label("currency_id"),
+            (-CostSchema.value).label("value"),
+        ).where(condition(CostSchema.id), CostSchema.currency_id.is_not(None))
+
+    if source == EquitySource.INCOMES:
+        return select(
+            IncomeSchema.id.label("entry_id"),
+            IncomeSchema.currency_id.label("currency_id"),
+            IncomeSchema.value.label("value"),
+        ).where(
+            condition(IncomeSchema.id), IncomeSchema.currency_id.is_not(None)
+        )
+
+    exchange = CurrencyExchangeSchema
+    return union_all(
+        select(
+            exchange.id.label("entry_id"),
+            exchange.source_currency_id.label("currency_id"),
+            (-exchange.source_value).label("value"),
+        ).where(
+            condition(exchange.id), exchange.source_currency_id.is_not(None)
+        ),
+        select(
+            exchange.id,
+            exchange.destination_currency_id,
+            exchange.destination_value,
+        ).where(
+            condition(exchange.id),
+            exchange.destination_currency_id.is_not(None),
+        ),
+    )
+
+
+def _sum(column: ColumnElement) -> ColumnElement:
+    return cast(func.coalesce(func.sum(column), 0), BigInteger).label("value")
+
+
+class ReconciliationCRUD(Session):
+    """Checks of equity movements against the ledger
+    and of snapshots against movements by ranges of ids.
+    """
+
+    async def checkpoints(self) -> dict[Checkpoint, CheckpointRange]:
+        result: Result = await self.execute(
+            select(ReconciliationCheckpointSchema)
+        )
+
+        return {
+            Checkpoint(schema.name): CheckpointRange.from_orm(schema)
+            for schema in result.scalars().all()
+        }
+
+    async def max_ids(self) -> dict[Checkpoint, int]:
+        result: Result = await self.execute(
+            select(
+                *(
+                    select(column).scalar_subquery()
+                    for column in _MAX_IDS.values()
+                )
+            )
+        )
+
+        return {
+            name: max_id or 0 for name, max_id in zip(_MAX_IDS, result.one())
+        }
+
+    async def save_checkpoints(
+        self, checkpoints: dict[Checkpoint, CheckpointRange]
+    ) -> None:
+        query = upsert(ReconciliationCheckpointSchema).values(
+            [
+                {"name": name, **range_.dict()}
+                for name, range_ in checkpoints.items()
+            ]
+        )
+
+        await self.execute(
+            query.on_conflict_do_update(
+                index_elements=(ReconciliationCheckpointSchema.name,),
+                set_={
+                    "last_id": query.excluded.last_id,
+                    "horizon_id": query.excluded.horizon_id,
+                },
+            )
+        )
+
+    async def reset_checkpoints(self) -> None:
+        await self.execute(delete(ReconciliationCheckpointSchema))
+        await self.execute(delete(ReconciliationDiscrepancySchema))
+
+    async def outstanding(self) -> dict[Checkpoint, list[int]]:
+        """Ids of rows with discrepancies which are not repaired yet."""
+
+        result: Result = await self.execute(
+            select(
+                ReconciliationDiscrepancySchema.name,
+                ReconciliationDiscrepancySchema.row_id,
+            ).order_by(ReconciliationDiscrepancySchema.row_id)
+        )
+
+        outstanding: dict[Checkpoint, list[int]] = {}
+        for name, row_id in result.all():
+            outstanding.setdefault(Checkpoint(name), []).append(row_id)
+
+        return outstanding
+
+    async def save_outstanding(
+        self, outstanding: dict[Checkpoint, set[int]]
+    ) -> None:
+        await self.execute(delete(ReconciliationDiscrepancySchema))
+
+        if values := [
+            {"name": name, "row_id": row_id}
+            for name, ids in outstanding.items()
+            for row_id in sorted(ids)
+        ]:
+            await self.execute(
+                insert(ReconciliationDiscrepancySchema).values(values)
+            )
+
+    async def entries_discrepancies(
+        self,
+        source: EquitySource,
+        entries: CheckpointRange,
+        movements: CheckpointRange,
+        outstanding: Sequence[int] = (),
+    ) -> list[EntryDiscrepancy]:
+        """Compare new entries of the source with their movements.
+        Entries which are reconciled already are compared again
+        if they got new movements (deletes append compensations)
+        or if their discrepancies are outstanding.
+        """
+
+        movement = EquityMovementSchema
+        touched = select(movement.entry_id).where(
+            movement.source == source,
+            movement.id > movements.last_id,
+            movement.id <= movements.horizon_id,
+            movement.entry_id <= entries.last_id,
+        )
+
+        def condition(column: ColumnElement) -> ColumnElement:
+            return or_(
+                and_(
+                    column > entries.last_id, column <= entries.horizon_id
+                ),
+                column.in_(touched),
+                column.in_(outstanding),
+            )
+
+        rows = _expected(source, condition).subquery()
+        expected = (
+            select(rows.c.entry_id, rows.c.currency_id, _sum(rows.c.value))
+            .group_by(rows.c.entry_id, rows.c.currency_id)
+            .subquery("expected")
+        )
+        actual = (
+            select(
+                movement.entry_id, movement.currency_id, _sum(movement.value)
+            )
+            .where(movement.source == source, condition(movement.entry_id))
+            .group_by(movement.entry_id, movement.currency_id)
+            .subquery("actual")
+        )
+        expected_value = func.coalesce(expected.c.value, 0)
+        actual_value = func.coalesce(actual.c.value, 0)
+
+        entry_id = func.coalesce(expected.c.entry_id, actual.c.entry_id)
+        currency_id = func.coalesce(
+            expected.c.currency_id, actual.c.currency_id
+        )
+
+        result: Result = await self.execute(
+            select(entry_id, currency_id, expected_value, actual_value)
+            .select_from(
+                expected.join(
+                    actual,
+                    and_(
+                        expected.c.entry_id == actual.c.entry_id,
+                        expected.c.currency_id == actual.c.currency_id,
+                    ),
+                    full=True,
+                )
+            )
+            .where(expected_value != actual_value)
+            .order_by(entry_id, currency_id)
+        )
+
+        return [
+            EntryDiscrepancy(
+                source=source,
+                entry_id=entry_id,
+                currency_id=currency_id,
+                expected=expected,
+                actual=actual,
+            )
+            for entry_id, currency_id, expected, actual in result.all()
+        ]
+
+    async def snapshots_ids(
+        self, snapshots: CheckpointRange, outstanding: Sequence[int] = ()
+    ) -> list[int]:
+        result: Result = await self.execute(
+            select(EquitySnapshotSchema.movement_id)
+            .where(
+                or_(
+                    and_(
+                        EquitySnapshotSchema.movement_id > snapshots.last_id,
+                        EquitySnapshotSchema.movement_id
+                        <= snapshots.horizon_id,
+                    ),
+                    EquitySnapshotSchema.movement_id.in_(outstanding),
+                )
+            )
+            .distinct()
+            .order_by(EquitySnapshotSchema.movement_id)
+        )
+
+        return list(result.scalars().all())
+
+    async def base_snapshot_id(self, before: int) -> int:
+        """The latest snapshot which is reconciled already (0 if none)."""
+
+        result: Result = await self.execute(
+            select(
+                func.coalesce(func.max(EquitySnapshotSchema.movement_id), 0)
+            ).where(EquitySnapshotSchema.movement_id <= before)
+        )
+
+        return result.scalar_one()
+
+    async def snapshot(self, movement_id: int) -> dict[int, int]:
+        result: Result = await self.execute(
+            select(
+                EquitySnapshotSchema.currency_id, EquitySnapshotSchema.value
+            ).where(EquitySnapshotSchema.movement_id == movement_id)
+        )
+
+        return dict(result.all())
+
+    async def movements_totals(
+        self, after: int, until: int
+    ) -> dict[int, int]:
+        movement = EquityMovementSchema
+        result: Result = await self.execute(
+            select(movement.currency_id, _sum(movement.value))
+            .where(movement.id > after, movement.id <= until)
+            .group_by(movement.currency_id)
+        )
+
+        return dict(result.all())
+
+    async def delete_snapshots(self, movements_ids: list[int]) -> None:
+        await self.execute(
+            delete(EquitySnapshotSchema).where(
+                EquitySnapshotSchema.movement_id.in_(movements_ids)
+            )
+        )
@@ -0,0 +1,150 @@
+from collections import defaultdict
+from datetime import date
+from typing import Sequence
+
+from loguru import logger
+
+from src.domain.money import EquityCRUD, EquityMovementUncommited
+from src.domain.reconciliation.constants import RECONCILED_SOURCES, Checkpoint
+from src.domain.reconciliation.models import (
+    CheckpointRange,
+    ReconciliationReport,
+    SnapshotDiscrepancy,
+)
+from src.domain.reconciliation.repository import ReconciliationCRUD
+
+
+def _snapshot_discrepancies(
+    movement_id: int, expected: dict[int, int], actual: dict[int, int]
+) -> list[SnapshotDiscrepancy]:
+    return [
+        SnapshotDiscrepancy(
+            movement_id=movement_id,
+            currency_id=currency_id,
+            expected=expected.get(currency_id, 0),
+            actual=actual.get(currency_id, 0),
+        )
+        for currency_id in sorted(expected.keys() | actual.keys())
+        if expected.get(currency_id, 0) != actual.get(currency_id, 0)
+    ]
+
+
+async def _check_snapshots(
+    crud: ReconciliationCRUD,
+    snapshots: CheckpointRange,
+    outstanding: Sequence[int] = (),
+) -> list[SnapshotDiscrepancy]:
+    """Every snapshot should be the previous correct one
+    plus movements between them.
+    """
+
+    discrepancies: list[SnapshotDiscrepancy] = []
+    base_id = await crud.base_snapshot_id(
+        min((snapshots.last_id, *(id_ - 1 for id_ in outstanding)))
+    )
+    base = await crud.snapshot(base_id) if base_id else {}
+
+    for movement_id in await crud.snapshots_ids(snapshots, outstanding):
+        totals = await crud.movements_totals(base_id, movement_id)
+        expected = {
+            currency_id: base.get(currency_id, 0) + totals.get(currency_id, 0)
+            for currency_id in base.keys() | totals.keys()
+        }
+        actual = await crud.snapshot(movement_id)
+
+        if found := _snapshot_discrepancies(movement_id, expected, actual):
+            discrepancies += found
+        else:
+            base_id, base = movement_id, actual
+
+    return discrepancies
+
+
+async def reconcile(repair: bool = False) -> ReconciliationReport:
+    """Reconcile rows which are added since the previous run.
+    Entries should have movements of their values and snapshots
+    should match movements. Discrepancies are either reported
+    or repaired:
+    the missing difference is appended as the movement of the entry
+    and broken snapshots are deleted, so balances fall back
+    to the previous correct one.
+    Checkpoints are always passed: ids of unrepaired rows are kept
+    apart, so only these rows are checked again by next runs.
+
+    NOTE: Rows of the ledger are reconciled one run later (up to the max
+          ids of the previous run), so transactions which have taken
+          lower ids but are committed after the run are not skipped
+    """
+
+    crud = ReconciliationCRUD()
+    checkpoints = await crud.checkpoints()
+    outstanding = await crud.outstanding()
+    max_ids = await crud.max_ids()
+
+    # NOTE: The first run checks everything which exists
+    report = ReconciliationReport(
+        ranges={
+            name: checkpoints.get(name)
+            or CheckpointRange(last_id=0, horizon_id=max_ids[name])
+            for name in Checkpoint
+        }
+    )
+
+    for source in RECONCILED_SOURCES:
+        report.entries += await crud.entries_discrepancies(
+            source,
+            entries=report.ranges[Checkpoint(source)],
+            movements=report.ranges[Checkpoint.MOVEMENTS],
+            outstanding=outstanding.get(Checkpoint(source), []),
+        )
+
+    report.snapshots = await _check_snapshots(
+        crud,
+        report.ranges[Checkpoint.SNAPSHOTS],
+        outstanding.get(Checkpoint.SNAPSHOTS, []),
+    )
+
+    for discrepancy in [*report.entries, *report.snapshots]:
+        logger.warning(f"Equity discrepancy: {discrepancy.repr()}")
+
+    if repair and report.entries:
+        await EquityCRUD().append(
+            [
+                EquityMovementUncommited(
+                    currency_id=discrepancy.currency_id,
+                    value=discrepancy.expected - discrepancy.actual,
+                    date=date.today(),
+                    source=discrepancy.source,
+                    entry_id=discrepancy.entry_id,
+                )
+                for discrepancy in report.entries
+            ]
+        )
+
+    if repair and report.snapshots:
+        await crud.delete_snapshots(
+            sorted({item.movement_id for item in report.snapshots})
+        )
+
+    report.repaired = repair and bool(report.entries or report.snapshots)
+
+    await crud.save_checkpoints(
+        {
+            name: CheckpointRange(
+                last_id=range_.horizon_id,
+                horizon_id=max(max_ids[name], range_.horizon_id),
+            )
+            for name, range_ in report.ranges.items()
+        }
+    )
+
+    unrepaired: dict[Checkpoint, set[int]] = defaultdict(set)
+    if not repair:
+        for entry in report.entries:
+            unrepaired[Checkpoint(entry.source)].add(entry.entry_id)
+        for snapshot in report.snapshots:
+            unrepaired[Checkpoint.SNAPSHOTS].add(snapshot.movement_id)
+
+    await crud.save_outstanding(unrepaired)
+
+    return report
@@ -15,10 +15,15 @@ from src.domain.dates import DateFormat
 from src.domain.dates import services as dates_services
 from src.domain.money import services as money_services
 from src.infrastructure.errors import UserError, ValidationError
-from src.keyboards.constants import ConfirmationOption
-from src.keyboards.default import default_keyboard, restart_keyboard
+from src.infrastructure.frames import escape_html
+from src.keyboards.default import (
+    confirmation_keyboard,
+    default_keyboard,
+    restart_keyboard,
+)
 from src.keyboards.models import CallbackItem
 from src.keyboards.patterns import (
+    cached_callback_patterns_keyboard,
     callback_patterns_keyboard,
     patterns_keyboard,
 )
@@ -43,9 +48,12 @@ async def confirmation_selected_callback_query(
                 user_id=contract.user.id,
             )
 
-            cost: Cost = await costs_services.add(schema)
+            cost, budget_alert = await costs_services.add(schema)
             text = "\n\n".join(("✅ Расход успешно сохранён", cost.repr()))
 
+            if budget_alert:
+                text = "\n\n".join((text, budget_alert.repr()))
+
         case AddCostCallbackOperation.SELECT_NO:
             text = "❌ Расход не был сохранён"
         case _:
@@ -90,21 +98,13 @@ async def date_selected_callback_query(
         )
     )
 
-    keyboard_patterns: list[CallbackItem] = [
-        CallbackItem(
-            name=ConfirmationOption.NO,
-            callback_data=AddCostCallbackOperation.SELECT_NO,
-        ),
-        CallbackItem(
-            name=ConfirmationOption.YES,
-            callback_data=AddCostCallbackOperation.SELECT_YES,
-        ),
-    ]
-
     await CallbackMessages.edit(
         q=contract.q,
         text=text,
-        keyboard=callback_patterns_keyboard(keyboard_patterns),
+        keyboard=confirmation_keyboard(
+            AddCostCallbackOperation.SELECT_NO,
+            AddCostCallbackOperation.SELECT_YES,
+        ),
     )
 
 
@@ -201,7 +201,9 @@ async def name_entered_callback(contract: MessageContract):
     message = await Messages.send(
         text=text,
         chat_id=contract.user.chat_id,
-        keyboard=callback_patterns_keyboard(keyboard_patterns),
+        keyboard=cached_callback_patterns_keyboard(
+            keyboard_patterns, namespace=CategoriesCRUD.CACHE_NAMESPACE
+        ),
     )
     state.messages_to_delete.add(contract.m.id)
     state.messages_to_delete.add(message.id)
@@ -227,6 +229,94 @@ async def value_entered_callback(contract: MessageContract):
     state.messages_to_delete.add(contract.m.id)
 
 
+def _costs_summary(costs: list[Cost]) -> str:
+    totals: dict[str, int] = {}
+    lines: list[str] = []
+
+    for cost in costs:
+        totals[cost.currency.sign] = (
+            totals.get(cost.currency.sign, 0) + cost.value
+        )
+        lines.append(
+            f"👉 {escape_html(cost.name)}  "
+            f"{money_services.repr_value(cost.value)}{cost.currency.sign}  "
+            f"<i>{cost.category.name}, {cost.date}</i>"
+        )
+
+    total = ", ".join(
+        f"{money_services.repr_value(value)}{sign}"
+        for sign, value in totals.items()
+    )
+
+    return "\n".join(
+        (
+            f"✅ Сохранено расходов: {len(costs)}\n",
+            *lines,
+            f"\nИтого 👉 {total}",
+        )
+    )
+
+
+@transaction
+async def _add_quick_costs(
+    contract: MessageContract, schemas: list[CostUncommited]
+) -> str:
+    costs, budget_alerts = await costs_services.add_many(schemas)
+
+    return "\n\n".join(
+        (_costs_summary(costs), *(alert.repr() for alert in budget_alerts))
+    )
+
+
+@transaction
+async def _add_quick_cost(
+    contract: MessageContract, schema: CostUncommited
+) -> str:
+    cost, budget_alert = await costs_services.add(schema)
+    budget_alerts = [budget_alert] if budget_alert else []
+
+    return "\n\n".join(
+        (
+            "✅ Расход успешно сохранён",
+            cost.repr(),
+            *(alert.repr() for alert in budget_alerts),
+        )
+    )
+
+
+async def quick_add_callback(contract: MessageContract):
+    """Save costs from the single message with the single reply.
+    Each line of the message is the cost.
+
+    NOTE: The message is parsed before the transaction,
+          since it swallows errors which should reach the user
+    """
+
+    text = contract.m.text or ""
+    user_id = contract.user.id
+    currency_id = contract.user.configuration.default_currency.id
+
+    if len([line for line in text.splitlines() if line.strip()]) > 1:
+        reply = await _add_quick_costs(
+            contract,
+            await costs_services.parse_quick_add_lines(
+                text, user_id=user_id, currency_id=currency_id
+            ),
+        )
+    else:
+        reply = await _add_quick_cost(
+            contract,
+            await costs_services.parse_quick_add(
+                text, user_id=user_id, currency_id=currency_id
+            ),
+        )
+
+    if reply:
+        await Messages.send(
+            contract.user.chat_id, text=reply, keyboard=default_keyboard()
+        )
+
+
 async def add_cost_callback(contract: MessageContract):
     state = contract.state
     state.clear_data()
@@ -8,24 +8,34 @@ from src.application.messages import (
     Messages,
 )
 from src.domain.analytics import (
+    COMPARISON_MONTHS,
     AnalyticsRootOption,
     BasicOption,
+    ComparisonCallbackOperation,
     DetailAnalyticsCallbackOperation,
     DetailedOption,
     LevelOption,
+    ReportDocument,
 )
 from src.domain.analytics import services as analytics_services
+from src.domain.categories import CategoriesCRUD
 from src.domain.categories import services as categories_services
 from src.domain.dates import DateFormat
 from src.domain.dates import services as dates_services
+from src.domain.exports import services as exports_services
 from src.infrastructure.errors import UserError
-from src.keyboards.constants import (
-    ANALYTICS_BASIC_OPTIONS_KEYBOARD_ELEMENTS,
-    ANALYTICS_DETAILED_OPTIONS_KEYBOARD_ELEMENTS,
+from src.keyboards.default import (
+    analytics_basic_options_keyboard,
+    analytics_comparison_keyboard,
+    analytics_detailed_options_keyboard,
+    analytics_level_keyboard,
+    default_keyboard,
 )
-from src.keyboards.default import default_keyboard
 from src.keyboards.models import CallbackItem
-from src.keyboards.patterns import callback_patterns_keyboard
+from src.keyboards.patterns import (
+    cached_callback_patterns_keyboard,
+    callback_patterns_keyboard,
+)
 
 __all__ = (
     "analytics_general_menu_callback",
@@ -37,18 +47,21 @@ __all__ = (
 async def basic_level_selected_callback(contract: CallbackQueryContract):
     state = contract.state
     state.check_data("start_date", "end_date")
+    default_currency = contract.user.configuration.default_currency
 
     match contract.q.data:
         case BasicOption.ALL:
             frames = analytics_services.get_basic_analytics_in_range(
                 start=state.data.start_date,  # type: ignore
                 end=state.data.end_date,  # type: ignore
+                default_currency=default_currency,
             )
         case BasicOption.ONLY_MY:
             frames = analytics_services.get_basic_analytics_in_range(
                 start=state.data.start_date,  # type: ignore
                 end=state.data.end_date,  # type: ignore
                 by_user=contract.user,
+                default_currency=default_currency,
             )
         case _:
             raise Exception
@@ -75,6 +88,73 @@ async def basic_level_selected_callback(contract: CallbackQueryContract):
     await Messages.delete(contract.user.chat_id, *state.messages_to_delete)
 
 
+async def comparison_months_selected_callback(
+    contract: CallbackQueryContract,
+):
+    # NOTE: The comparison only reads on the update session, so it is not
+    #       wrapped in a transaction that would swallow the user errors
+    state = contract.state
+
+    try:
+        months = int(
+            contract.q.data.replace(
+                ComparisonCallbackOperation.SELECT_MONTHS, ""
+            )
+        )
+    except ValueError:
+        raise ValueError("Некорректный ввод для раздела аналитики")
+
+    if months not in COMPARISON_MONTHS:
+        raise ValueError("Некорректный ввод для раздела аналитики")
+
+    no_frames = True
+
+    async for frame in analytics_services.get_months_comparison(months):
+        no_frames = False
+
+        await Messages.send(
+            chat_id=contract.user.chat_id,
+            text=frame,
+            keyboard=default_keyboard(),
+        )
+
+    await Messages.delete(contract.user.chat_id, *state.messages_to_delete)
+
+    if no_frames:
+        raise UserError("¯\\_(ツ)_/¯ Пусто")
+
+
+async def export_pattern_entered_callback(contract: MessageContract):
+    # NOTE: The export only reads on the update session, so it is not
+    #       wrapped in a transaction that would swallow the user errors
+    state = contract.state
+    state.messages_to_delete.add(contract.m.id)
+    start_date, end_date = analytics_services.dates_range_by_pattern(
+        contract.m.text
+    )
+
+    no_documents = True
+
+    async for document in exports_services.export_in_range(
+        start_date, end_date
+    ):
+        no_documents = False
+
+        with document.file:
+            await Messages.send_document(
+                chat_id=contract.user.chat_id,
+                document=document.file,
+                file_name=document.file_name,
+                caption="📤 Экспорт",
+                keyboard=default_keyboard(),
+            )
+
+    await Messages.delete(contract.user.chat_id, *state.messages_to_delete)
+
+    if no_documents:
+        raise UserError("¯\\_(ツ)_/¯ Пусто")
+
+
 async def category_selected_callback(contract: CallbackQueryContract):
     state = contract.state
     category_id = int(
@@ -166,7 +246,10 @@ async def detailed_level_selected_callback(contract: CallbackQueryContract):
             return await CallbackMessages.edit(
                 q=contract.q,
                 text="🤔 Выберите категорию",
-                keyboard=callback_patterns_keyboard(keyboard_patterns),
+                keyboard=cached_callback_patterns_keyboard(
+                    keyboard_patterns,
+                    namespace=CategoriesCRUD.CACHE_NAMESPACE,
+                ),
             )
         case _:
             raise ValueError("Некорректный ввод для раздела аналитики")
@@ -175,6 +258,18 @@ async def detailed_level_selected_callback(contract: CallbackQueryContract):
 
     async for frame in frames:
         no_frames = False
+
+        if isinstance(frame, ReportDocument):
+            with frame.file:
+                await Messages.send_document(
+                    chat_id=contract.user.chat_id,
+                    document=frame.file,
+                    file_name=frame.file_name,
+                    caption="📄 Детальный отчет",
+                    keyboard=default_keyboard(),
+                )
+            continue
+
         await Messages.send(
             chat_id=contract.user.chat_id,
             text=frame,
@@ -195,14 +290,10 @@ async def level_selected_callback(contract: CallbackQueryContract):
     match contract.q.data:
         case LevelOption.SELECT_BASIC_LEVEL:
             state.next_callback = basic_level_selected_callback
-            keyboard = callback_patterns_keyboard(
-                ANALYTICS_BASIC_OPTIONS_KEYBOARD_ELEMENTS
-            )
+            keyboard = analytics_basic_options_keyboard()
         case LevelOption.SELECT_DETAILED_LEVEL:
             state.next_callback = detailed_level_selected_callback
-            keyboard = callback_patterns_keyboard(
-                ANALYTICS_DETAILED_OPTIONS_KEYBOARD_ELEMENTS
-            )
+            keyboard = analytics_detailed_options_keyboard()
         case _:
             raise ValueError("Некорректный ввод для раздела аналитики")
 
@@ -229,18 +320,7 @@ async def pattern_entered_callback(contract: MessageContract):
         message = await Messages.send(
             chat_id=contract.user.chat_id,
             text="🤔 Выберите уровень аналитики",
-            keyboard=callback_patterns_keyboard(
-                [
-                    CallbackItem(
-                        name="Подробный",
-                        callback_data=LevelOption.SELECT_DETAILED_LEVEL,
-                    ),
-                    CallbackItem(
-                        name="Обычный",
-                        callback_data=LevelOption.SELECT_BASIC_LEVEL,
-                    ),
-                ]
-            ),
+            keyboard=analytics_level_keyboard(),
         )
 
     else:
@@ -248,9 +328,7 @@ async def pattern_entered_callback(contract: MessageContract):
         message = await Messages.send(
             chat_id=contract.user.chat_id,
             text="🤔 Выберите уровень аналитики",
-            keyboard=callback_patterns_keyboard(
-                ANALYTICS_BASIC_OPTIONS_KEYBOARD_ELEMENTS
-            ),
+            keyboard=analytics_basic_options_keyboard(),
         )
 
     state.messages_to_delete.add(contract.m.id)
@@ -271,18 +349,7 @@ async def analytics_action_selected_callback(contract: CallbackQueryContract):
             await CallbackMessages.edit(
                 q=contract.q,
                 text="🤔 Выберите уровень аналитики",
-                keyboard=callback_patterns_keyboard(
-                    [
-                        CallbackItem(
-                            name="Подробный",
-                            callback_data=LevelOption.SELECT_DETAILED_LEVEL,
-                        ),
-                        CallbackItem(
-                            name="Обычный",
-                            callback_data=LevelOption.SELECT_BASIC_LEVEL,
-                        ),
-                    ]
-                ),
+                keyboard=analytics_level_keyboard(),
             )
         case AnalyticsRootOption.PREVIOUS_MONTH:
             start_date, end_date = dates_services.previous_month_edge_dates()
@@ -294,18 +361,7 @@ async def analytics_action_selected_callback(contract: CallbackQueryContract):
             await CallbackMessages.edit(
                 q=contract.q,
                 text="🤔 Выберите уровень аналитики",
-                keyboard=callback_patterns_keyboard(
-                    [
-                        CallbackItem(
-                            name="Подробный",
-                            callback_data=LevelOption.SELECT_DETAILED_LEVEL,
-                        ),
-                        CallbackItem(
-                            name="Обычный",
-                            callback_data=LevelOption.SELECT_BASIC_LEVEL,
-                        ),
-                    ]
-                ),
+                keyboard=analytics_level_keyboard(),
             )
         case AnalyticsRootOption.BY_PATTERN:
             await CallbackMessages.edit(
@@ -315,6 +371,22 @@ async def analytics_action_selected_callback(contract: CallbackQueryContract):
             )
 
             state.next_callback = pattern_entered_callback
+        case AnalyticsRootOption.MONTHS_COMPARISON:
+            await CallbackMessages.edit(
+                q=contract.q,
+                text="🤔 Выберите количество месяцев",
+                keyboard=analytics_comparison_keyboard(),
+            )
+
+            state.next_callback = comparison_months_selected_callback
+        case AnalyticsRootOption.EXPORT:
+            await CallbackMessages.edit(
+                q=contract.q,
+                text="⤵️ Введите шаблон или диапазон для экспорта в CSV",
+                keyboard=None,
+            )
+
+            state.next_callback = export_pattern_entered_callback
         case _:
             raise ValueError("Некорректный ввод для раздела аналитики")
 
@@ -340,6 +412,14 @@ async def analytics_general_menu_callback(contract: MessageContract):
                 name="🗓️ Выбрать диапазон",
                 callback_data=AnalyticsRootOption.BY_PATTERN,
             ),
+            CallbackItem(
+                name="📈 Сравнение по месяцам",
+                callback_data=AnalyticsRootOption.MONTHS_COMPARISON,
+            ),
+            CallbackItem(
+                name="📤 Экспорт в CSV",
+                callback_data=AnalyticsRootOption.EXPORT,
+            ),
         ]
     )
 
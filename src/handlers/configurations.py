@@ -5,7 +5,9 @@ from src.application.messages import (
     MessageContract,
     Messages,
 )
+from src.domain.budgets import services as budgets_services
 from src.domain.categories import CategoriesCRUD, CategoryInDB
+from src.domain.categories import services as categories_services
 from src.domain.configurations import (
     ConfigurationRootOption,
     ConfigurationsCRUD,
@@ -13,10 +15,14 @@ from src.domain.configurations import (
 )
 from src.domain.configurations import services as configurations_services
 from src.domain.money import CurrenciesCRUD, CurrencyInDB
-from src.infrastructure.errors import UserError
+from src.domain.money import services as money_services
+from src.infrastructure.errors import UserError, ValidationError
 from src.keyboards.default import default_keyboard
 from src.keyboards.models import CallbackItem
-from src.keyboards.patterns import callback_patterns_keyboard
+from src.keyboards.patterns import (
+    cached_callback_patterns_keyboard,
+    callback_patterns_keyboard,
+)
 
 
 @transaction
@@ -137,6 +143,81 @@ async def default_currency_selected_callback(contract: CallbackQueryContract):
     )
 
 
+@transaction
+async def _set_budget_limit(contract: MessageContract, value: int):
+    state = contract.state
+
+    await budgets_services.set_limit(
+        configuration_id=contract.user.configuration.id,
+        category_id=state.data.category.id,
+        currency_id=contract.user.configuration.default_currency.id,
+        value=value,
+    )
+
+    await Messages.send(
+        chat_id=contract.user.chat_id,
+        text="✅ Настройки обновлены",
+        keyboard=default_keyboard(),
+    )
+
+    state.messages_to_delete.add(contract.m.id)
+    await Messages.delete(contract.user.chat_id, *state.messages_to_delete)
+    state.clear_data()
+
+
+async def budget_value_entered_callback(contract: MessageContract):
+    state = contract.state
+    state.check_data("category")
+
+    # NOTE: The value is validated before the transaction,
+    #       since it swallows errors which should reach the user
+    try:
+        value = money_services.validate(contract.m.text)
+    except ValidationError:
+        raise UserError("⚠️ Значение должно быть корректным значением")
+
+    await _set_budget_limit(contract, value)
+
+
+async def budget_category_selected_callback(contract: CallbackQueryContract):
+    state = contract.state
+    category_id = int(
+        contract.q.data.replace(
+            ConfigurationUpdateOption.SELECT_BUDGET_CATEGORY, ""
+        )
+    )
+    state.data.category = await CategoriesCRUD().get(category_id)
+    currency = contract.user.configuration.default_currency
+
+    text = (
+        f"⤵️ Введите месячный лимит для {state.data.category.name} "
+        f"в {currency.sign} и нажмите Enter\n"
+        "<i>0 удаляет лимит</i>"
+    )
+    budget = (await budgets_services.by_user(contract.user.id)).get(
+        category_id
+    )
+    if budget:
+        budget_currency = (
+            currency
+            if budget.currency_id == currency.id
+            else await CurrenciesCRUD().get(budget.currency_id)
+        )
+        text += (
+            "\n\nТекущий лимит 👉 "
+            f"{money_services.repr_value(budget.value)}{budget_currency.sign}"
+        )
+        # NOTE: Costs are checked against the limit in its own currency
+        if budget_currency.id != currency.id:
+            text += (
+                "\n⚠️ Лимит задан не в валюте по умолчанию, "
+                f"расходы в {currency.sign} не учитываются"
+            )
+
+    await CallbackMessages.edit(q=contract.q, text=text, keyboard=None)
+    state.next_callback = budget_value_entered_callback
+
+
 async def update_submenu_option_selected_callback(
     contract: CallbackQueryContract,
 ):
@@ -197,9 +278,32 @@ async def update_submenu_option_selected_callback(
             await CallbackMessages.edit(
                 q=contract.q,
                 text="🤔 Выберите валюту по умолчанию",
-                keyboard=callback_patterns_keyboard(keyboard_patterns),
+                keyboard=cached_callback_patterns_keyboard(
+                    keyboard_patterns,
+                    namespace=CurrenciesCRUD.CACHE_NAMESPACE,
+                ),
             )
             state.next_callback = default_currency_selected_callback
+        case ConfigurationUpdateOption.BUDGETS:
+            keyboard_patterns = [
+                CallbackItem(
+                    name=category.name,
+                    callback_data=(
+                        f"{ConfigurationUpdateOption.SELECT_BUDGET_CATEGORY}"
+                        f"{category.id}"
+                    ),
+                )
+                for category in await categories_services.get_all()
+            ]
+            await CallbackMessages.edit(
+                q=contract.q,
+                text="🤔 Выберите категорию",
+                keyboard=cached_callback_patterns_keyboard(
+                    keyboard_patterns,
+                    namespace=CategoriesCRUD.CACHE_NAMESPACE,
+                ),
+            )
+            state.next_callback = budget_category_selected_callback
         case _:
             raise Exception
 
@@ -245,6 +349,10 @@ async def configuration_submenu_option_selected_callback(
                             name="💱 Валюта по умолчанию",
                             callback_data=ConfigurationUpdateOption.DEFAULT_CURRENCY,
                         ),
+                        CallbackItem(
+                            name="🎯 Лимиты по категориям",
+                            callback_data=ConfigurationUpdateOption.BUDGETS,
+                        ),
                     ],
                     width=1,
                 ),
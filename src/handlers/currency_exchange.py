@@ -20,10 +20,12 @@ from src.domain.dates import services as dates_services
 from src.domain.money import CurrenciesCRUD, CurrencyInDB
 from src.domain.money import services as money_services
 from src.infrastructure.errors import ValidationError
-from src.keyboards.constants import ConfirmationOption
-from src.keyboards.default import default_keyboard
+from src.keyboards.default import confirmation_keyboard, default_keyboard
 from src.keyboards.models import CallbackItem
-from src.keyboards.patterns import callback_patterns_keyboard
+from src.keyboards.patterns import (
+    cached_callback_patterns_keyboard,
+    callback_patterns_keyboard,
+)
 
 
 @transaction
@@ -115,21 +117,13 @@ async def date_selected_callback(contract: CallbackQueryContract):
         )
     )
 
-    keyboard_patterns: list[CallbackItem] = [
-        CallbackItem(
-            name=ConfirmationOption.NO,
-            callback_data=CurrencyExchangeCallbackOperation.SELECT_NO,
-        ),
-        CallbackItem(
-            name=ConfirmationOption.YES,
-            callback_data=CurrencyExchangeCallbackOperation.SELECT_YES,
-        ),
-    ]
-
     await CallbackMessages.edit(
         q=contract.q,
         text=text,
-        keyboard=callback_patterns_keyboard(keyboard_patterns),
+        keyboard=confirmation_keyboard(
+            CurrencyExchangeCallbackOperation.SELECT_NO,
+            CurrencyExchangeCallbackOperation.SELECT_YES,
+        ),
     )
 
     state.next_callback = confirmation_entered_callback
@@ -207,7 +201,9 @@ async def source_value_entered_callback(contract: MessageContract):
     message = await Messages.send(
         chat_id=contract.user.chat_id,
         text="🤔 Выберите целевую валюту",
-        keyboard=callback_patterns_keyboard(keyboard_patterns),
+        keyboard=cached_callback_patterns_keyboard(
+            keyboard_patterns, namespace=CurrenciesCRUD.CACHE_NAMESPACE
+        ),
     )
 
     state.next_callback = destination_currency_entered_callback
@@ -252,7 +248,9 @@ async def currency_exchange_callback(contract: MessageContract):
     message = await Messages.send(
         chat_id=contract.user.chat_id,
         text="🤔 Выберите исходную валюту",
-        keyboard=callback_patterns_keyboard(keyboard_patterns),
+        keyboard=cached_callback_patterns_keyboard(
+            keyboard_patterns, namespace=CurrenciesCRUD.CACHE_NAMESPACE
+        ),
     )
     state.messages_to_delete.add(contract.m.id)
     state.messages_to_delete.add(message.id)
@@ -1,5 +1,3 @@
-from typing import AsyncGenerator
-
 from loguru import logger
 
 from src.application.database import transaction
@@ -13,13 +11,15 @@ from src.domain.categories import CategoriesCRUD, CategoryInDB
 from src.domain.categories import services as categories_services
 from src.domain.costs import Cost, CostsCRUD, DeleteCostCallbackOperation
 from src.domain.costs import services as costs_services
-from src.domain.dates import DateFormat
-from src.domain.money import services as money_services
 from src.infrastructure.errors import NotFound, UserError
-from src.keyboards.constants import ConfirmationOption
-from src.keyboards.default import default_keyboard
+from src.infrastructure.pagination import Cursor, Page
+from src.keyboards.default import confirmation_keyboard, default_keyboard
 from src.keyboards.models import CallbackItem
-from src.keyboards.patterns import callback_patterns_keyboard
+from src.keyboards.patterns import (
+    cached_callback_patterns_keyboard,
+    callback_patterns_keyboard,
+    paginated_callback_patterns_keyboard,
+)
 
 
 @transaction
@@ -52,27 +52,66 @@ async def confirmation_selected_callback(contract: CallbackQueryContract):
     contract.state.clear_data()
 
 
+async def _edit_costs_page(
+    contract: CallbackQueryContract, cursor: Cursor | None = None
+):
+    state = contract.state
+    page: Page = await CostsCRUD().page_for_delete(
+        month=state.data.month,  # type: ignore
+        category_id=state.data.category.id,  # type: ignore
+        cursor=cursor,
+    )
+
+    if not page.items:
+        await Messages.delete(
+            contract.user.chat_id, *contract.state.messages_to_delete
+        )
+        raise UserError("💪 Расходов нет")
+
+    keyboard_patterns = [
+        CallbackItem(
+            name=cost.repr(),
+            callback_data="".join(
+                (DeleteCostCallbackOperation.SELECT_COST, str(cost.id))
+            ),
+        )
+        for cost in page.items
+    ]
+
+    await CallbackMessages.edit(
+        contract.q,
+        text="🤔 Выберите расход",
+        keyboard=paginated_callback_patterns_keyboard(
+            keyboard_patterns,
+            page=page,
+            page_operation=DeleteCostCallbackOperation.SELECT_PAGE,
+        ),
+    )
+
+
 async def cost_selected_callback(contract: CallbackQueryContract):
+    if contract.q.data.startswith(DeleteCostCallbackOperation.SELECT_PAGE):
+        cursor = Cursor.decode(
+            contract.q.data.replace(
+                DeleteCostCallbackOperation.SELECT_PAGE, ""
+            )
+        )
+        # NOTE: The router drops the callback before calling it
+        contract.state.next_callback = cost_selected_callback
+        return await _edit_costs_page(contract, cursor)
+
     contract.state.data.cost_id = int(
         contract.q.data.replace(DeleteCostCallbackOperation.SELECT_COST, "")
     )
     contract.state.next_callback = confirmation_selected_callback
 
-    keyboard_patterns: list[CallbackItem] = [
-        CallbackItem(
-            name=ConfirmationOption.NO,
-            callback_data=DeleteCostCallbackOperation.SELECT_NO,
-        ),
-        CallbackItem(
-            name=ConfirmationOption.YES,
-            callback_data=DeleteCostCallbackOperation.SELECT_YES,
-        ),
-    ]
-
     await CallbackMessages.edit(
         q=contract.q,
         text="Вы действительно хотите удалить расход?",
-        keyboard=callback_patterns_keyboard(keyboard_patterns),
+        keyboard=confirmation_keyboard(
+            DeleteCostCallbackOperation.SELECT_NO,
+            DeleteCostCallbackOperation.SELECT_YES,
+        ),
     )
 
 
@@ -89,36 +128,7 @@ async def category_selected_callback(contract: CallbackQueryContract):
     contract.state.data.category = category
     contract.state.next_callback = cost_selected_callback
 
-    keyboard_patterns = []
-    costs: AsyncGenerator[Cost, None] = CostsCRUD().filter_for_delete(
-        month=contract.state.data.month,  # type: ignore
-        category_id=category_id,
-    )
-    async for cost in costs:
-        cost_repr = (
-            f"({cost.date.strftime(DateFormat.DAILY)}) {cost.name}: "
-            f"{money_services.repr_value(cost.value)}{cost.currency.sign}"
-        )
-        keyboard_patterns.append(
-            CallbackItem(
-                name=cost_repr,
-                callback_data="".join(
-                    (DeleteCostCallbackOperation.SELECT_COST, str(cost.id))
-                ),
-            )
-        )
-
-    if not keyboard_patterns:
-        await Messages.delete(
-            contract.user.chat_id, *contract.state.messages_to_delete
-        )
-        raise UserError("💪 Расходов нет")
-
-    await CallbackMessages.edit(
-        contract.q,
-        text="🤔 Выберите расход",
-        keyboard=callback_patterns_keyboard(keyboard_patterns),
-    )
+    await _edit_costs_page(contract)
 
 
 async def month_selected_callback(contract: CallbackQueryContract):
@@ -139,7 +149,9 @@ async def month_selected_callback(contract: CallbackQueryContract):
     await CallbackMessages.edit(
         q=contract.q,
         text="🤔 Выберите категорию",
-        keyboard=callback_patterns_keyboard(keyboard_patterns),
+        keyboard=cached_callback_patterns_keyboard(
+            keyboard_patterns, namespace=CategoriesCRUD.CACHE_NAMESPACE
+        ),
     )
 
 
@@ -147,7 +159,7 @@ async def delete_cost_callback(contract: MessageContract):
     keyboard_patterns: list[CallbackItem] = []
 
     try:
-        async for month in costs_services.get_last_months(
+        for month in await costs_services.get_last_months(
             contract.user.configuration.number_of_dates
         ):
             keyboard_patterns.append(
@@ -1,6 +1,6 @@
 from src.application.database import transaction
 from src.application.messages import MessageContract, Messages
-from src.domain.money import CurrenciesCRUD, CurrencyInDB
+from src.domain.money import Equity
 from src.domain.money import services as money_services
 from src.keyboards.default import default_keyboard
 
@@ -8,16 +8,16 @@ from src.keyboards.default import default_keyboard
 @transaction
 async def equity_callback(contract: MessageContract):
 
-    currencies: list[CurrencyInDB] = await CurrenciesCRUD().all()
+    equity: list[Equity] = await money_services.get_equity()
 
     text = "\n\n".join(
         (
             "🏦 Капитализация",
             "\n".join(
                 (
-                    f"👉 {money_services.repr_value(currency.equity)} "
-                    f"{currency.sign}"
-                    for currency in currencies
+                    f"👉 {money_services.repr_value(element.value)} "
+                    f"{element.currency.sign}"
+                    for element in equity
                 ),
             ),
         )
@@ -18,13 +18,14 @@ from src.domain.incomes import services as incomes_services
 from src.domain.money import CurrenciesCRUD, CurrencyInDB
 from src.domain.money import services as money_services
 from src.infrastructure.errors import UserError, ValidationError
-from src.keyboards.constants import (
-    INCOME_SOURCES_KEYBOARD_ELEMENTS,
-    ConfirmationOption,
+from src.keyboards.default import (
+    confirmation_keyboard,
+    default_keyboard,
+    income_sources_keyboard,
 )
-from src.keyboards.default import default_keyboard
 from src.keyboards.models import CallbackItem
 from src.keyboards.patterns import (
+    cached_callback_patterns_keyboard,
     callback_patterns_keyboard,
     patterns_keyboard,
 )
@@ -93,21 +94,13 @@ async def date_selected_callback(contract: CallbackQueryContract):
         )
     )
 
-    keyboard_patterns: list[CallbackItem] = [
-        CallbackItem(
-            name=ConfirmationOption.NO,
-            callback_data=AddIncomeCallbackOperation.SELECT_NO,
-        ),
-        CallbackItem(
-            name=ConfirmationOption.YES,
-            callback_data=AddIncomeCallbackOperation.SELECT_YES,
-        ),
-    ]
-
     await CallbackMessages.edit(
         q=contract.q,
         text=text,
-        keyboard=callback_patterns_keyboard(keyboard_patterns),
+        keyboard=confirmation_keyboard(
+            AddIncomeCallbackOperation.SELECT_NO,
+            AddIncomeCallbackOperation.SELECT_YES,
+        ),
     )
 
     state.next_callback = confirmation_selected_callback
@@ -157,22 +150,10 @@ async def name_entered_callback(contract: MessageContract):
     state.check_data("value", "currency")
     state.data.name = contract.m.text
 
-    # Prepare keyboard with income sources
-    keyboard_patterns = [
-        CallbackItem(
-            name=callback_item.name,
-            callback_data=(
-                f"{AddIncomeCallbackOperation.SELECT_SOURCE}"
-                f"{callback_item.callback_data}"
-            ),
-        )
-        for callback_item in INCOME_SOURCES_KEYBOARD_ELEMENTS
-    ]
-
     message = await Messages.send(
         chat_id=contract.user.chat_id,
         text="🤔 Выберите источник",
-        keyboard=callback_patterns_keyboard(keyboard_patterns),
+        keyboard=income_sources_keyboard(),
     )
 
     state.next_callback = source_selected_callback
@@ -240,7 +221,9 @@ async def value_entered_callback(contract: MessageContract):
     message = await Messages.send(
         text=text,
         chat_id=contract.user.chat_id,
-        keyboard=callback_patterns_keyboard(keyboard_patterns),
+        keyboard=cached_callback_patterns_keyboard(
+            keyboard_patterns, namespace=CurrenciesCRUD.CACHE_NAMESPACE
+        ),
     )
 
     state.messages_to_delete.add(message.id)
@@ -12,12 +12,11 @@ from src.domain.incomes import (
     IncomesCRUD,
 )
 from src.domain.incomes import services as incomes_services
-from src.domain.money import services as money_services
 from src.infrastructure.errors import UserError
-from src.keyboards.constants import ConfirmationOption
-from src.keyboards.default import default_keyboard
+from src.infrastructure.pagination import Cursor, Page
+from src.keyboards.default import confirmation_keyboard, default_keyboard
 from src.keyboards.models import CallbackItem
-from src.keyboards.patterns import callback_patterns_keyboard
+from src.keyboards.patterns import paginated_callback_patterns_keyboard
 
 
 @transaction
@@ -56,29 +55,68 @@ async def confirmation_selected_callback(
     state.next_callback = None
 
 
+async def _edit_incomes_page(
+    contract: CallbackQueryContract, cursor: Cursor | None = None
+):
+    state = contract.state
+    page: Page = await IncomesCRUD().page_for_delete(
+        month=state.data.month, cursor=cursor  # type: ignore
+    )
+
+    if not page.items:
+        await Messages.delete(
+            contract.user.chat_id, *contract.state.messages_to_delete
+        )
+        state.clear_data()
+        raise UserError("😢 Доходов нет")
+
+    keyboard_patterns = [
+        CallbackItem(
+            name=income.repr(),
+            callback_data="".join(
+                (DeleteIncomeCallbackOperation.SELECT_INCOME, str(income.id))
+            ),
+        )
+        for income in page.items
+    ]
+
+    await CallbackMessages.edit(
+        contract.q,
+        text="🤔 Выберите доход",
+        keyboard=paginated_callback_patterns_keyboard(
+            keyboard_patterns,
+            page=page,
+            page_operation=DeleteIncomeCallbackOperation.SELECT_PAGE,
+        ),
+    )
+
+
 async def income_selected_callback(contract: CallbackQueryContract):
     state = contract.state
     state.check_data("month")
+
+    if contract.q.data.startswith(DeleteIncomeCallbackOperation.SELECT_PAGE):
+        cursor = Cursor.decode(
+            contract.q.data.replace(
+                DeleteIncomeCallbackOperation.SELECT_PAGE, ""
+            )
+        )
+        # NOTE: The router drops the callback before calling it
+        state.next_callback = income_selected_callback
+        return await _edit_incomes_page(contract, cursor)
+
     state.data.income_id = int(
         contract.q.data.replace(
             DeleteIncomeCallbackOperation.SELECT_INCOME, ""
         )
     )
-    keyboard_patterns: list[CallbackItem] = [
-        CallbackItem(
-            name=ConfirmationOption.NO,
-            callback_data=DeleteIncomeCallbackOperation.SELECT_NO,
-        ),
-        CallbackItem(
-            name=ConfirmationOption.YES,
-            callback_data=DeleteIncomeCallbackOperation.SELECT_YES,
-        ),
-    ]
-
     await CallbackMessages.edit(
         q=contract.q,
         text="Вы действительно хотите удалить доход?",
-        keyboard=callback_patterns_keyboard(keyboard_patterns),
+        keyboard=confirmation_keyboard(
+            DeleteIncomeCallbackOperation.SELECT_NO,
+            DeleteIncomeCallbackOperation.SELECT_YES,
+        ),
     )
 
     state.next_callback = confirmation_selected_callback
@@ -86,36 +124,10 @@ async def income_selected_callback(contract: CallbackQueryContract):
 
 async def month_selected_callback(contract: CallbackQueryContract):
     state = contract.state
-    month = contract.q.data.replace(
+    state.data.month = contract.q.data.replace(
         DeleteIncomeCallbackOperation.SELECT_MONTH, ""
     )
 
-    keyboard_patterns = []
-    async for income in IncomesCRUD().filter_for_delete(month):
-        _income_repr = (
-            f"{income.name}: "
-            f"{money_services.repr_value(income.value)}{income.currency.sign} "
-            f"({income.date.strftime('%m-%d')})"
-        )
-        _callback_data = "".join(
-            (DeleteIncomeCallbackOperation.SELECT_INCOME, str(income.id))
-        )
-        keyboard_patterns.append(
-            CallbackItem(name=_income_repr, callback_data=_callback_data)
-        )
-
-    if not keyboard_patterns:
-        await Messages.delete(
-            contract.user.chat_id, *contract.state.messages_to_delete
-        )
-        state.clear_data()
-        raise UserError("😢 Доходов нет")
-
-    await CallbackMessages.edit(
-        contract.q,
-        text="🤔 Выберите доход",
-        keyboard=callback_patterns_keyboard(keyboard_patterns),
-    )
+    await _edit_incomes_page(contract)
 
-    state.data.month = month
     state.next_callback = income_selected_callback
@@ -31,7 +31,7 @@ async def income_action_selected_callback(contract: CallbackQueryContract):
 
             keyboard_patterns: list[CallbackItem] = []
             try:
-                async for month in incomes_services.get_last_months(
+                for month in await incomes_services.get_last_months(
                     contract.user.configuration.number_of_dates
                 ):
                     callback_data = "".join(
@@ -1,8 +1,12 @@
+from functools import cache
+from importlib import import_module
 from typing import Callable
 
 from telebot import types
+from telebot.async_telebot import AsyncTeleBot
 
 from src.application.authentication import acl
+from src.application.database import update_session
 from src.application.errors import base_error_handler
 from src.application.messages import (
     CallbackMessages,
@@ -12,36 +16,56 @@ from src.application.messages import (
     Messages,
 )
 from src.application.states import State
+from src.domain.costs import QUICK_ADD_REGEX
 from src.domain.users import User, UsersCRUD
-from src.handlers.add_cost import add_cost_callback
-from src.handlers.analytics import analytics_general_menu_callback
-from src.handlers.commands import restart as restart_command_callback
-from src.handlers.commands import start as start_command_callback
-from src.handlers.configurations import configurations_general_callback
-from src.handlers.currency_exchange import currency_exchange_callback
-from src.handlers.delete_cost import delete_cost_callback
-from src.handlers.equity import equity_callback
-from src.handlers.incomes import incomes_general_menu_callback
 from src.infrastructure.errors import AccessForbiden, NotFound
-from src.infrastructure.telegram import bot
+from src.infrastructure.metrics import set_handler, track_update
 from src.keyboards.constants import Commands, Menu
 from src.keyboards.default import default_keyboard
 
-__all__ = ("any_message", "any_callback_qeury")
+__all__ = (
+    "any_message",
+    "any_callback_qeury",
+    "register_handlers",
+    "preload_callbacks",
+)
 
 
-ROOT_COMMANDS_MAPPER: dict[str, Callable] = {
-    Commands.START: start_command_callback,
+# NOTE: Handlers modules are imported on the first use
+#       or during the startup warm-up (see `preload_callbacks`).
+ROOT_COMMANDS_MAPPER: dict[str, str] = {
+    Commands.START: "src.handlers.commands:start",
+    Commands.RESTART: "src.handlers.commands:restart",
 }
-ROOT_MESSAGES_MAPPER: dict[str, Callable] = {
-    Menu.ADD_COST: add_cost_callback,
-    Menu.DELETE_COST: delete_cost_callback,
-    Menu.INCOMES: incomes_general_menu_callback,
-    Menu.EQUITY: equity_callback,
-    Menu.EXCHANGE: currency_exchange_callback,
-    Menu.ANALYTICS: analytics_general_menu_callback,
-    Menu.CONFIGURATIONS: configurations_general_callback,
+ROOT_MESSAGES_MAPPER: dict[str, str] = {
+    Menu.ADD_COST: "src.handlers.add_cost:add_cost_callback",
+    Menu.DELETE_COST: "src.handlers.delete_cost:delete_cost_callback",
+    Menu.INCOMES: "src.handlers.incomes:incomes_general_menu_callback",
+    Menu.EQUITY: "src.handlers.equity:equity_callback",
+    Menu.EXCHANGE: (
+        "src.handlers.currency_exchange:currency_exchange_callback"
+    ),
+    Menu.ANALYTICS: "src.handlers.analytics:analytics_general_menu_callback",
+    Menu.CONFIGURATIONS: (
+        "src.handlers.configurations:configurations_general_callback"
+    ),
 }
+QUICK_ADD_CALLBACK = "src.handlers.add_cost:quick_add_callback"
+
+
+@cache
+def _import_callback(path: str) -> Callable:
+    module_name, callback_name = path.split(":")
+    return getattr(import_module(module_name), callback_name)
+
+
+def preload_callbacks() -> None:
+    for path in (
+        *ROOT_COMMANDS_MAPPER.values(),
+        *ROOT_MESSAGES_MAPPER.values(),
+        QUICK_ADD_CALLBACK,
+    ):
+        _import_callback(path)
 
 
 async def _get_user(account_id: int) -> User:
@@ -51,25 +75,38 @@ async def _get_user(account_id: int) -> User:
         raise AccessForbiden
 
 
-@bot.message_handler(func=lambda _: True)
+@track_update
+@update_session
 @base_error_handler
 @acl
 async def any_message(m: types.Message):
 
     assert m.text
 
-    if _callback := ROOT_COMMANDS_MAPPER.get(m.text):
+    if m.text == Commands.START:
+        _callback = _import_callback(ROOT_COMMANDS_MAPPER[m.text])
+        set_handler(_callback)
         return await _callback(CommandContract(m=m))
 
     user: User = await _get_user(m.from_user.id)
     state = State(user.id)
 
     if m.text == Commands.RESTART:
-        return await restart_command_callback(
-            MessageContract(m=m, state=state, user=user)
-        )
+        _callback = _import_callback(ROOT_COMMANDS_MAPPER[m.text])
+        set_handler(_callback)
+        return await _callback(MessageContract(m=m, state=state, user=user))
+
+    if _path := ROOT_MESSAGES_MAPPER.get(m.text):
+        _callback = _import_callback(_path)
+        set_handler(_callback)
+        return await _callback(MessageContract(m=m, state=state, user=user))
 
-    if _callback := ROOT_MESSAGES_MAPPER.get(m.text):
+    # NOTE: The message of several costs starts with the quick-add line
+    if not state.next_callback and QUICK_ADD_REGEX.fullmatch(
+        m.text.lstrip().partition("\n")[0]
+    ):
+        _callback = _import_callback(QUICK_ADD_CALLBACK)
+        set_handler(_callback)
         return await _callback(MessageContract(m=m, state=state, user=user))
 
     if not (_callback := state.next_callback):
@@ -80,11 +117,13 @@ async def any_message(m: types.Message):
         )
 
     state.next_callback = None
+    set_handler(_callback)
 
     return await _callback(MessageContract(m=m, state=state, user=user))
 
 
-@bot.callback_query_handler(func=lambda c: c.data)
+@track_update
+@update_session
 @base_error_handler
 @acl
 async def any_callback_qeury(q: types.CallbackQuery):
@@ -97,5 +136,13 @@ async def any_callback_qeury(q: types.CallbackQuery):
         )
 
     state.next_callback = None
+    set_handler(_callback)
 
     return await _callback(CallbackQueryContract(q=q, state=state, user=user))
+
+
+def register_handlers(bot: AsyncTeleBot) -> None:
+    bot.register_message_handler(any_message, func=lambda _: True)
+    bot.register_callback_query_handler(
+        any_callback_qeury, func=lambda c: c.data
+    )
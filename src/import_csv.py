@@ -0,0 +1,66 @@
+"""
+Import costs or incomes of the user from the CSV file.
+
+The header is required, columns are matched by names
+(see `IMPORT_COLUMNS`): date, value, name, category for costs,
+source for incomes and the optional currency. Rows which already exist
+in the ledger of the user by (date, value, name) are skipped,
+so the same export could be imported again safely.
+
+The bot caches analytics, months and dates bounds of the ledger
+in its own memory, so the running bot should be restarted after
+the import to serve them from the imported ledger.
+
+Usage:
+    python -m src.import_csv costs.csv --account-id 123 [--kind incomes]
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+
+from src.application.database import transaction
+from src.domain.imports import ImportKind, ImportReport
+from src.domain.imports import services as imports_services
+from src.domain.users import UsersCRUD
+from src.infrastructure.database.services.session import get_engine
+
+
+@transaction
+async def import_file(
+    path: str, kind: ImportKind, account_id: int
+) -> ImportReport:
+    user = await UsersCRUD().by_account_id(account_id)
+
+    # NOTE: The file is read line by line, so its size does not matter
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        return await imports_services.run(file, kind, user)
+
+
+async def run(path: str, kind: ImportKind, account_id: int) -> None:
+    started = perf_counter()
+    report = await import_file(path, kind, account_id)
+    await get_engine().dispose()
+
+    if report is None:
+        print("FAILED: changes are rolled back, see the log")
+        return
+
+    print(report.repr())
+    print(f"Done in {perf_counter() - started:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("path")
+    parser.add_argument("--account-id", type=int, required=True)
+    parser.add_argument(
+        "--kind", type=ImportKind, choices=list(ImportKind), default="costs"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(run(args.path, ImportKind(args.kind), args.account_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -23,12 +23,36 @@ class Cache:
         return f"{namespace}:{str(key)}"
 
     @classmethod
-    def set(cls, namespace: str, key: str, instance: Any):
+    def set(
+        cls,
+        namespace: str,
+        key: str,
+        instance: Any,
+        limit: int | None = None,
+    ):
+        """Store the instance. If the limit is given, the oldest entries
+        of the namespace are evicted beyond it.
+        """
+
         _key = cls._build_key(namespace, key)
         entry = _CacheEntry(instance=instance, ttl=CACHE_TTL)
 
+        # NOTE: The key is moved to the end, so entries are kept
+        #       in the order they have been stored
+        cls._DATA.pop(_key, None)
         cls._DATA[_key] = entry
 
+        if limit is not None:
+            cls._evict(namespace, limit)
+
+    @classmethod
+    def _evict(cls, namespace: str, limit: int) -> None:
+        prefix = cls._build_key(namespace, "")
+        keys = [key for key in cls._DATA if key.startswith(prefix)]
+
+        for _key in keys[: max(len(keys) - limit, 0)]:
+            del cls._DATA[_key]
+
     @classmethod
     def get(cls, namespace: str, key: Any) -> Any:
         _key = cls._build_key(namespace, key)
@@ -43,6 +67,13 @@ class Cache:
 
         return entry.instance
 
+    @classmethod
+    def invalidate(cls, namespace: str) -> None:
+        prefix = cls._build_key(namespace, "")
+
+        for _key in [key for key in cls._DATA if key.startswith(prefix)]:
+            del cls._DATA[_key]
+
 
 def cached(namespace: str, key: str):
 
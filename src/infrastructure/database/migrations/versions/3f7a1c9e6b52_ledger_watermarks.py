@@ -0,0 +1,33 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "3f7a1c9e6b52"
+down_revision = "9d3b61f0c2a4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ledger_watermarks",
+        sa.Column("ledger", sa.String(), nullable=False),
+        sa.Column("first_date", sa.Date(), nullable=False),
+        sa.Column("last_date", sa.Date(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_ledger_watermarks")),
+        sa.UniqueConstraint(
+            "ledger", name=op.f("uq_ledger_watermarks_ledger")
+        ),
+    )
+
+    for table in ("costs", "incomes", "currency_exchange"):
+        op.execute(
+            "INSERT INTO ledger_watermarks (ledger, first_date, last_date) "
+            f"SELECT '{table}', min(date), max(date) FROM {table} "
+            "HAVING count(*) > 0"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("ledger_watermarks")
@@ -0,0 +1,24 @@
+from alembic import op
+
+
+revision = "5e9a2c7b4d18"
+down_revision = "b84e2d6f1a37"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_costs_category_id"),
+        "costs",
+        ["category_id", "date", "id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_incomes_date"), "incomes", ["date", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_incomes_date"), table_name="incomes")
+    op.drop_index(op.f("ix_costs_category_id"), table_name="costs")
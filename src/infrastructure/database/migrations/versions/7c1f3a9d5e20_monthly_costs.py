@@ -0,0 +1,57 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "7c1f3a9d5e20"
+down_revision = "04dc3fae2386"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "monthly_costs",
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("category_id", sa.Integer(), nullable=True),
+        sa.Column("currency_id", sa.Integer(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_monthly_costs_user_id_users"),
+            ondelete="RESTRICT",
+        ),
+        sa.ForeignKeyConstraint(
+            ["category_id"],
+            ["categories.id"],
+            name=op.f("fk_monthly_costs_category_id_categories"),
+            ondelete="RESTRICT",
+        ),
+        sa.ForeignKeyConstraint(
+            ["currency_id"],
+            ["currencies.id"],
+            name=op.f("fk_monthly_costs_currency_id_currencies"),
+            ondelete="RESTRICT",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_monthly_costs")),
+        sa.UniqueConstraint(
+            "month",
+            "user_id",
+            "category_id",
+            "currency_id",
+            name=op.f("uq_monthly_costs_month"),
+        ),
+    )
+    op.execute(
+        "INSERT INTO monthly_costs "
+        "(month, user_id, category_id, currency_id, value) "
+        "SELECT date_trunc('month', date)::date, user_id, category_id, "
+        "currency_id, sum(value) FROM costs "
+        "GROUP BY 1, user_id, category_id, currency_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("monthly_costs")
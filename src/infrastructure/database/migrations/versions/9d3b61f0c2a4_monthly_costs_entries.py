@@ -0,0 +1,32 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "9d3b61f0c2a4"
+down_revision = "5e9a2c7b4d18"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "monthly_costs",
+        sa.Column(
+            "entries", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+    op.execute(
+        "UPDATE monthly_costs SET entries = counts.entries FROM ("
+        "SELECT date_trunc('month', date)::date AS month, user_id, "
+        "category_id, currency_id, count(*) AS entries FROM costs "
+        "GROUP BY 1, user_id, category_id, currency_id"
+        ") AS counts "
+        "WHERE monthly_costs.month = counts.month "
+        "AND monthly_costs.user_id = counts.user_id "
+        "AND monthly_costs.category_id = counts.category_id "
+        "AND monthly_costs.currency_id = counts.currency_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("monthly_costs", "entries")
@@ -0,0 +1,103 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "a1e5c83d9f60"
+down_revision = "3f7a1c9e6b52"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "equity_movements",
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("source", sa.String(), nullable=False),
+        sa.Column("entry_id", sa.Integer(), nullable=True),
+        sa.Column("currency_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["currency_id"],
+            ["currencies.id"],
+            name=op.f("fk_equity_movements_currency_id_currencies"),
+            ondelete="RESTRICT",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_equity_movements")),
+    )
+    op.create_table(
+        "equity_snapshots",
+        sa.Column("movement_id", sa.Integer(), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.Column("currency_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["currency_id"],
+            ["currencies.id"],
+            name=op.f("fk_equity_snapshots_currency_id_currencies"),
+            ondelete="RESTRICT",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_equity_snapshots")),
+        sa.UniqueConstraint(
+            "movement_id",
+            "currency_id",
+            name=op.f("uq_equity_snapshots_movement_id"),
+        ),
+    )
+
+    # NOTE: Every entry of the ledger gets its movement and the opening
+    #       movement keeps the difference with the running balance
+    for source, currency_id, value, table in (
+        ("costs", "currency_id", "-value", "costs"),
+        ("incomes", "currency_id", "value", "incomes"),
+        (
+            "currency_exchange",
+            "source_currency_id",
+            "-source_value",
+            "currency_exchange",
+        ),
+        (
+            "currency_exchange",
+            "destination_currency_id",
+            "destination_value",
+            "currency_exchange",
+        ),
+    ):
+        op.execute(
+            "INSERT INTO equity_movements "
+            "(currency_id, value, date, source, entry_id) "
+            f"SELECT {currency_id}, {value}, date, '{source}', id "
+            f"FROM {table} WHERE {currency_id} IS NOT NULL ORDER BY id"
+        )
+
+    op.execute(
+        "INSERT INTO equity_movements (currency_id, value, date, source) "
+        "SELECT currencies.id, currencies.equity - COALESCE(sum("
+        "equity_movements.value), 0), current_date, 'opening' "
+        "FROM currencies LEFT JOIN equity_movements "
+        "ON equity_movements.currency_id = currencies.id "
+        "GROUP BY currencies.id "
+        "HAVING currencies.equity - COALESCE(sum(equity_movements.value), 0)"
+        " <> 0"
+    )
+    op.execute(
+        "INSERT INTO equity_snapshots (movement_id, currency_id, value) "
+        "SELECT (SELECT max(id) FROM equity_movements), currency_id, "
+        "sum(value) FROM equity_movements GROUP BY currency_id"
+    )
+    op.drop_column("currencies", "equity")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "currencies",
+        sa.Column("equity", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        "UPDATE currencies SET equity = balances.value FROM ("
+        "SELECT currency_id, sum(value) AS value FROM equity_movements "
+        "GROUP BY currency_id"
+        ") AS balances WHERE currencies.id = balances.currency_id"
+    )
+    op.drop_table("equity_snapshots")
+    op.drop_table("equity_movements")
@@ -0,0 +1,47 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "b84e2d6f1a37"
+down_revision = "7c1f3a9d5e20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "budgets",
+        sa.Column("value", sa.Integer(), nullable=False),
+        sa.Column("configuration_id", sa.Integer(), nullable=True),
+        sa.Column("category_id", sa.Integer(), nullable=True),
+        sa.Column("currency_id", sa.Integer(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["configuration_id"],
+            ["configurations.id"],
+            name=op.f("fk_budgets_configuration_id_configurations"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["category_id"],
+            ["categories.id"],
+            name=op.f("fk_budgets_category_id_categories"),
+            ondelete="RESTRICT",
+        ),
+        sa.ForeignKeyConstraint(
+            ["currency_id"],
+            ["currencies.id"],
+            name=op.f("fk_budgets_currency_id_currencies"),
+            ondelete="RESTRICT",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_budgets")),
+        sa.UniqueConstraint(
+            "configuration_id",
+            "category_id",
+            name=op.f("uq_budgets_configuration_id"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("budgets")
@@ -0,0 +1,37 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "c6d2e8f4a913"
+down_revision = "a1e5c83d9f60"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reconciliation_checkpoints",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("last_id", sa.Integer(), nullable=False),
+        sa.Column("horizon_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "id", name=op.f("pk_reconciliation_checkpoints")
+        ),
+        sa.UniqueConstraint(
+            "name", name=op.f("uq_reconciliation_checkpoints_name")
+        ),
+    )
+    op.create_index(
+        op.f("ix_equity_movements_source"),
+        "equity_movements",
+        ["source", "entry_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_equity_movements_source"), table_name="equity_movements"
+    )
+    op.drop_table("reconciliation_checkpoints")
@@ -0,0 +1,15 @@
+from alembic import op
+
+
+revision = "e4b7a2c95d10"
+down_revision = "c6d2e8f4a913"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f("ix_costs_date"), "costs", ["date"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_costs_date"), table_name="costs")
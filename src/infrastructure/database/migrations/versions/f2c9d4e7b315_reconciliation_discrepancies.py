@@ -0,0 +1,27 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "f2c9d4e7b315"
+down_revision = "e4b7a2c95d10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reconciliation_discrepancies",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("row_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "id", name=op.f("pk_reconciliation_discrepancies")
+        ),
+        sa.UniqueConstraint(
+            "name", "row_id", name=op.f("uq_reconciliation_discrepancies_name")
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("reconciliation_discrepancies")
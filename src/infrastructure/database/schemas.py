@@ -1,14 +1,17 @@
 from typing import TypeVar
 
 from sqlalchemy import (
+    BigInteger,
     Column,
     Date,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     MetaData,
     String,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import declarative_base, relationship
 
@@ -19,11 +22,18 @@ __all__ = (
     "ConcreteSchema",
     "UserSchema",
     "ConfigurationSchema",
+    "BudgetSchema",
     "CurrencySchema",
     "CurrencyExchangeSchema",
     "CategorySchema",
     "CostSchema",
     "IncomeSchema",
+    "MonthlyCostSchema",
+    "LedgerWatermarkSchema",
+    "EquityMovementSchema",
+    "EquitySnapshotSchema",
+    "ReconciliationCheckpointSchema",
+    "ReconciliationDiscrepancySchema",
 )
 
 meta = MetaData(
@@ -83,12 +93,30 @@ class ConfigurationSchema(Base):
     )
 
 
+class BudgetSchema(Base):
+    """The monthly limit of costs in the category for the user."""
+
+    __tablename__ = "budgets"
+    __table_args__ = (UniqueConstraint("configuration_id", "category_id"),)
+
+    value = Column(Integer, nullable=False)
+
+    configuration_id = Column(
+        ForeignKey("configurations.id", ondelete="CASCADE"),
+    )
+    category_id = Column(
+        ForeignKey("categories.id", ondelete="RESTRICT"),
+    )
+    currency_id = Column(
+        ForeignKey("currencies.id", ondelete="RESTRICT"),
+    )
+
+
 class CurrencySchema(Base):
     __tablename__ = "currencies"
 
     name = Column(String(length=3), nullable=False, unique=True)
     sign = Column(String(length=1), nullable=False, unique=True)
-    equity = Column(Integer, nullable=False, default=0)
 
     configurations = relationship(
         "ConfigurationSchema", back_populates="default_currency"
@@ -148,6 +176,12 @@ class CategorySchema(Base):
 
 class CostSchema(Base):
     __tablename__ = "costs"
+    # NOTE: The keyset pagination of the delete picker
+    #       and date ranges regardless of categories
+    __table_args__ = (
+        Index(None, "category_id", "date", "id"),
+        Index(None, "date"),
+    )
 
     name = Column(String, nullable=False)
     value = Column(Integer, nullable=False)
@@ -174,6 +208,8 @@ class CostSchema(Base):
 
 class IncomeSchema(Base):
     __tablename__ = "incomes"
+    # NOTE: The keyset pagination of the delete picker
+    __table_args__ = (Index(None, "date", "id"),)
 
     name = Column(String, nullable=False)
     value = Column(Integer, nullable=False)
@@ -194,3 +230,96 @@ class IncomeSchema(Base):
     currency = relationship(
         "CurrencySchema", uselist=False, back_populates="incomes"
     )
+
+
+class MonthlyCostSchema(Base):
+    """The aggregate of costs by month which is maintained on writes."""
+
+    __tablename__ = "monthly_costs"
+    __table_args__ = (
+        UniqueConstraint("month", "user_id", "category_id", "currency_id"),
+    )
+
+    month = Column(Date, nullable=False)
+    value = Column(BigInteger, nullable=False, default=0)
+    # The number of costs, so the month is known to have entries
+    entries = Column(Integer, nullable=False, default=0)
+
+    user_id = Column(
+        ForeignKey("users.id", ondelete="RESTRICT"),
+    )
+    category_id = Column(
+        ForeignKey("categories.id", ondelete="RESTRICT"),
+    )
+    currency_id = Column(
+        ForeignKey("currencies.id", ondelete="RESTRICT"),
+    )
+
+
+class LedgerWatermarkSchema(Base):
+    """The first and the last dates of the ledger table
+    which are maintained on writes.
+    """
+
+    __tablename__ = "ledger_watermarks"
+
+    ledger = Column(String, nullable=False, unique=True)
+    first_date = Column(Date, nullable=False)
+    last_date = Column(Date, nullable=False)
+
+
+class EquityMovementSchema(Base):
+    """The append-only ledger of equity changes. Rows are never updated,
+    deleted entries get compensating movements instead.
+    """
+
+    __tablename__ = "equity_movements"
+    __table_args__ = (Index(None, "source", "entry_id"),)
+
+    value = Column(BigInteger, nullable=False)
+    date = Column(Date, nullable=False)
+    # The ledger table and the entry which have caused the movement
+    source = Column(String, nullable=False)
+    entry_id = Column(Integer, nullable=True)
+
+    currency_id = Column(
+        ForeignKey("currencies.id", ondelete="RESTRICT"), nullable=False
+    )
+
+
+class EquitySnapshotSchema(Base):
+    """Balances of currencies including movements up to the movement id."""
+
+    __tablename__ = "equity_snapshots"
+    __table_args__ = (UniqueConstraint("movement_id", "currency_id"),)
+
+    movement_id = Column(Integer, nullable=False)
+    value = Column(BigInteger, nullable=False)
+
+    currency_id = Column(
+        ForeignKey("currencies.id", ondelete="RESTRICT"), nullable=False
+    )
+
+
+class ReconciliationCheckpointSchema(Base):
+    """Ids up to which the table is reconciled and the horizon:
+    the max id of the previous run which is reconciled next time.
+    """
+
+    __tablename__ = "reconciliation_checkpoints"
+
+    name = Column(String, nullable=False, unique=True)
+    last_id = Column(Integer, nullable=False)
+    horizon_id = Column(Integer, nullable=False)
+
+
+class ReconciliationDiscrepancySchema(Base):
+    """Ids of rows with unrepaired discrepancies by the checkpoint name.
+    They are checked again by next runs, since checkpoints are passed.
+    """
+
+    __tablename__ = "reconciliation_discrepancies"
+    __table_args__ = (UniqueConstraint("name", "row_id"),)
+
+    name = Column(String, nullable=False)
+    row_id = Column(Integer, nullable=False)
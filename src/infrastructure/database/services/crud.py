@@ -1,13 +1,24 @@
 from typing import Any, AsyncGenerator, Generic, Type
 
-from sqlalchemy import Result, asc, delete, desc, func, select, update
+from sqlalchemy import (
+    Result,
+    Select,
+    asc,
+    delete,
+    desc,
+    func,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.exc import IntegrityError, PendingRollbackError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.infrastructure.errors import DatabaseError, NotFound, ValidationError
+from src.infrastructure.pagination import PAGE_SIZE, Cursor, Page
 
 from ..schemas import ConcreteSchema
-from .session import CTX_SESSION
+from .session import current_session
 
 __all__ = ("BaseCRUD", "Session")
 
@@ -16,7 +27,7 @@ class Session:
     _ERRORS = (IntegrityError, PendingRollbackError)
 
     def __init__(self) -> None:
-        self._session: AsyncSession = CTX_SESSION.get()
+        self._session: AsyncSession = current_session()
 
     async def execute(self, query) -> Result:
         try:
@@ -98,6 +109,30 @@ class BaseCRUD(Session, Generic[ConcreteSchema]):
 
         return _result
 
+    async def _keyset_page(
+        self, query: Select, cursor: Cursor | None, size: int = PAGE_SIZE
+    ) -> Page:
+        """Fetch the page of the query in the (date, id) order
+        of the schema. Rows should include `date` and `id` columns.
+        """
+
+        date_, id_ = self.schema_class.date, self.schema_class.id
+
+        if cursor is None:
+            query = query.order_by(asc(date_), asc(id_))
+        elif cursor.backward:
+            query = query.where(
+                tuple_(date_, id_) < tuple_(cursor.date, cursor.id)
+            ).order_by(desc(date_), desc(id_))
+        else:
+            query = query.where(
+                tuple_(date_, id_) > tuple_(cursor.date, cursor.id)
+            ).order_by(asc(date_), asc(id_))
+
+        result: Result = await self.execute(query.limit(size + 1))
+
+        return Page.build(result.all(), cursor, size)
+
     async def _save(self, schema: ConcreteSchema) -> ConcreteSchema:
         """
 
@@ -0,0 +1,104 @@
+"""
+This module is not re-exported by the package
+since Alembic is not needed on the regular import path.
+"""
+
+import asyncio
+from time import monotonic
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from src.settings import DATABASE_READINESS_TIMEOUT, ROOT_FOLDER, SRC_FOLDER
+
+from .session import get_engine
+
+__all__ = (
+    "get_head_revision",
+    "get_current_revision",
+    "check_migration_head",
+    "wait_for_database",
+    "upgrade_if_needed",
+)
+
+ALEMBIC_CONFIG_PATH = ROOT_FOLDER / "alembic.ini"
+MIGRATIONS_FOLDER = SRC_FOLDER / "infrastructure" / "database" / "migrations"
+
+
+def get_alembic_config() -> Config:
+    config = Config(str(ALEMBIC_CONFIG_PATH))
+    config.set_main_option("script_location", str(MIGRATIONS_FOLDER))
+
+    return config
+
+
+def get_head_revision() -> str | None:
+    """Read the head from the versions folder without the migrations env."""
+
+    return ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+
+async def get_current_revision() -> str | None:
+    async with get_engine().connect() as connection:
+        return await connection.run_sync(
+            lambda sync_connection: MigrationContext.configure(
+                sync_connection
+            ).get_current_revision()
+        )
+
+
+async def check_migration_head() -> bool:
+    head = get_head_revision()
+    current = await get_current_revision()
+
+    if current != head:
+        logger.info(
+            f"Database revision {current} is not the head revision {head}"
+        )
+        return False
+
+    return True
+
+
+async def wait_for_database(
+    timeout: float = DATABASE_READINESS_TIMEOUT,
+    delay: float = 0.1,
+    max_delay: float = 2.0,
+) -> None:
+    """Poll the database with the exponential backoff until it accepts
+    connections. The last error is raised after the timeout.
+    """
+
+    deadline = monotonic() + timeout
+
+    while True:
+        try:
+            async with get_engine().connect() as connection:
+                await connection.execute(text("SELECT 1"))
+            return
+        except (OSError, DBAPIError) as error:
+            if monotonic() + delay > deadline:
+                raise
+
+            logger.info(f"Database is not ready: {error}. Retrying...")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_delay)
+
+
+async def upgrade_if_needed() -> bool:
+    """Run migrations only if the database is not on the head revision.
+    Alembic runs its env with asyncio.run(), so it is called in a thread.
+    """
+
+    if await check_migration_head():
+        return False
+
+    logger.info("Running database migrations...")
+    await asyncio.to_thread(command.upgrade, get_alembic_config(), "head")
+
+    return True
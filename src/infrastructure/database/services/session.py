@@ -1,30 +1,153 @@
+import asyncio
+from contextlib import AsyncExitStack
 from contextvars import ContextVar
+from functools import cache
+from typing import Any, Awaitable, Callable
 
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
-from src.settings import DATABASE_URL
+from src.infrastructure.metrics import instrument_engine
+from src.infrastructure.profiling import Profiler
+from src.settings import DATABASE_POOL_SIZE, DATABASE_PROFILING, DATABASE_URL
 
-__all__ = ("get_session", "engine", "CTX_SESSION")
+__all__ = (
+    "get_session",
+    "get_engine",
+    "current_session",
+    "gather_in_snapshot",
+    "on_commit",
+    "CTX_SESSION",
+)
 
 
-engine: AsyncEngine = create_async_engine(
-    DATABASE_URL, future=True, pool_pre_ping=True, echo=False
-)
+@cache
+def get_engine() -> AsyncEngine:
+    """The engine is created on the first use instead of the import time."""
+
+    engine = create_async_engine(
+        DATABASE_URL,
+        future=True,
+        pool_pre_ping=True,
+        pool_size=DATABASE_POOL_SIZE,
+        echo=False,
+    )
+
+    if DATABASE_PROFILING:
+        Profiler.instrument(engine)
 
+    return instrument_engine(engine)
 
-def get_session(engine: AsyncEngine | None = engine) -> AsyncSession:
+
+def get_session(engine: AsyncEngine | None = None) -> AsyncSession:
     Session: async_sessionmaker[AsyncSession] = async_sessionmaker[
         AsyncSession
-    ](engine, expire_on_commit=True, autoflush=False)
+    ](engine or get_engine(), expire_on_commit=True, autoflush=False)
 
     return Session()
 
 
-CTX_SESSION: ContextVar[AsyncSession] = ContextVar(
-    "session", default=get_session()
-)
+@cache
+def _default_session() -> AsyncSession:
+    return get_session()
+
+
+def current_session() -> AsyncSession:
+    """Return the session of the current transaction.
+    The shared session is used outside of the transaction.
+    """
+
+    try:
+        return CTX_SESSION.get()
+    except LookupError:
+        return _default_session()
+
+
+def on_commit(callback: Callable[[], Any]) -> None:
+    """Call the callback once the current session is committed."""
+
+    event.listen(
+        current_session().sync_session,
+        "after_commit",
+        lambda _: callback(),
+        once=True,
+    )
+
+
+async def _run_on(
+    connection: AsyncConnection, call: Callable[[], Awaitable[Any]]
+) -> Any:
+    # NOTE: The task has its own copy of the context,
+    #       so the session is not visible to other calls
+    session = AsyncSession(bind=connection, autoflush=False)
+    CTX_SESSION.set(session)
+
+    try:
+        return await call()
+    finally:
+        await session.close()
+
+
+async def gather_in_snapshot(*calls: Callable[[], Awaitable[Any]]) -> list:
+    """Run read-only calls concurrently, each on a separate pooled
+    connection. The first connection exports its snapshot to others,
+    so the results are consistent as if they were read by one query.
+    Every call takes the pool connection besides the one of the update,
+    so it is not used by default paths (see `src.benchmarks.analytics`).
+
+    Calls are factories, since CRUD classes take the session
+    of the context on the initialization.
+
+    Usage:
+        costs, incomes = await gather_in_snapshot(
+            lambda: CostsCRUD().in_dates_range(start, end),
+            lambda: IncomesCRUD().in_dates_range(start, end),
+        )
+    """
+
+    engine = get_engine()
+
+    async with AsyncExitStack() as stack:
+        # NOTE: Connections are entered one by one, so the failed connect
+        #       returns already entered ones and leaves none checked out
+        connections: list[AsyncConnection] = [
+            await stack.enter_async_context(engine.connect()) for _ in calls
+        ]
+        await asyncio.gather(
+            *(
+                connection.execution_options(
+                    isolation_level="REPEATABLE READ",
+                    postgresql_readonly=True,
+                )
+                for connection in connections
+            )
+        )
+
+        leader, *followers = connections
+        snapshot = (
+            await leader.execute(text("SELECT pg_export_snapshot()"))
+        ).scalar_one()
+        await asyncio.gather(
+            *(
+                connection.execute(
+                    text(f"SET TRANSACTION SNAPSHOT '{snapshot}'")
+                )
+                for connection in followers
+            )
+        )
+
+        return await asyncio.gather(
+            *(
+                _run_on(connection, call)
+                for connection, call in zip(connections, calls)
+            )
+        )
+
+
+CTX_SESSION: ContextVar[AsyncSession] = ContextVar("session")
@@ -1,2 +1,25 @@
+import asyncio
+
+from sqlalchemy import text
+
+from .session import get_engine
+
+__all__ = ("create_categories_if_not_exist", "open_pool_connections")
+
+
 async def create_categories_if_not_exist():
     pass
+
+
+async def open_pool_connections(amount: int) -> None:
+    """Open connections concurrently so the pool is filled before
+    the first update is handled.
+    """
+
+    engine = get_engine()
+
+    async def _connect():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_connect() for _ in range(amount)))
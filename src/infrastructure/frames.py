@@ -0,0 +1,188 @@
+"""
+This module includes the builder of HTML messages (frames)
+for the Telegram limit of the message length.
+
+Telegram measures the text after parsing the HTML entities
+in UTF-16 code units, so emoji outside of the BMP take two of them.
+Chunks are considered tag-balanced and are never split between frames,
+and the headers of the current section are repeated
+at the beginning of each frame.
+"""
+
+import re
+from html import escape, unescape
+
+from src.settings import TELEGRAM_MESSAGE_MAX_LEN
+
+__all__ = ("FramesBuilder", "escape_html", "utf16_len", "visible_len")
+
+_TAG = re.compile(r"<[^>]*>")
+
+
+def escape_html(text: str) -> str:
+    """Escape the user's text for the HTML parse mode."""
+
+    if "&" in text or "<" in text or ">" in text:
+        return escape(text, quote=False)
+
+    return text
+
+
+def utf16_len(text: str) -> int:
+    if text.isascii():
+        return len(text)
+
+    return len(text.encode("utf-16-le")) // 2
+
+
+def visible_len(html: str) -> int:
+    """The length of the HTML text as it is counted by Telegram."""
+
+    if "<" in html or "&" in html:
+        html = unescape(_TAG.sub("", html))
+
+    return utf16_len(html)
+
+
+class FramesBuilder:
+    """Pack chunks into frames up to the limit.
+    Chunks are packed greedily which gives the minimal number of frames
+    since the chunks order is kept and the headers are repeated.
+
+    Usage:
+        builder = FramesBuilder()
+        builder.header("<b>Costs</b>", level=0)
+        builder.header("\\n\\n<b>Food</b>", level=1)
+        builder.add("\\n👉 Coffee 4.50$")
+        frames: list[str] = builder.build()
+    """
+
+    def __init__(
+        self, limit: int = TELEGRAM_MESSAGE_MAX_LEN, separator: str = "\n\n"
+    ) -> None:
+        self.limit = limit
+        self.separator = separator
+        self._separator_len = visible_len(separator)
+        self._headers: list[tuple[str, int]] = []
+        self._pending: int | None = None
+        self._parts: list[str] = []
+        self._length = 0
+        self._checked = 0
+        self._bound = 0
+        self._frames: list[str] = []
+
+    def header(self, text: str, level: int = 0) -> None:
+        """Set the header of the level and drop deeper headers.
+        The header is added only with the next chunk.
+        """
+
+        del self._headers[level:]
+        self._headers.append((text, visible_len(text)))
+
+        if self._pending is None or level < self._pending:
+            self._pending = level
+
+    def _headers_prefix(self) -> tuple[list[str], int]:
+        if not self._parts:
+            headers = self._headers
+        elif self._pending is not None:
+            headers = self._headers[self._pending :]
+        else:
+            return [], 0
+
+        texts = [text for text, _ in headers]
+        length = sum(length for _, length in headers)
+
+        if self._parts and self._pending == 0:
+            texts.insert(0, self.separator)
+            length += self._separator_len
+
+        return texts, length
+
+    def _flush(self) -> None:
+        if self._parts:
+            self._frames.append("".join(self._parts))
+
+        self._parts = []
+        self._length = 0
+        self._checked = 0
+        self._bound = 0
+
+    def _check(self) -> None:
+        """Replace the upper bound of unchecked parts by the exact length.
+        The single pass over the joined tail is much cheaper
+        than stripping tags of each chunk.
+        """
+
+        if self._checked < len(self._parts):
+            tail = "".join(self._parts[self._checked :])
+            self._length += visible_len(tail)
+            self._checked = len(self._parts)
+
+        self._bound = 0
+
+    def add(self, chunk: str) -> None:
+        # NOTE: Tags and entities only shrink the text, so the length
+        #       of the raw chunk is the upper bound of the visible one
+        length = utf16_len(chunk)
+        headers, headers_length = self._headers_prefix()
+        exact = False
+
+        if self._length + self._bound + headers_length + length > self.limit:
+            self._check()
+            length, exact = visible_len(chunk), True
+
+            if (
+                self._parts
+                and self._length + headers_length + length > self.limit
+            ):
+                self._flush()
+                headers, headers_length = self._headers_prefix()
+
+            if headers_length + length > self.limit:
+                self._add_oversized(chunk, headers, headers_length)
+                return
+
+        self._parts += headers
+        self._parts.append(chunk)
+        self._pending = None
+
+        if exact:
+            self._length += headers_length + length
+            self._checked = len(self._parts)
+        else:
+            self._bound += headers_length + length
+
+    def _add_oversized(
+        self, chunk: str, headers: list[str], headers_length: int
+    ) -> None:
+        """The chunk which does not fit into the empty frame
+        is split as a plain text.
+        """
+
+        text = unescape(_TAG.sub("", chunk))
+        available = max(self.limit - headers_length, 1)
+        piece: list[str] = []
+        piece_length = 0
+
+        for char in text:
+            char_length = utf16_len(char)
+            if piece_length + char_length > available:
+                self._frames.append(
+                    "".join(headers) + escape_html("".join(piece))
+                )
+                piece, piece_length = [], 0
+            piece.append(char)
+            piece_length += char_length
+
+        self._parts = [*headers, escape_html("".join(piece))]
+        self._length = headers_length + piece_length
+        self._checked = len(self._parts)
+        self._bound = 0
+        self._pending = None
+
+    def build(self) -> list[str]:
+        self._flush()
+        frames, self._frames = self._frames, []
+
+        return frames
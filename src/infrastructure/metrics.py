@@ -0,0 +1,264 @@
+"""
+This module includes in-process metrics of the bot.
+Each update gets its own metrics in the context, so database statements
+and Telegram API calls are attributed to the handler that caused them.
+Use `Metrics.snapshot()` to get the aggregated state.
+"""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Generator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.infrastructure.models import InternalModel
+
+__all__ = (
+    "Histogram",
+    "HistogramSnapshot",
+    "MetricsSnapshot",
+    "Metrics",
+    "UpdateMetrics",
+    "CTX_UPDATE",
+    "track_update",
+    "set_handler",
+    "telegram_call",
+    "instrument_engine",
+)
+
+LATENCY_BUCKETS: tuple[float, ...] = (
+    1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+)  # fmt: skip
+COUNT_BUCKETS: tuple[float, ...] = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+class HistogramSnapshot(InternalModel):
+    count: int
+    total: float
+    max: float
+    p50: float
+    p90: float
+    p99: float
+    buckets: dict[str, int]
+
+
+class Histogram:
+    """The fixed buckets histogram. Percentiles are approximated
+    by the upper bound of the bucket.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts: list[int] = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+
+        threshold = q * self.count
+        cumulative = 0
+
+        for index, amount in enumerate(self.counts):
+            cumulative += amount
+            if cumulative >= threshold:
+                break
+
+        if index == len(self.buckets):
+            return self.max
+
+        return min(self.buckets[index], self.max)
+
+    def snapshot(self) -> HistogramSnapshot:
+        bounds = [f"<={bound}" for bound in self.buckets] + ["+Inf"]
+
+        return HistogramSnapshot(
+            count=self.count,
+            total=self.total,
+            max=self.max,
+            p50=self.percentile(0.5),
+            p90=self.percentile(0.9),
+            p99=self.percentile(0.99),
+            buckets=dict(zip(bounds, self.counts)),
+        )
+
+
+class MetricsSnapshot(InternalModel):
+    histograms: dict[str, HistogramSnapshot]
+    counters: dict[str, int]
+
+    def represent(self) -> str:
+        lines = [
+            f"{name}: count={h.count} p50={h.p50:.2f} p90={h.p90:.2f} "
+            f"p99={h.p99:.2f} max={h.max:.2f}"
+            for name, h in sorted(self.histograms.items())
+        ]
+        lines += [
+            f"{name}: {value}" for name, value in sorted(self.counters.items())
+        ]
+
+        return "\n".join(lines)
+
+
+class Metrics:
+
+    _HISTOGRAMS: dict[str, Histogram] = {}
+    _COUNTERS: dict[str, int] = {}
+
+    @classmethod
+    def observe(
+        cls,
+        name: str,
+        value: float,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        if not (histogram := cls._HISTOGRAMS.get(name)):
+            histogram = cls._HISTOGRAMS[name] = Histogram(buckets)
+
+        histogram.observe(value)
+
+    @classmethod
+    def increment(cls, name: str, value: int = 1) -> None:
+        cls._COUNTERS[name] = cls._COUNTERS.get(name, 0) + value
+
+    @classmethod
+    def snapshot(cls) -> MetricsSnapshot:
+        return MetricsSnapshot(
+            histograms={
+                name: histogram.snapshot()
+                for name, histogram in cls._HISTOGRAMS.items()
+            },
+            counters=dict(cls._COUNTERS),
+        )
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._HISTOGRAMS.clear()
+        cls._COUNTERS.clear()
+
+
+class UpdateMetrics:
+    """Metrics of the single update. Plain attributes are used
+    since it is changed on each database statement.
+    """
+
+    __slots__ = (
+        "handler",
+        "statements",
+        "db_time",
+        "telegram_calls",
+        "telegram_time",
+        "shapes",
+    )
+
+    def __init__(self, handler: str) -> None:
+        self.handler = handler
+        self.statements = 0
+        self.db_time = 0.0
+        self.telegram_calls = 0
+        self.telegram_time = 0.0
+        self.shapes: dict[str, int] | None = None
+
+
+CTX_UPDATE: ContextVar[UpdateMetrics | None] = ContextVar(
+    "update_metrics", default=None
+)
+
+
+def _ms(started: float) -> float:
+    return (perf_counter() - started) * 1000
+
+
+def set_handler(callback: Callable) -> None:
+    """Attribute the current update to the handler callback."""
+
+    if update := CTX_UPDATE.get():
+        module = callback.__module__.removeprefix("src.handlers.")
+        update.handler = f"{module}.{callback.__name__}"
+
+
+def track_update(coro):
+    @wraps(coro)
+    async def inner(*args, **kwargs):
+        update = UpdateMetrics(handler=coro.__name__)
+        token = CTX_UPDATE.set(update)
+        started = perf_counter()
+
+        try:
+            return await coro(*args, **kwargs)
+        finally:
+            CTX_UPDATE.reset(token)
+
+            Metrics.increment(f"updates:{update.handler}")
+            Metrics.observe(f"update.latency:{update.handler}", _ms(started))
+            Metrics.observe(
+                f"update.db_statements:{update.handler}",
+                update.statements,
+                buckets=COUNT_BUCKETS,
+            )
+            Metrics.observe(
+                f"update.db_time:{update.handler}", update.db_time
+            )
+            Metrics.observe(
+                f"update.telegram_calls:{update.handler}",
+                update.telegram_calls,
+                buckets=COUNT_BUCKETS,
+            )
+            Metrics.observe(
+                f"update.telegram_time:{update.handler}", update.telegram_time
+            )
+
+    return inner
+
+
+@contextmanager
+def telegram_call(method: str) -> Generator[None, None, None]:
+    started = perf_counter()
+
+    try:
+        yield
+    finally:
+        duration = _ms(started)
+        Metrics.increment(f"telegram.calls:{method}")
+        Metrics.observe(f"telegram.latency:{method}", duration)
+
+        if update := CTX_UPDATE.get():
+            update.telegram_calls += 1
+            update.telegram_time += duration
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, *_):
+    context.metrics_started = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, *_):
+    duration = _ms(context.metrics_started)
+    Metrics.increment("db.statements")
+    Metrics.observe("db.latency", duration)
+
+    if update := CTX_UPDATE.get():
+        update.statements += 1
+        update.db_time += duration
+
+
+def instrument_engine(engine: AsyncEngine) -> AsyncEngine:
+    event.listen(
+        engine.sync_engine, "before_cursor_execute", _before_cursor_execute
+    )
+    event.listen(
+        engine.sync_engine, "after_cursor_execute", _after_cursor_execute
+    )
+
+    return engine
@@ -0,0 +1,88 @@
+"""
+This module includes models of the keyset pagination
+of the ledger in the (date, id) order.
+
+The cursor is the edge row of the current page, so the page is fetched
+by the index range instead of skipping rows by the offset,
+and rows which are added or deleted meanwhile do not shift pages.
+"""
+
+from datetime import date, datetime
+from typing import Any
+
+from src.infrastructure.errors import ValidationError
+from src.infrastructure.models import InternalModel
+
+__all__ = ("Cursor", "Page", "PAGE_SIZE")
+
+PAGE_SIZE = 20
+
+_CURSOR_DATE_FORMAT = "%Y%m%d"
+
+
+class Cursor(InternalModel):
+    """The edge of the page. The backward cursor points
+    to the first row of the page and the forward one to the last.
+    """
+
+    date: date
+    id: int
+    backward: bool = False
+
+    def encode(self) -> str:
+        """The compact form for the callback data (up to 64 bytes)."""
+
+        direction = "<" if self.backward else ">"
+        return f"{direction}{self.date.strftime(_CURSOR_DATE_FORMAT)}{self.id}"
+
+    @classmethod
+    def decode(cls, payload: str) -> "Cursor":
+        try:
+            return cls(
+                date=datetime.strptime(
+                    payload[1:9], _CURSOR_DATE_FORMAT
+                ).date(),
+                id=int(payload[9:]),
+                backward=payload[0] == "<",
+            )
+        except (ValueError, IndexError):
+            raise ValidationError(f"Unknown cursor {payload}")
+
+
+class Page(InternalModel):
+    items: list[Any]
+    previous: Cursor | None = None
+    next: Cursor | None = None
+
+    @classmethod
+    def build(cls, rows: list, cursor: Cursor | None, size: int) -> "Page":
+        """Build the page from rows which are fetched in the direction
+        of the cursor. The extra row (size + 1) tells that there is
+        the page further in that direction.
+        """
+
+        more = len(rows) > size
+        items = list(rows[:size])
+        backward = cursor is not None and cursor.backward
+
+        if backward:
+            items.reverse()
+
+        if not items:
+            return cls(items=[])
+
+        # NOTE: The page opposite to the direction is the one
+        #       which the cursor comes from
+        has_previous = more if backward else cursor is not None
+        has_next = cursor is not None if backward else more
+        first, last = items[0], items[-1]
+
+        return cls(
+            items=items,
+            previous=(
+                Cursor(date=first.date, id=first.id, backward=True)
+                if has_previous
+                else None
+            ),
+            next=Cursor(date=last.date, id=last.id) if has_next else None,
+        )
@@ -0,0 +1,251 @@
+"""
+This module includes the opt-in database profiler.
+It is attached to the engine when `DATABASE_PROFILING` is enabled and:
+    - logs statements slower than `DATABASE_SLOW_QUERY_MS`
+      with their parameters and the `EXPLAIN` plan
+    - flags statements with the same shape that are repeated
+      within a single update as N+1 suspects
+
+`Profiler.report()` returns the collected data which could be
+dumped to JSON and checked by `python -m src.benchmarks.queries`.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from time import perf_counter
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.infrastructure.metrics import CTX_UPDATE
+from src.infrastructure.models import InternalModel
+from src.settings import (
+    DATABASE_EXPLAIN_SLOW_QUERIES,
+    DATABASE_N_PLUS_ONE_THRESHOLD,
+    DATABASE_SLOW_QUERY_MS,
+)
+
+__all__ = (
+    "SlowQuery",
+    "NPlusOneSuspect",
+    "ProfilingReport",
+    "Profiler",
+    "statement_shape",
+)
+
+SLOW_QUERIES_LIMIT = 100
+PARAMETER_MAX_LEN = 100
+
+_PLACEHOLDERS = re.compile(r"\$\d+(::[A-Z]+)?|%\(\w+\)s|\?")
+_PLACEHOLDERS_LIST = re.compile(r"\?(\s*,\s*\?)+")
+_NUMBERS = re.compile(r"\b\d+\b")
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_SPACES = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+class SlowQuery(InternalModel):
+    handler: str | None
+    statement: str
+    parameters: str
+    duration: float
+    plan: str | None = None
+
+
+class NPlusOneSuspect(InternalModel):
+    handler: str
+    shape: str
+    repeats: int
+    updates: int = 1
+
+
+class ProfilingReport(InternalModel):
+    statements: int
+    slow_queries: list[SlowQuery]
+    n_plus_one: list[NPlusOneSuspect]
+
+    def represent(self) -> str:
+        lines = [
+            f"Statements: {self.statements}",
+            f"Slow queries: {len(self.slow_queries)}",
+        ]
+        lines += [
+            f"  {query.duration:.2f}ms [{query.handler}] {query.statement}"
+            for query in self.slow_queries
+        ]
+        lines.append(f"N+1 suspects: {len(self.n_plus_one)}")
+        lines += [
+            f"  x{suspect.repeats} in {suspect.updates} update(s) "
+            f"[{suspect.handler}] {suspect.shape}"
+            for suspect in self.n_plus_one
+        ]
+
+        return "\n".join(lines)
+
+    def dump(self, path: Path) -> None:
+        path.write_text(self.model_dump_json(indent=2))
+
+
+@lru_cache(maxsize=1024)
+def statement_shape(statement: str) -> str:
+    """Return the statement without literals and parameters.
+    Statements with the same shape differ only by their values.
+    """
+
+    shape = _STRINGS.sub("?", statement)
+    shape = _PLACEHOLDERS.sub("?", shape)
+    shape = _NUMBERS.sub("?", shape)
+    shape = _PLACEHOLDERS_LIST.sub("?, ...", shape)
+
+    return _SPACES.sub(" ", shape).strip()
+
+
+def _represent_parameters(parameters) -> str:
+    result = repr(parameters)
+
+    if len(result) > PARAMETER_MAX_LEN:
+        return result[:PARAMETER_MAX_LEN] + "..."
+
+    return result
+
+
+def _explain(connection, statement: str, parameters) -> str | None:
+    """Get the plan using a separate cursor of the same connection.
+    The savepoint keeps the transaction usable if `EXPLAIN` fails.
+    """
+
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+
+    cursor = connection.connection.cursor()
+
+    try:
+        cursor.execute("SAVEPOINT profiler_explain")
+        try:
+            cursor.execute(f"EXPLAIN {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception as error:
+            cursor.execute("ROLLBACK TO SAVEPOINT profiler_explain")
+            plan = f"EXPLAIN failed: {error}"
+        cursor.execute("RELEASE SAVEPOINT profiler_explain")
+    except Exception as error:
+        return f"EXPLAIN failed: {error}"
+    finally:
+        cursor.close()
+
+    return plan
+
+
+class Profiler:
+    """The profiler state is shared between all engines."""
+
+    _STATEMENTS: int = 0
+    _SLOW_QUERIES: list[SlowQuery] = []
+    _SUSPECTS: dict[tuple[str, str], NPlusOneSuspect] = {}
+
+    slow_query_ms: float = DATABASE_SLOW_QUERY_MS
+    n_plus_one_threshold: int = DATABASE_N_PLUS_ONE_THRESHOLD
+    explain: bool = DATABASE_EXPLAIN_SLOW_QUERIES
+
+    @classmethod
+    def instrument(cls, engine: AsyncEngine) -> AsyncEngine:
+        event.listen(
+            engine.sync_engine, "before_cursor_execute", cls._before_execute
+        )
+        event.listen(
+            engine.sync_engine, "after_cursor_execute", cls._after_execute
+        )
+
+        return engine
+
+    @staticmethod
+    def _before_execute(conn, cursor, statement, parameters, context, *_):
+        context.profiler_started = perf_counter()
+
+    @classmethod
+    def _after_execute(cls, conn, cursor, statement, parameters, context, *_):
+        duration = (perf_counter() - context.profiler_started) * 1000
+        update = CTX_UPDATE.get()
+        cls._STATEMENTS += 1
+
+        if update is not None:
+            cls._count_shape(update, statement_shape(statement))
+
+        if duration >= cls.slow_query_ms:
+            cls._slow_query(
+                conn,
+                statement,
+                parameters,
+                duration,
+                handler=update.handler if update else None,
+            )
+
+    @classmethod
+    def _count_shape(cls, update, shape: str) -> None:
+        if update.shapes is None:
+            update.shapes = {}
+
+        repeats = update.shapes[shape] = update.shapes.get(shape, 0) + 1
+
+        if repeats < cls.n_plus_one_threshold:
+            return
+
+        key = (update.handler, shape)
+
+        if not (suspect := cls._SUSPECTS.get(key)):
+            cls._SUSPECTS[key] = NPlusOneSuspect(
+                handler=update.handler, shape=shape, repeats=repeats
+            )
+            logger.warning(
+                f"N+1 suspect in {update.handler}: x{repeats} {shape}"
+            )
+        elif repeats == cls.n_plus_one_threshold:
+            suspect.updates += 1
+        else:
+            suspect.repeats = max(suspect.repeats, repeats)
+
+    @classmethod
+    def _slow_query(
+        cls,
+        conn,
+        statement: str,
+        parameters,
+        duration: float,
+        handler: str | None,
+    ) -> None:
+        query = SlowQuery(
+            handler=handler,
+            statement=_SPACES.sub(" ", statement).strip(),
+            parameters=_represent_parameters(parameters),
+            duration=duration,
+            plan=(
+                _explain(conn, statement, parameters) if cls.explain else None
+            ),
+        )
+        logger.warning(
+            f"Slow query {duration:.2f}ms [{handler}]: {query.statement} "
+            f"{query.parameters}\n{query.plan or ''}"
+        )
+
+        if len(cls._SLOW_QUERIES) < SLOW_QUERIES_LIMIT:
+            cls._SLOW_QUERIES.append(query)
+
+    @classmethod
+    def report(cls) -> ProfilingReport:
+        return ProfilingReport(
+            statements=cls._STATEMENTS,
+            slow_queries=sorted(
+                cls._SLOW_QUERIES, key=lambda q: q.duration, reverse=True
+            ),
+            n_plus_one=sorted(
+                cls._SUSPECTS.values(), key=lambda s: s.repeats, reverse=True
+            ),
+        )
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._STATEMENTS = 0
+        cls._SLOW_QUERIES.clear()
+        cls._SUSPECTS.clear()
@@ -7,6 +7,10 @@ from telebot.async_telebot import AsyncTeleBot
 
 from src.settings import SRC_FOLDER, TELEGRAM_BOT_API_KEY
 
+__all__ = ("create_bot", "get_bot", "set_bot", "import_handlers")
+
+_bot: AsyncTeleBot | None = None
+
 
 def create_bot():
     if not TELEGRAM_BOT_API_KEY:
@@ -15,6 +19,22 @@ def create_bot():
     return AsyncTeleBot(token=TELEGRAM_BOT_API_KEY)
 
 
+def get_bot() -> AsyncTeleBot:
+    """The bot is created on the first use instead of the import time."""
+
+    global _bot
+
+    if _bot is None:
+        _bot = create_bot()
+
+    return _bot
+
+
+def set_bot(bot: AsyncTeleBot | None) -> None:
+    global _bot
+    _bot = bot
+
+
 def import_handlers():
     handlers_dir = SRC_FOLDER / "handlers"
 
@@ -23,6 +43,3 @@ def import_handlers():
         with suppress(ModuleNotFoundError, AttributeError):
             logger.success(f"{app_name} handler is loaded")
             import_module(f"src.handlers.{app_name}")
-
-
-bot: AsyncTeleBot = create_bot()
@@ -1,21 +1,126 @@
+from functools import cache
+
 from telebot import types
 
-from src.keyboards.constants import Commands, Menu
+from src.domain.analytics import (
+    COMPARISON_MONTHS,
+    ComparisonCallbackOperation,
+    LevelOption,
+)
+from src.domain.incomes import AddIncomeCallbackOperation
+from src.keyboards.constants import (
+    ANALYTICS_BASIC_OPTIONS_KEYBOARD_ELEMENTS,
+    ANALYTICS_DETAILED_OPTIONS_KEYBOARD_ELEMENTS,
+    INCOME_SOURCES_KEYBOARD_ELEMENTS,
+    Commands,
+    ConfirmationOption,
+    Menu,
+)
+from src.keyboards.models import CallbackItem, SerializedReplyKeyboardMarkup
+from src.keyboards.patterns import callback_patterns_keyboard
+
+# NOTE: Keyboards below are static, so they are built and serialized once.
+#       The returned instances are shared and must not be mutated.
 
 
+@cache
 def restart_keyboard() -> types.ReplyKeyboardMarkup:
-    markup = types.ReplyKeyboardMarkup(resize_keyboard=True)
+    markup = SerializedReplyKeyboardMarkup(resize_keyboard=True)
     markup.row(Commands.RESTART)
 
     return markup
 
 
+@cache
 def default_keyboard() -> types.ReplyKeyboardMarkup:
 
-    markup = types.ReplyKeyboardMarkup(resize_keyboard=True)
+    markup = SerializedReplyKeyboardMarkup(resize_keyboard=True)
     markup.row(Menu.DELETE_COST, Menu.ADD_COST)
     markup.row(Menu.ANALYTICS, Menu.EQUITY)
     markup.row(Menu.INCOMES, Menu.EXCHANGE)
     markup.row(Menu.CONFIGURATIONS)
 
     return markup
+
+
+@cache
+def confirmation_keyboard(
+    no_callback_data: str, yes_callback_data: str
+) -> types.InlineKeyboardMarkup:
+
+    return callback_patterns_keyboard(
+        [
+            CallbackItem(
+                name=ConfirmationOption.NO, callback_data=no_callback_data
+            ),
+            CallbackItem(
+                name=ConfirmationOption.YES, callback_data=yes_callback_data
+            ),
+        ]
+    )
+
+
+@cache
+def analytics_level_keyboard() -> types.InlineKeyboardMarkup:
+
+    return callback_patterns_keyboard(
+        [
+            CallbackItem(
+                name="Подробный",
+                callback_data=LevelOption.SELECT_DETAILED_LEVEL,
+            ),
+            CallbackItem(
+                name="Обычный",
+                callback_data=LevelOption.SELECT_BASIC_LEVEL,
+            ),
+        ]
+    )
+
+
+@cache
+def analytics_basic_options_keyboard() -> types.InlineKeyboardMarkup:
+
+    return callback_patterns_keyboard(
+        ANALYTICS_BASIC_OPTIONS_KEYBOARD_ELEMENTS
+    )
+
+
+@cache
+def analytics_detailed_options_keyboard() -> types.InlineKeyboardMarkup:
+
+    return callback_patterns_keyboard(
+        ANALYTICS_DETAILED_OPTIONS_KEYBOARD_ELEMENTS
+    )
+
+
+@cache
+def analytics_comparison_keyboard() -> types.InlineKeyboardMarkup:
+
+    return callback_patterns_keyboard(
+        [
+            CallbackItem(
+                name=f"{months} мес.",
+                callback_data=(
+                    f"{ComparisonCallbackOperation.SELECT_MONTHS}{months}"
+                ),
+            )
+            for months in COMPARISON_MONTHS
+        ]
+    )
+
+
+@cache
+def income_sources_keyboard() -> types.InlineKeyboardMarkup:
+
+    return callback_patterns_keyboard(
+        [
+            CallbackItem(
+                name=callback_item.name,
+                callback_data=(
+                    f"{AddIncomeCallbackOperation.SELECT_SOURCE}"
+                    f"{callback_item.callback_data}"
+                ),
+            )
+            for callback_item in INCOME_SOURCES_KEYBOARD_ELEMENTS
+        ]
+    )
@@ -1,6 +1,7 @@
 from uuid import uuid4
 
 from pydantic import Field
+from telebot import types
 
 from src.infrastructure.models import InternalModel
 
@@ -9,3 +10,31 @@ class CallbackItem(InternalModel):
 
     name: str
     callback_data: str = Field(default_factory=lambda: str(uuid4()))
+
+
+class _SerializedMarkup:
+    """Serialize the markup once and reuse the JSON for every send.
+
+    Markups are treated as frozen after they are built, so the keyboard
+    factories must not mutate an instance that was already serialized.
+    """
+
+    _json: str | None = None
+
+    def to_json(self) -> str:
+        if self._json is None:
+            self._json = super().to_json()  # type: ignore
+
+        return self._json
+
+
+class SerializedReplyKeyboardMarkup(
+    _SerializedMarkup, types.ReplyKeyboardMarkup
+):
+    pass
+
+
+class SerializedInlineKeyboardMarkup(
+    _SerializedMarkup, types.InlineKeyboardMarkup
+):
+    pass
@@ -1,7 +1,10 @@
 from telebot import types
 
+from src.infrastructure.cache import Cache
+from src.infrastructure.errors import NotFound
+from src.infrastructure.pagination import Page
 from src.infrastructure.utils import list_by_chunks
-from src.keyboards.models import CallbackItem
+from src.keyboards.models import CallbackItem, SerializedInlineKeyboardMarkup
 
 
 def patterns_keyboard(
@@ -32,4 +35,52 @@ def callback_patterns_keyboard(
         for chunk in list_by_chunks(patterns, size=width)
     ]
 
-    return types.InlineKeyboardMarkup(keyboard)
+    return SerializedInlineKeyboardMarkup(keyboard)
+
+
+def cached_callback_patterns_keyboard(
+    patterns: list[CallbackItem], namespace: str, width: int = 2
+) -> types.InlineKeyboardMarkup:
+    """Return the keyboard built from the reference data (categories,
+    currencies) that is cached by its content under the given namespace.
+
+    The namespace is invalidated by the repository that owns the data.
+    """
+
+    key = hash(
+        (width, *((item.name, item.callback_data) for item in patterns))
+    )
+
+    try:
+        return Cache.get(namespace, key)
+    except NotFound:
+        markup = callback_patterns_keyboard(patterns, width=width)
+        Cache.set(namespace=namespace, key=key, instance=markup)
+
+    return markup
+
+
+def paginated_callback_patterns_keyboard(
+    patterns: list[CallbackItem],
+    page: Page,
+    page_operation: str,
+    width: int = 2,
+) -> types.InlineKeyboardMarkup:
+    """Return the keyboard of the page with buttons to previous
+    and next pages. Cursors are passed in the callback data
+    after the page operation.
+    """
+
+    keyboard = callback_patterns_keyboard(patterns, width=width)
+    navigation = [
+        types.InlineKeyboardButton(
+            text=text, callback_data=f"{page_operation}{cursor.encode()}"
+        )
+        for text, cursor in (("⬅️", page.previous), ("➡️", page.next))
+        if cursor is not None
+    ]
+
+    if navigation:
+        keyboard.row(*navigation)
+
+    return keyboard
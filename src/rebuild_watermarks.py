@@ -0,0 +1,40 @@
+"""
+Recompute dates watermarks of the ledger from its tables.
+
+Watermarks are maintained by ledger services, so the rebuild
+is needed only after writes which bypass them (manual SQL, restores).
+
+Usage:
+    python -m src.rebuild_watermarks
+"""
+
+import asyncio
+
+from src.application.database import transaction
+from src.domain.dates import LedgerTable, LedgerWatermark
+from src.domain.dates import services as dates_services
+from src.infrastructure.database.services.session import get_engine
+
+
+@transaction
+async def rebuild() -> dict[LedgerTable, LedgerWatermark]:
+    return await dates_services.rebuild_ledger_watermarks()
+
+
+async def run() -> None:
+    watermarks = await rebuild()
+    await get_engine().dispose()
+
+    if watermarks is None:
+        print("FAILED: changes are rolled back, see the log")
+        return
+
+    for table in LedgerTable:
+        if watermark := watermarks.get(table):
+            print(f"{table}: {watermark.first_date} - {watermark.last_date}")
+        else:
+            print(f"{table}: empty")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
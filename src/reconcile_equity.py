@@ -0,0 +1,62 @@
+"""
+Reconcile equity movements with the ledger and snapshots with movements.
+
+Only rows which are added since the previous run are checked (ids are
+kept by checkpoints), so the job is cheap enough to be run every few
+minutes, e.g. by cron. Without `--repair` discrepancies are reported
+and reported again by next runs until they are repaired.
+
+Usage:
+    python -m src.reconcile_equity [--repair] [--full]
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+
+from src.application.database import transaction
+from src.domain.reconciliation import ReconciliationCRUD, ReconciliationReport
+from src.domain.reconciliation import services as reconciliation_services
+from src.infrastructure.database.services.session import get_engine
+
+
+@transaction
+async def reconcile(repair: bool, full: bool) -> ReconciliationReport:
+    if full:
+        await ReconciliationCRUD().reset_checkpoints()
+
+    return await reconciliation_services.reconcile(repair=repair)
+
+
+async def run(repair: bool, full: bool) -> None:
+    started = perf_counter()
+    report = await reconcile(repair, full)
+    await get_engine().dispose()
+
+    if report is None:
+        print("FAILED: changes are rolled back, see the log")
+        return
+
+    print(report.repr())
+    print(f"Done in {perf_counter() - started:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--repair",
+        action="store_true",
+        help="append missing movements and delete broken snapshots",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="reset checkpoints and check everything",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(run(args.repair, args.full))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,17 @@
 import asyncio
+from pathlib import Path
 
 from loguru import logger
 
-from src.handlers import *  # noqa: F401, F403
-from src.infrastructure.database.services import create_categories_if_not_exist
-from src.infrastructure.telegram import bot
+from src.application.startup import startup
+from src.infrastructure.profiling import Profiler
+from src.settings import DATABASE_PROFILING, DATABASE_PROFILING_REPORT
 
 logger.add("fbb.log", rotation="50 MB")
 
+
 async def start_bot_loop():
+    bot = await startup()
     logger.info("Bot started 🚀")
 
     while True:
@@ -18,6 +21,15 @@ async def start_bot_loop():
             logger.error(err)
             logger.error("🔴 Bot is down.\nRestarting...")
 
-asyncio.run(start_bot_loop())
 
-asyncio.run(create_categories_if_not_exist())
+def dump_profiling_report() -> None:
+    if DATABASE_PROFILING and DATABASE_PROFILING_REPORT:
+        Profiler.report().dump(Path(DATABASE_PROFILING_REPORT))
+        logger.info(f"Profiling report saved to {DATABASE_PROFILING_REPORT}")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(start_bot_loop())
+    finally:
+        dump_profiling_report()
@@ -9,6 +9,19 @@ SRC_FOLDER = Path(__file__).parent
 ROOT_FOLDER = SRC_FOLDER.parent
 
 DATABASE_NAME = getenv("DATABASE_NAME", default="postgres")
+DATABASE_POOL_SIZE = int(getenv("DATABASE_POOL_SIZE", default="5"))
+DATABASE_READINESS_TIMEOUT = float(
+    getenv("DATABASE_READINESS_TIMEOUT", default="30")
+)
+DATABASE_PROFILING: bool = getenv("DATABASE_PROFILING", "False") == "True"
+DATABASE_PROFILING_REPORT: str = getenv("DATABASE_PROFILING_REPORT", "")
+DATABASE_SLOW_QUERY_MS = float(getenv("DATABASE_SLOW_QUERY_MS", "100"))
+DATABASE_EXPLAIN_SLOW_QUERIES: bool = (
+    getenv("DATABASE_EXPLAIN_SLOW_QUERIES", "True") == "True"
+)
+DATABASE_N_PLUS_ONE_THRESHOLD = int(
+    getenv("DATABASE_N_PLUS_ONE_THRESHOLD", "3")
+)
 DATABASE_URL = f"postgresql+asyncpg://{getenv('DB_USER', 'postgres')}:{getenv('DB_PASSWORD', 'postgres')}@{getenv('DB_HOST', 'postgres')}:{getenv('DB_PORT', '5432')}/{getenv('DATABASE_NAME', 'family_budget')}"
 
 CACHE_TTL: timedelta = timedelta(
@@ -24,3 +37,9 @@ USERS_WHITE_LIST: list[int] = [
 
 TELEGRAM_BOT_API_KEY: str | None = getenv("TELEGRAM_BOT_API_KEY")
 TELEGRAM_MESSAGE_MAX_LEN = 4096
+# Detailed reports with more lines (entries) are sent as a single document.
+# The empty value or 0 disables documents
+TELEGRAM_REPORT_DOCUMENT_MAX_LINES: int | None = (
+    int(getenv("TELEGRAM_REPORT_DOCUMENT_MAX_LINES", default="200") or "0")
+    or None
+)
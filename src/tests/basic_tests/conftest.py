@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_FOLDER = Path(__file__).parents[3]
+
+if str(ROOT_FOLDER) not in sys.path:
+    sys.path.insert(0, str(ROOT_FOLDER))
+
+
+class FakeBot:
+    """Collects the Telegram API calls instead of sending them."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, dict]] = []
+
+    async def send_message(self, **kwargs):
+        from telebot import types
+
+        self.calls.append(("send_message", kwargs))
+        return types.Message(
+            message_id=len(self.calls),
+            from_user=None,
+            date=0,
+            chat=types.Chat(id=kwargs["chat_id"], type="private"),
+            content_type="text",
+            options={"text": kwargs["text"]},
+            json_string="",
+        )
+
+    async def send_document(self, **kwargs):
+        self.calls.append(("send_document", kwargs))
+
+    async def edit_message_text(self, **kwargs):
+        self.calls.append(("edit_message_text", kwargs))
+
+    async def delete_message(self, **kwargs):
+        self.calls.append(("delete_message", kwargs))
+
+
+@pytest.fixture
+def fake_bot():
+    from src.infrastructure.telegram import set_bot
+
+    bot = FakeBot()
+    set_bot(bot)
+    yield bot
+    set_bot(None)
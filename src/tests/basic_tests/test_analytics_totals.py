@@ -0,0 +1,124 @@
+import asyncio
+from collections import defaultdict
+from datetime import date
+
+import pytest
+
+from src.benchmarks.micro import yearly_dataset
+from src.domain.analytics import (
+    ANALYTICS_CACHE_MAX_ENTRIES,
+    AnalyticsCRUD,
+    AnalyticsTotals,
+)
+from src.domain.analytics import services as analytics_services
+from src.infrastructure.cache import Cache
+from src.infrastructure.errors import NotFound
+
+
+@pytest.fixture(autouse=True)
+def analytics_cache():
+    Cache.invalidate(AnalyticsCRUD.CACHE_NAMESPACE)
+    yield
+    Cache.invalidate(AnalyticsCRUD.CACHE_NAMESPACE)
+
+
+def _sums(items, key, value) -> dict:
+    sums: defaultdict = defaultdict(int)
+    for item in items:
+        sums[key(item)] += value(item)
+
+    return dict(sums)
+
+
+def test_views_match_the_rows_aggregation():
+    dataset = yearly_dataset(users=3)
+    totals = AnalyticsTotals.from_result(dataset.analytics, daily=True)
+    users = {cost.user_id for cost in dataset.analytics.costs}
+
+    assert len(users) == 3
+    assert totals.by_user(None) is totals
+
+    for user in (None, *users):
+        rows = dataset.analytics.by_user(user)
+        view = totals.by_user(user)
+
+        assert _sums(
+            view.costs,
+            lambda total: (total.currency_id, total.category_name),
+            lambda total: total.value,
+        ) == _sums(
+            rows.costs,
+            lambda cost: (cost.currency.id, cost.category.name),
+            lambda cost: cost.value,
+        )
+        assert _sums(
+            view.incomes,
+            lambda total: (total.currency_id, total.source),
+            lambda total: total.value,
+        ) == _sums(
+            rows.incomes,
+            lambda income: (income.currency.id, income.source),
+            lambda income: income.value,
+        )
+        assert _sums(
+            view.currency_exchanges,
+            lambda total: total.source_currency_id,
+            lambda total: total.source_value,
+        ) == _sums(
+            rows.currency_exchanges,
+            lambda exchange: exchange.source_currency.id,
+            lambda exchange: exchange.source_value,
+        )
+        assert _sums(
+            view.costs_daily,
+            lambda total: (total.currency_id, total.date),
+            lambda total: total.value,
+        ) == _sums(
+            rows.costs,
+            lambda cost: (cost.currency.id, cost.date),
+            lambda cost: cost.value,
+        )
+
+
+def test_read_before_the_commit_is_not_cached(monkeypatch):
+    races = [True]
+
+    async def costs_totals(self, start, end):
+        # The ledger change of another update is committed meanwhile
+        if races:
+            races.pop()
+            AnalyticsCRUD.invalidate(user_id=1)
+        return []
+
+    async def empty(self, start, end):
+        return []
+
+    monkeypatch.setattr(AnalyticsCRUD, "costs_totals", costs_totals)
+    for name in ("incomes_totals", "currency_exchanges_totals"):
+        monkeypatch.setattr(AnalyticsCRUD, name, empty)
+
+    start, end = date(2025, 1, 1), date(2025, 1, 31)
+    key = f"totals:{start}:{end}"
+
+    asyncio.run(analytics_services._get_analytics_totals(start, end))
+    with pytest.raises(NotFound):
+        Cache.get(AnalyticsCRUD.CACHE_NAMESPACE, key)
+
+    asyncio.run(analytics_services._get_analytics_totals(start, end))
+    assert Cache.get(AnalyticsCRUD.CACHE_NAMESPACE, key)
+
+
+def test_analytics_cache_is_bounded():
+    generation = AnalyticsCRUD.generation()
+
+    for number in range(ANALYTICS_CACHE_MAX_ENTRIES + 10):
+        AnalyticsCRUD.cache(f"key:{number}", number, generation)
+
+    prefix = f"{AnalyticsCRUD.CACHE_NAMESPACE}:"
+    assert (
+        len([key for key in Cache._DATA if key.startswith(prefix)])
+        == ANALYTICS_CACHE_MAX_ENTRIES
+    )
+    assert Cache.get(AnalyticsCRUD.CACHE_NAMESPACE, f"key:{number}") == number
+    with pytest.raises(NotFound):
+        Cache.get(AnalyticsCRUD.CACHE_NAMESPACE, "key:0")
@@ -0,0 +1,154 @@
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from telebot import types
+
+from src.application.errors import base_error_handler
+from src.application.messages import CallbackQueryContract, MessageContract
+from src.application.states import State
+from src.domain.budgets import BudgetInDB, BudgetsCRUD
+from src.domain.budgets import services as budgets_services
+from src.domain.categories import CategoriesCRUD, CategoryInDB
+from src.domain.configurations import ConfigurationUpdateOption
+from src.domain.costs import Cost
+from src.domain.money import CurrenciesCRUD, CurrencyInDB
+from src.domain.users import User
+from src.handlers.configurations import (
+    budget_category_selected_callback,
+    budget_value_entered_callback,
+)
+from src.infrastructure.cache import Cache
+
+USD = CurrencyInDB(id=1, name="USD", sign="$")
+EUR = CurrencyInDB(id=3, name="EUR", sign="€")
+FOOD = CategoryInDB(id=1, name="Еда")
+
+
+def _cost(value: int, currency: CurrencyInDB = USD) -> Cost:
+    return Cost(
+        id=1,
+        name="Кофе",
+        value=value,
+        date=date(2023, 4, 10),
+        user_id=1,
+        category=FOOD,
+        currency=currency,
+    )
+
+
+def _check(cost: Cost, total: int):
+    return asyncio.run(budgets_services.check(cost, total))
+
+
+@pytest.fixture
+def budget():
+    Cache.set(
+        BudgetsCRUD.CACHE_NAMESPACE,
+        1,
+        {
+            FOOD.id: BudgetInDB(
+                id=1,
+                value=10000,
+                configuration_id=1,
+                category_id=FOOD.id,
+                currency_id=USD.id,
+            )
+        },
+    )
+
+    yield
+
+    Cache.invalidate(BudgetsCRUD.CACHE_NAMESPACE)
+
+
+def test_alert_on_crossing_thresholds(budget):
+    assert _check(_cost(1000), total=7000) is None
+
+    alert = _check(_cost(1000), total=8000)
+    assert alert and alert.threshold == 80
+    assert "80%" in alert.repr()
+
+    assert _check(_cost(1000), total=9000) is None
+
+    alert = _check(_cost(3000), total=11000)
+    assert alert and alert.threshold == 100
+    assert "110.00$ из 100.00$" in alert.repr()
+
+    assert _check(_cost(1000), total=12000) is None
+
+
+def test_other_currency_is_not_checked(budget):
+    assert _check(_cost(9000, EUR), total=9000) is None
+
+
+def _message(text: str) -> types.Message:
+    return types.Message(
+        message_id=1,
+        from_user=None,
+        date=0,
+        chat=types.Chat(id=1, type="private"),
+        content_type="text",
+        options={"text": text},
+        json_string="",
+    )
+
+
+def _user(default_currency: CurrencyInDB) -> User:
+    return User.construct(
+        id=1,
+        chat_id=1,
+        configuration=SimpleNamespace(
+            id=1, default_currency=default_currency
+        ),
+    )
+
+
+def test_invalid_limit_is_replied(fake_bot):
+    state = State(user_id=-1)
+    state.data.category = FOOD
+
+    @base_error_handler
+    async def handler(m: types.Message):
+        return await budget_value_entered_callback(
+            MessageContract(m=m, state=state, user=_user(USD))
+        )
+
+    asyncio.run(handler(_message("много")))
+
+    [(method, kwargs)] = fake_bot.calls
+    assert method == "send_message"
+    assert kwargs["text"] == "⚠️ Значение должно быть корректным значением"
+
+
+def test_limit_in_other_currency_is_shown(budget, fake_bot, monkeypatch):
+    async def get_category(self, id_):
+        return FOOD
+
+    async def get_currency(self, id_):
+        return USD
+
+    monkeypatch.setattr(CategoriesCRUD, "get", get_category)
+    monkeypatch.setattr(CurrenciesCRUD, "get", get_currency)
+    query = types.CallbackQuery(
+        id="1",
+        from_user=None,
+        data=f"{ConfigurationUpdateOption.SELECT_BUDGET_CATEGORY}{FOOD.id}",
+        chat_instance="",
+        json_string="",
+        message=_message(""),
+    )
+
+    asyncio.run(
+        budget_category_selected_callback(
+            CallbackQueryContract(
+                q=query, state=State(user_id=-1), user=_user(EUR)
+            )
+        )
+    )
+
+    [(method, kwargs)] = fake_bot.calls
+    assert method == "edit_message_text"
+    assert "Текущий лимит 👉 100.00$" in kwargs["text"]
+    assert "расходы в € не учитываются" in kwargs["text"]
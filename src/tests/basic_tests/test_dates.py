@@ -0,0 +1,87 @@
+import asyncio
+from datetime import date
+
+from src.domain.dates import (
+    DateFormat,
+    DatesCRUD,
+    LedgerTable,
+    LedgerWatermark,
+)
+from src.domain.dates import services as dates_services
+from src.infrastructure.cache import Cache
+
+
+def test_represent_dates_range_keeps_first_month():
+    months = list(
+        dates_services.represent_dates_range(
+            date(2021, 10, 31), date(2022, 1, 5), DateFormat.MONTHLY
+        )
+    )
+
+    assert months == ["2022-01", "2021-12", "2021-11", "2021-10"]
+
+
+def test_add_months_updates_cached_index():
+    namespace = dates_services._months_namespace(LedgerTable.COSTS)
+    Cache.set(namespace, None, [date(2024, 1, 1)])
+
+    dates_services._add_months(
+        LedgerTable.COSTS, 1, {date(2023, 12, 1), date(2024, 1, 1)}
+    )
+
+    assert Cache.get(namespace, None) == [date(2023, 12, 1), date(2024, 1, 1)]
+    Cache.invalidate(namespace)
+
+
+def test_watermarks_are_extended_beyond_cached_bounds(monkeypatch):
+    extended = []
+
+    async def extend(_, table, first_date, last_date):
+        extended.append((table, first_date, last_date))
+
+    monkeypatch.setattr(DatesCRUD, "extend", extend)
+    monkeypatch.setattr(dates_services, "_invalidate_watermarks", list)
+    Cache.set(
+        DatesCRUD.WATERMARKS_CACHE_NAMESPACE,
+        "all",
+        {
+            LedgerTable.COSTS: LedgerWatermark(
+                ledger=LedgerTable.COSTS,
+                first_date=date(2024, 1, 1),
+                last_date=date(2024, 6, 30),
+            ),
+            LedgerTable.INCOMES: LedgerWatermark(
+                ledger=LedgerTable.INCOMES,
+                first_date=date(2023, 12, 1),
+                last_date=date(2024, 5, 31),
+            ),
+        },
+    )
+
+    for table, dates in (
+        (LedgerTable.COSTS, [date(2024, 3, 1), date(2024, 6, 30)]),
+        (LedgerTable.COSTS, [date(2024, 7, 1), date(2024, 3, 1)]),
+        (LedgerTable.CURRENCY_EXCHANGE, [date(2024, 2, 1)]),
+    ):
+        asyncio.run(dates_services.extend_ledger_watermarks(table, dates))
+
+    assert extended == [
+        (LedgerTable.COSTS, date(2024, 3, 1), date(2024, 7, 1)),
+        (LedgerTable.CURRENCY_EXCHANGE, date(2024, 2, 1), date(2024, 2, 1)),
+    ]
+    assert asyncio.run(DatesCRUD().first()) == date(2023, 12, 1)
+    assert asyncio.run(DatesCRUD().last()) == date(2024, 6, 30)
+    Cache.invalidate(DatesCRUD.WATERMARKS_CACHE_NAMESPACE)
+
+
+def test_parse_day_of_the_current_leap_year(monkeypatch):
+    class LeapDate(date):
+        @classmethod
+        def today(cls):
+            return cls(2028, 3, 1)
+
+    monkeypatch.setattr(dates_services, "date", LeapDate)
+
+    assert dates_services.parse_date("29.02") == date(2028, 2, 29)
+    assert dates_services.parse_date("15.04") == date(2028, 4, 15)
+    assert dates_services.parse_date("29.02.2024") == date(2024, 2, 29)
@@ -0,0 +1,40 @@
+import asyncio
+
+from src.domain.money import CurrenciesCRUD, CurrencyInDB, EquityCRUD
+from src.domain.money import services as money_services
+
+USD = CurrencyInDB(id=1, name="USD", sign="$")
+RUB = CurrencyInDB(id=2, name="RUB", sign="₽")
+
+
+def _equity(monkeypatch, balances: dict[int, tuple[int, int]]):
+    scheduled = []
+
+    async def _balances(_):
+        return balances
+
+    async def currencies(_):
+        return [USD, RUB]
+
+    monkeypatch.setattr(EquityCRUD, "balances", _balances)
+    monkeypatch.setattr(CurrenciesCRUD, "all", currencies)
+    monkeypatch.setattr(money_services, "on_commit", scheduled.append)
+
+    equity = asyncio.run(money_services.get_equity())
+
+    return {item.currency.name: item.value for item in equity}, scheduled
+
+
+def test_equity_is_snapshot_with_tail(monkeypatch):
+    equity, scheduled = _equity(monkeypatch, {2: (150_000, 3)})
+
+    assert equity == {"USD": 0, "RUB": 150_000}
+    assert not scheduled
+
+
+def test_long_tail_schedules_snapshot(monkeypatch):
+    monkeypatch.setattr(money_services, "EQUITY_SNAPSHOT_INTERVAL", 10)
+
+    _, scheduled = _equity(monkeypatch, {1: (100, 4), 2: (-50, 6)})
+
+    assert scheduled == [money_services._schedule_equity_snapshot]
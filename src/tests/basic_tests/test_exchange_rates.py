@@ -0,0 +1,130 @@
+from datetime import date
+
+import pytest
+
+from src.domain.analytics import AnalyticsResult, AnalyticsTotals, DailyTotal
+from src.domain.categories import CategoryInDB
+from src.domain.costs import Cost
+from src.domain.currency_exchange import CurrencyExchangeInDB, ExchangeRates
+from src.domain.incomes import Income
+from src.domain.money import CurrencyInDB
+from src.infrastructure.database import IncomeSource
+from src.infrastructure.errors import NotFound
+
+USD = CurrencyInDB(id=1, name="USD", sign="$")
+RUB = CurrencyInDB(id=2, name="RUB", sign="₽")
+EUR = CurrencyInDB(id=3, name="EUR", sign="€")
+
+
+def _exchange(id_: int, day: date, usd: int, rub: int):
+    return CurrencyExchangeInDB(
+        id=id_,
+        source_value=usd,
+        destination_value=rub,
+        date=day,
+        source_currency_id=USD.id,
+        destination_currency_id=RUB.id,
+        user_id=1,
+    )
+
+
+@pytest.fixture
+def rates():
+    ExchangeRates.reset()
+    ExchangeRates._LOADED = True
+    ExchangeRates.add(_exchange(1, date(2023, 3, 1), 100, 9000))
+    ExchangeRates.add(_exchange(2, date(2023, 1, 1), 100, 7000))
+
+    yield ExchangeRates
+
+    ExchangeRates.reset()
+
+
+def test_rate_as_of_date(rates):
+    assert rates.rate(USD.id, RUB.id, date(2022, 6, 1)) == 70
+    assert rates.rate(USD.id, RUB.id, date(2023, 2, 28)) == 70
+    assert rates.rate(USD.id, RUB.id, date(2023, 3, 1)) == 90
+    assert rates.rate(RUB.id, USD.id, date(2023, 4, 1)) == 1 / 90
+    assert rates.rate(USD.id, EUR.id, date(2023, 4, 1)) is None
+
+
+def test_convert_matches_rates(rates):
+    days = [date(2022, 12, 1), date(2023, 2, 1), date(2023, 5, 1)]
+    values = [100, 200, 300]
+
+    for dates in (days, days[::-1]):
+        assert rates.convert(USD.id, RUB.id, dates, values) == [
+            round(value * rates.rate(USD.id, RUB.id, day))
+            for day, value in zip(dates, values)
+        ]
+
+    assert rates.convert(EUR.id, RUB.id, days, values) is None
+
+
+def test_consolidated_representation(rates):
+    totals = AnalyticsTotals(
+        costs=[],
+        incomes=[],
+        currency_exchanges=[],
+        costs_daily=[
+            DailyTotal(
+                user_id=1,
+                currency_id=USD.id,
+                date=date(2023, 3, 5),
+                value=1000,
+                real_value=1000,
+            ),
+            DailyTotal(
+                user_id=1,
+                currency_id=EUR.id,
+                date=date(2023, 3, 5),
+                value=500,
+                real_value=500,
+            ),
+        ],
+    )
+
+    message = totals._get_consolidated_representation(
+        RUB, {currency.id: currency for currency in (USD, RUB, EUR)}
+    )
+
+    assert "Все расходы 👉 900.00" in message
+    assert "Нет курса обмена для EUR" in message
+
+
+def test_costs_to_revenue_ratio_requires_rates(rates):
+    day = date(2023, 3, 5)
+    result = AnalyticsResult(
+        costs=[
+            Cost(
+                id=1,
+                name="Еда",
+                value=450,
+                date=day,
+                user_id=1,
+                category=CategoryInDB(id=1, name="Еда"),
+                currency=RUB,
+            )
+        ],
+        incomes=[
+            Income(
+                id=1,
+                name="Зарплата",
+                value=10,
+                source=IncomeSource.REVENUE,
+                date=day,
+                user_id=1,
+                currency=USD,
+            )
+        ],
+        currency_exchanges=[],
+    )
+
+    assert result.get_costs_to_revenue_ratio(RUB) == 0.5
+
+    result.incomes[0].currency = EUR
+    with pytest.raises(NotFound):
+        result.get_costs_to_revenue_ratio(RUB)
+
+    result.incomes = []
+    assert result.get_costs_to_revenue_ratio(RUB) == 0
@@ -0,0 +1,82 @@
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+from telebot import types
+
+from src.application.errors import base_error_handler
+from src.application.messages import MessageContract
+from src.application.states import State
+from src.domain.exports import ExportsCRUD
+from src.domain.exports import services as exports_services
+from src.domain.users import User
+from src.handlers.analytics.root import export_pattern_entered_callback
+
+
+def _export(text: str) -> None:
+    """Call the handler as the router does."""
+
+    message = types.Message(
+        message_id=1,
+        from_user=None,
+        date=0,
+        chat=types.Chat(id=1, type="private"),
+        content_type="text",
+        options={"text": text},
+        json_string="",
+    )
+    user = User.construct(id=1, chat_id=1, configuration=SimpleNamespace())
+
+    @base_error_handler
+    async def handler(m: types.Message):
+        return await export_pattern_entered_callback(
+            MessageContract(m=m, state=State(user_id=-1), user=user)
+        )
+
+    asyncio.run(handler(message))
+
+
+def test_queries_are_rendered_for_copy():
+    crud = ExportsCRUD()
+    start, end = date(2024, 1, 1), date(2024, 1, 31)
+
+    for query in (
+        crud.costs(start, end),
+        crud.incomes(start, end),
+        crud.currency_exchanges(start, end),
+    ):
+        sql = str(
+            query.compile(
+                dialect=postgresql.asyncpg.dialect(),
+                compile_kwargs={"literal_binds": True},
+            )
+        )
+
+        assert "'2024-01-01'" in sql and "'2024-01-31'" in sql
+        assert "$" not in sql
+
+
+def test_mistyped_pattern_is_replied(fake_bot):
+    _export("январь")
+
+    [(method, kwargs)] = fake_bot.calls
+    assert method == "send_message"
+    assert kwargs["text"].startswith("⚠️ Некорректный шаблон даты")
+
+
+def test_empty_export_is_replied(fake_bot, monkeypatch):
+    async def export_in_range(start_date, end_date):
+        return
+        yield
+
+    monkeypatch.setattr(exports_services, "export_in_range", export_in_range)
+
+    _export("2024")
+
+    assert [method for method, _ in fake_bot.calls] == [
+        "delete_message",
+        "send_message",
+    ]
+    assert fake_bot.calls[0][1]["message_id"] == 1
+    assert fake_bot.calls[1][1]["text"] == "¯\\_(ツ)_/¯ Пусто"
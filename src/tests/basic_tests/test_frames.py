@@ -0,0 +1,55 @@
+import re
+
+from src.benchmarks.micro import yearly_dataset
+from src.domain.dates import DateFormat
+from src.infrastructure.frames import FramesBuilder, utf16_len, visible_len
+
+
+def test_lengths_in_utf16_code_units():
+    assert utf16_len("abc") == 3
+    assert utf16_len("Кофе") == 4
+    assert utf16_len("🔥") == 2
+    assert visible_len("<b>🔥 a&amp;b</b>") == 6
+
+
+def test_headers_are_repeated_after_split():
+    builder = FramesBuilder(limit=40)
+    builder.header("<b>Costs</b>\n")
+    builder.header("\n\n<b>Food</b>", level=1)
+    for index in range(10):
+        builder.add(f"\n👉 <i>item</i> {index}")
+
+    frames = builder.build()
+
+    assert len(frames) > 1
+    for frame in frames:
+        assert frame.startswith("<b>Costs</b>\n\n\n<b>Food</b>")
+        assert visible_len(frame) <= 40
+    assert sum(frame.count("👉") for frame in frames) == 10
+
+
+def test_oversized_chunk_is_split():
+    builder = FramesBuilder(limit=20)
+    builder.add("<b>" + "x" * 50 + "</b>")
+
+    frames = builder.build()
+
+    assert [visible_len(frame) for frame in frames] == [20, 20, 10]
+
+
+def test_detailed_representation_frames():
+    analytics = yearly_dataset(users=1).analytics
+
+    frames = list(analytics.get_detailed_representation(DateFormat.FULL))
+
+    assert len(frames) > 1
+    for frame in frames:
+        assert visible_len(frame) <= 4096
+        assert len(re.findall("<b>", frame)) == len(re.findall("</b>", frame))
+        assert len(re.findall("<i>", frame)) == len(re.findall("</i>", frame))
+    assert sum(frame.count("👉") for frame in frames) == (
+        len(analytics.costs)
+        + len(analytics.incomes)
+        + len(analytics.currency_exchanges)
+    )
+    assert frames[-1].count("💱") == 1
@@ -0,0 +1,101 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from src.domain.categories import CategoriesCRUD, CategoryInDB
+from src.domain.imports import ImportKind, ImportReport
+from src.domain.imports import services as imports_services
+from src.domain.money import CurrenciesCRUD, CurrencyInDB
+from src.infrastructure.cache import Cache
+from src.infrastructure.errors import UserError
+
+
+@pytest.fixture
+def references(monkeypatch):
+    async def currencies(_):
+        return [
+            CurrencyInDB(id=1, name="USD", sign="$"),
+            CurrencyInDB(id=2, name="RUB", sign="₽"),
+        ]
+
+    monkeypatch.setattr(CurrenciesCRUD, "all", currencies)
+    Cache.set(
+        CategoriesCRUD.CACHE_NAMESPACE,
+        "all",
+        [
+            CategoryInDB(id=1, name="🍽 Еда"),
+            CategoryInDB(id=2, name="🍔 Доставка еды"),
+            CategoryInDB(id=3, name="🚙 Транспорт"),
+        ],
+    )
+
+    yield
+
+    Cache.invalidate(CategoriesCRUD.CACHE_NAMESPACE)
+
+
+def _parse(lines: list[str], kind: ImportKind = ImportKind.COSTS):
+    report = ImportReport(kind=kind)
+
+    async def inner():
+        return [
+            record
+            async for batch in imports_services.parse(
+                lines, kind, default_currency_id=2, report=report
+            )
+            for record in batch
+        ]
+
+    return asyncio.run(inner()), report
+
+
+def test_parse_bank_export(references):
+    records, report = _parse(
+        [
+            "Дата операции;Сумма операции;Описание;Категория;Валюта\n",
+            "15.04.2024 12:30;-1 200,50;Кофейня;еда;\n",
+            "2024-04-16;45;Такси;🚙 Транспорт;usd\n",
+            ";;;;\n",
+            "16.04.2024;0;Пусто;еда;\n",
+            "17.04.2024;10;Ужин;нет такой;\n",
+            "17.04.2024;10;Ужин;е;\n",
+        ]
+    )
+
+    assert records == [
+        (2, "Кофейня", 120050, date(2024, 4, 15), 1, 2),
+        (3, "Такси", 4500, date(2024, 4, 16), 3, 1),
+    ]
+    assert report.read == 5
+    assert report.invalid == 3
+    assert report.errors[0] == "5: нулевое значение"
+
+
+def test_parse_incomes(references):
+    records, report = _parse(
+        ["date,value,name,source\n", "2024-04-01,1000,Зарплата,\n"],
+        kind=ImportKind.INCOMES,
+    )
+
+    assert records == [(2, "Зарплата", 100000, "REVENUE", date(2024, 4, 1), 2)]
+    assert not report.invalid
+
+
+def test_parse_requires_full_dates(references):
+    records, report = _parse(
+        [
+            "date,value,name,category\n",
+            "15.04,10,Кофе,еда\n",
+            "вчера,10,Кофе,еда\n",
+            "15.04.2024,10,Кофе,еда\n",
+        ]
+    )
+
+    assert [record[3] for record in records] == [date(2024, 4, 15)]
+    assert report.invalid == 2
+
+
+def test_parse_missing_columns(references):
+    with pytest.raises(UserError):
+        _parse(["date,value,name\n", "2024-04-01,1000,Кофе\n"])
@@ -0,0 +1,41 @@
+from src.infrastructure.cache import Cache
+from src.keyboards.default import confirmation_keyboard, default_keyboard
+from src.keyboards.models import CallbackItem
+from src.keyboards.patterns import cached_callback_patterns_keyboard
+
+
+def test_default_keyboard_is_built_once():
+    assert default_keyboard() is default_keyboard()
+
+
+def test_keyboard_is_serialized_once():
+    keyboard = confirmation_keyboard("no", "yes")
+
+    assert keyboard.to_json() is keyboard.to_json()
+    assert '"callback_data": "yes"' in keyboard.to_json()
+
+
+def test_cached_keyboard_by_content():
+    patterns = [
+        CallbackItem(name="USD $", callback_data="1"),
+        CallbackItem(name="RUB ₽", callback_data="2"),
+    ]
+
+    first = cached_callback_patterns_keyboard(patterns, namespace="test")
+    second = cached_callback_patterns_keyboard(
+        [item.copy() for item in patterns], namespace="test"
+    )
+    other = cached_callback_patterns_keyboard(patterns[:1], namespace="test")
+
+    assert first is second
+    assert first is not other
+
+
+def test_cached_keyboard_invalidation():
+    patterns = [CallbackItem(name="🍽 Еда", callback_data="1")]
+
+    first = cached_callback_patterns_keyboard(patterns, namespace="test")
+    Cache.invalidate("test")
+    second = cached_callback_patterns_keyboard(patterns, namespace="test")
+
+    assert first is not second
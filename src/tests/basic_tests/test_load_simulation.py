@@ -0,0 +1,45 @@
+import asyncio
+
+from src.benchmarks.load import Press, SimulatedBot, VirtualUser
+from src.keyboards.default import confirmation_keyboard, default_keyboard
+from src.keyboards.models import CallbackItem
+from src.keyboards.patterns import callback_patterns_keyboard
+
+
+def test_virtual_user_presses_buttons_of_the_last_inline_keyboard():
+    bot = SimulatedBot()
+    user = VirtualUser(index=0, bot=bot, seed=1)
+    keyboard = callback_patterns_keyboard(
+        [
+            CallbackItem(name=month, callback_data=f"month{month}")
+            for month in ("2024-01", "2024-02", "2024-03")
+        ]
+    )
+
+    message = asyncio.run(
+        bot.send_message(user.chat.id, text="📅", reply_markup=keyboard)
+    )
+    asyncio.run(
+        bot.send_message(
+            user.chat.id, text="⤵️", reply_markup=default_keyboard()
+        )
+    )
+    user.pressed["date"] = "2024-02-17"
+    query = user.callback_query(Press("month", like="date"))
+
+    assert query.data == "month2024-02"
+    assert query.message.id == message.id
+    assert user.callback_query(Press("category")) is None
+
+    asyncio.run(
+        bot.edit_message_text(
+            user.chat.id,
+            message.id,
+            text="?",
+            reply_markup=confirmation_keyboard("no", "yes"),
+        )
+    )
+    assert user.callback_query(Press("yes")).data == "yes"
+
+    asyncio.run(bot.edit_message_text(user.chat.id, message.id, text="✅"))
+    assert user.callback_query(Press("yes")) is None
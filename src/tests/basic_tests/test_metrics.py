@@ -0,0 +1,55 @@
+import asyncio
+
+from src.application.messages import Messages
+from src.infrastructure.metrics import (
+    COUNT_BUCKETS,
+    Histogram,
+    Metrics,
+    set_handler,
+    track_update,
+)
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+
+    for value in (0.5, 3, 3, 7, 40, 40, 40, 90, 300, 20000):
+        histogram.observe(value)
+
+    assert histogram.count == 10
+    assert histogram.percentile(0.5) == 50
+    assert histogram.percentile(0.99) == 20000
+    assert sum(histogram.snapshot().buckets.values()) == 10
+
+
+def test_histogram_counts():
+    histogram = Histogram(COUNT_BUCKETS)
+    histogram.observe(0)
+    histogram.observe(4)
+
+    assert histogram.percentile(0.5) == 0
+    assert histogram.percentile(1) == 4
+
+
+def test_update_metrics_with_fake_bot(fake_bot):
+    Metrics.reset()
+
+    async def add_cost_callback():
+        pass
+
+    @track_update
+    async def any_message():
+        set_handler(add_cost_callback)
+        await Messages.send(chat_id=1, text="⤵️", keyboard=None)
+        await Messages.delete(1, 10, 11)
+
+    asyncio.run(any_message())
+    snapshot = Metrics.snapshot()
+    handler = f"{__name__}.add_cost_callback"
+
+    assert len(fake_bot.calls) == 3
+    assert snapshot.counters[f"updates:{handler}"] == 1
+    assert snapshot.counters["telegram.calls:send_message"] == 1
+    assert snapshot.counters["telegram.calls:delete_message"] == 2
+    assert snapshot.histograms[f"update.telegram_calls:{handler}"].max == 3
+    assert snapshot.histograms[f"update.db_statements:{handler}"].max == 0
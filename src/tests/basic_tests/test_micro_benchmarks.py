@@ -0,0 +1,21 @@
+from src.benchmarks.micro import compare, get_benchmarks, yearly_dataset
+
+
+def test_benchmarks_run():
+    dataset = yearly_dataset(users=1)
+
+    for name, benchmark in get_benchmarks(dataset).items():
+        assert benchmark(), name
+
+    assert len(dataset.costs_schemas) == len(dataset.analytics.costs)
+
+
+def test_compare_with_baselines():
+    lines, regressions = compare(
+        results={"a.fast": 1.0, "a.slow": 2.0, "a.new": 1.0},
+        baselines={"a.fast": 1.0, "a.slow": 1.0},
+        threshold=1.3,
+    )
+
+    assert regressions == ["a.slow"]
+    assert "no baseline" in lines[2]
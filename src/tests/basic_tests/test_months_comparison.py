@@ -0,0 +1,122 @@
+import asyncio
+from datetime import date
+
+from telebot import types
+
+from src.application.errors import base_error_handler
+from src.application.messages import CallbackQueryContract
+from src.application.states import State
+from src.domain.analytics import (
+    COMPARISON_MONTHS,
+    ComparisonCallbackOperation,
+    CostsForecast,
+    CostsTotal,
+    MonthlyCostsTotal,
+    MonthsComparison,
+)
+from src.domain.analytics import services as analytics_services
+from src.domain.dates import services as dates_services
+from src.domain.money import CurrencyInDB
+from src.domain.users import User
+from src.handlers.analytics.root import comparison_months_selected_callback
+
+USD = CurrencyInDB(id=1, name="USD", sign="$")
+EUR = CurrencyInDB(id=3, name="EUR", sign="€")
+
+
+def test_last_months():
+    months = dates_services.last_months(13)
+
+    assert len(months) == 13
+    assert months[-1] == date.today().replace(day=1)
+    assert months[0] == months[-1].replace(year=months[-1].year - 1)
+    assert months == sorted(set(months))
+
+
+def test_representation_deltas():
+    months = [date(2023, 1, 1), date(2023, 2, 1), date(2023, 3, 1)]
+    comparison = MonthsComparison(
+        months=months,
+        totals=[
+            MonthlyCostsTotal(
+                month=months[0], currency_id=1, category_name="Еда", value=100
+            ),
+            MonthlyCostsTotal(
+                month=months[2], currency_id=1, category_name="Еда", value=50
+            ),
+            MonthlyCostsTotal(
+                month=months[2], currency_id=1, category_name="<Дом>", value=80
+            ),
+        ],
+    )
+
+    frames = list(comparison.get_representation([USD, EUR]))
+
+    assert len(frames) == 1
+    assert "EUR" not in frames[0]
+    assert frames[0].index("&lt;Дом&gt;") < frames[0].index("Еда")
+    assert "2023-02</i>  0.00  🔻 1.00 <i>(-100.0%)</i>" in frames[0]
+    assert frames[0].endswith("2023-03</i>  0.50  🔺 0.50")
+
+
+def test_forecast_by_run_rate():
+    forecast = CostsForecast(
+        today=date(2023, 4, 10),
+        costs=[
+            CostsTotal(
+                user_id=1, currency_id=1, category_name="Еда", value=1000
+            ),
+            CostsTotal(
+                user_id=2, currency_id=1, category_name="Дом", value=500
+            ),
+        ],
+    )
+
+    assert forecast.project(1000) == 3000
+    assert forecast._get_representation(EUR) == ""
+    assert "Все расходы 👉 45.00" in forecast._get_representation(USD)
+    assert "Дом" not in forecast.by_user(1)._get_representation(USD)
+
+
+def test_empty_comparison_is_replied(fake_bot, monkeypatch):
+    async def get_months_comparison(months):
+        return
+        yield
+
+    monkeypatch.setattr(
+        analytics_services, "get_months_comparison", get_months_comparison
+    )
+    message = types.Message(
+        message_id=1,
+        from_user=None,
+        date=0,
+        chat=types.Chat(id=1, type="private"),
+        content_type="text",
+        options={},
+        json_string="",
+    )
+    query = types.CallbackQuery(
+        id="1",
+        from_user=None,
+        data=(
+            f"{ComparisonCallbackOperation.SELECT_MONTHS}"
+            f"{COMPARISON_MONTHS[0]}"
+        ),
+        chat_instance="",
+        json_string="",
+        message=message,
+    )
+
+    @base_error_handler
+    async def handler(q: types.CallbackQuery):
+        return await comparison_months_selected_callback(
+            CallbackQueryContract(
+                q=q, state=State(user_id=-1), user=User.construct(chat_id=1)
+            )
+        )
+
+    asyncio.run(handler(query))
+
+    method, kwargs = fake_bot.calls[-1]
+    assert method == "edit_message_text"
+    assert kwargs["text"] == "¯\\_(ツ)_/¯ Пусто"
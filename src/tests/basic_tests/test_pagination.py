@@ -0,0 +1,164 @@
+import asyncio
+from datetime import date
+
+import pytest
+from telebot import types
+
+from src.application.messages import CallbackQueryContract
+from src.application.states import State
+from src.domain.categories import CategoryInDB
+from src.domain.costs import CostsCRUD, DeleteCostCallbackOperation
+from src.domain.incomes import DeleteIncomeCallbackOperation, IncomesCRUD
+from src.domain.users import User
+from src.handlers import delete_cost
+from src.handlers.incomes import delete as delete_income
+from src.infrastructure.errors import ValidationError
+from src.infrastructure.pagination import Cursor, Page
+from src.keyboards.models import CallbackItem
+from src.keyboards.patterns import paginated_callback_patterns_keyboard
+
+
+class Row:
+    def __init__(self, id_: int):
+        self.id = id_
+        self.date = date(2024, 4, 1 + id_ // 10)
+
+    def repr(self) -> str:
+        return f"Запись {self.id}"
+
+
+ROWS = [Row(id_) for id_ in range(1, 26)]
+
+
+def test_cursor_encoding():
+    cursor = Cursor(date=date(2024, 4, 15), id=1234567, backward=True)
+    payload = cursor.encode()
+
+    assert Cursor.decode(payload) == cursor
+    assert len(DeleteCostCallbackOperation.SELECT_PAGE + payload) <= 64
+
+    with pytest.raises(ValidationError):
+        Cursor.decode(">2024-04")
+
+
+def test_first_and_next_pages():
+    first = Page.build(ROWS[:11], cursor=None, size=10)
+
+    assert [row.id for row in first.items] == list(range(1, 11))
+    assert first.previous is None
+    assert first.next == Cursor(date=ROWS[9].date, id=10)
+
+    last = Page.build(ROWS[20:], cursor=first.next, size=10)
+
+    assert [row.id for row in last.items] == list(range(21, 26))
+    assert last.previous == Cursor(date=ROWS[20].date, id=21, backward=True)
+    assert last.next is None
+
+
+def test_previous_page():
+    # Rows are fetched in the descending order by the backward cursor
+    cursor = Cursor(date=ROWS[10].date, id=11, backward=True)
+    page = Page.build(ROWS[:10][::-1], cursor=cursor, size=10)
+
+    assert [row.id for row in page.items] == list(range(1, 11))
+    assert page.previous is None
+    assert page.next == Cursor(date=ROWS[9].date, id=10)
+
+
+def test_navigation_buttons():
+    page = Page.build(ROWS[:11], cursor=None, size=10)
+    keyboard = paginated_callback_patterns_keyboard(
+        [CallbackItem(name=str(row.id)) for row in page.items],
+        page=page,
+        page_operation=DeleteCostCallbackOperation.SELECT_PAGE,
+    )
+    navigation = keyboard.keyboard[-1]
+
+    assert [button.text for button in navigation] == ["➡️"]
+    assert navigation[0].callback_data.startswith(
+        DeleteCostCallbackOperation.SELECT_PAGE
+    )
+
+
+def _press(state: State, data: str) -> None:
+    """Call the next callback as the router does."""
+
+    message = types.Message(
+        message_id=1,
+        from_user=None,
+        date=0,
+        chat=types.Chat(id=1, type="private"),
+        content_type="text",
+        options={},
+        json_string="",
+    )
+    query = types.CallbackQuery(
+        id="1",
+        from_user=None,
+        data=data,
+        chat_instance="",
+        json_string="",
+        message=message,
+    )
+
+    callback, state.next_callback = state.next_callback, None
+    asyncio.run(
+        callback(
+            CallbackQueryContract(q=query, state=state, user=User.construct())
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "crud, handlers, page_operation, select_operation, selected",
+    (
+        (
+            CostsCRUD,
+            delete_cost,
+            DeleteCostCallbackOperation.SELECT_PAGE,
+            DeleteCostCallbackOperation.SELECT_COST,
+            "cost",
+        ),
+        (
+            IncomesCRUD,
+            delete_income,
+            DeleteIncomeCallbackOperation.SELECT_PAGE,
+            DeleteIncomeCallbackOperation.SELECT_INCOME,
+            "income",
+        ),
+    ),
+)
+def test_item_is_selected_after_the_page_is_turned(
+    monkeypatch,
+    fake_bot,
+    crud,
+    handlers,
+    page_operation,
+    select_operation,
+    selected,
+):
+    async def page_for_delete(self, cursor=None, **kwargs):
+        return Page.build(ROWS[10:], cursor=cursor, size=10)
+
+    monkeypatch.setattr(crud, "page_for_delete", page_for_delete)
+
+    selected_callback = getattr(handlers, f"{selected}_selected_callback")
+    state = State(user_id=-1)
+    state.data.month = "2024-04"
+    state.data.category = CategoryInDB(id=1, name="Еда")
+    state.next_callback = selected_callback
+
+    cursor = Cursor(date=ROWS[9].date, id=10)
+    _press(state, f"{page_operation}{cursor.encode()}")
+    assert state.next_callback is selected_callback
+
+    _press(state, f"{select_operation}11")
+    assert getattr(state.data, f"{selected}_id") == 11
+    assert state.next_callback is handlers.confirmation_selected_callback
+    assert [method for method, _ in fake_bot.calls] == [
+        "edit_message_text",
+        "edit_message_text",
+    ]
+
+    state.clear_data()
+    state.next_callback = None
@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+from src.benchmarks.queries import check
+from src.infrastructure.metrics import CTX_UPDATE, UpdateMetrics
+from src.infrastructure.profiling import (
+    Profiler,
+    ProfilingReport,
+    statement_shape,
+)
+
+
+def _execute(statement: str, parameters: tuple = ()) -> None:
+    context = SimpleNamespace()
+    Profiler._before_execute(None, None, statement, parameters, context)
+    Profiler._after_execute(None, None, statement, parameters, context)
+
+
+def test_statement_shape():
+    assert statement_shape(
+        "SELECT * FROM costs\n WHERE id = $1::INTEGER LIMIT 10"
+    ) == statement_shape("SELECT * FROM costs WHERE id = $2::INTEGER LIMIT 1")
+    assert statement_shape("SELECT 1 WHERE id IN ($1, $2, $3)") == (
+        "SELECT ? WHERE id IN (?, ...)"
+    )
+
+
+def test_n_plus_one_suspects(monkeypatch):
+    Profiler.reset()
+    monkeypatch.setattr(Profiler, "slow_query_ms", 10_000)
+
+    for _ in range(2):
+        token = CTX_UPDATE.set(UpdateMetrics(handler="analytics"))
+        _execute("SELECT * FROM users WHERE id = $1::INTEGER", (1,))
+        for id_ in range(5):
+            _execute("SELECT * FROM currencies WHERE id = $1::INTEGER", (id_,))
+        CTX_UPDATE.reset(token)
+
+    report = Profiler.report()
+
+    assert report.statements == 12
+    assert len(report.n_plus_one) == 1
+    assert report.n_plus_one[0].repeats == 5
+    assert report.n_plus_one[0].updates == 2
+    assert check(report, max_slow_queries=0, max_n_plus_one=0)
+    assert not check(report, max_slow_queries=0, max_n_plus_one=1)
+
+
+def test_slow_queries_without_explain(monkeypatch):
+    Profiler.reset()
+    monkeypatch.setattr(Profiler, "slow_query_ms", 0)
+    monkeypatch.setattr(Profiler, "explain", False)
+
+    _execute("SELECT * FROM costs WHERE value > $1::INTEGER", ("x" * 500,))
+    (query,) = Profiler.report().slow_queries
+
+    assert query.handler is None
+    assert query.plan is None
+    assert query.parameters.endswith("...")
+
+
+def test_report_dump(tmp_path):
+    Profiler.reset()
+    path = tmp_path / "report.json"
+    Profiler.report().dump(path)
+
+    assert ProfilingReport.model_validate_json(path.read_text()) == (
+        Profiler.report()
+    )
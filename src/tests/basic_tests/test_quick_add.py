@@ -0,0 +1,152 @@
+import asyncio
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from telebot import types
+
+from src.application.errors import base_error_handler
+from src.application.messages import MessageContract
+from src.application.states import State
+from src.domain.categories import CategoriesCRUD, CategoryInDB
+from src.domain.costs import QUICK_ADD_REGEX
+from src.domain.costs import services as costs_services
+from src.infrastructure.cache import Cache
+from src.domain.users import User
+from src.handlers.add_cost import quick_add_callback
+from src.infrastructure.errors import UserError
+
+
+@pytest.fixture
+def categories():
+    Cache.set(
+        CategoriesCRUD.CACHE_NAMESPACE,
+        "all",
+        [
+            CategoryInDB(id=1, name="🍽 Еда"),
+            CategoryInDB(id=2, name="🍔 Доставка еды"),
+            CategoryInDB(id=3, name="🚙 Транспорт"),
+            CategoryInDB(id=4, name="🚌 Оплата дорог"),
+        ],
+    )
+
+    yield
+
+    Cache.invalidate(CategoriesCRUD.CACHE_NAMESPACE)
+
+
+def _quick_add(text: str) -> None:
+    """Call the handler as the router does."""
+
+    message = types.Message(
+        message_id=1,
+        from_user=None,
+        date=0,
+        chat=types.Chat(id=1, type="private"),
+        content_type="text",
+        options={"text": text},
+        json_string="",
+    )
+    user = User.construct(
+        id=1,
+        chat_id=1,
+        configuration=SimpleNamespace(default_currency=SimpleNamespace(id=2)),
+    )
+
+    @base_error_handler
+    async def handler(m: types.Message):
+        return await quick_add_callback(
+            MessageContract(m=m, state=State(user_id=-1), user=user)
+        )
+
+    asyncio.run(handler(message))
+
+
+def _parse(text: str):
+    return asyncio.run(
+        costs_services.parse_quick_add(text, user_id=1, currency_id=2)
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    ("450 кофе @еда", " 12,50 кофе с собой @еда вчера ", "1 a @b 2024-01-31"),
+)
+def test_grammar_matches(text):
+    assert QUICK_ADD_REGEX.fullmatch(text)
+
+
+@pytest.mark.parametrize(
+    "text", ("кофе 450 @еда", "450 @еда", "450 кофе", "💵 Добавить расходы")
+)
+def test_grammar_does_not_match(text):
+    assert not QUICK_ADD_REGEX.fullmatch(text)
+
+
+def test_parse_quick_add(categories):
+    cost = _parse("12,50 кофе с собой @еда вчера")
+
+    assert cost.value == 1250
+    assert cost.name == "кофе с собой"
+    assert cost.category_id == 1
+    assert cost.currency_id == 2
+    assert cost.date == date.today() - timedelta(days=1)
+
+    assert _parse("300 такси @трансп").category_id == 3
+    assert _parse("300 бензин @Оплата 15.04").date.month == 4
+
+
+def test_parse_quick_add_errors(categories):
+    with pytest.raises(UserError, match="не найдена"):
+        _parse("450 кофе @кино")
+
+    with pytest.raises(UserError, match="Уточните"):
+        _parse("450 кофе @до")
+
+    with pytest.raises(UserError, match="Формат"):
+        _parse("450 кофе @еда когда-то")
+
+
+def test_parse_quick_add_lines(categories):
+    schemas = asyncio.run(
+        costs_services.parse_quick_add_lines(
+            "450 кофе @еда\n\n 300 такси @трансп вчера\n",
+            user_id=1,
+            currency_id=2,
+        )
+    )
+    assert [schema.value for schema in schemas] == [45000, 30000]
+
+    with pytest.raises(UserError) as error:
+        asyncio.run(
+            costs_services.parse_quick_add_lines(
+                "450 кофе @еда\nкофе\n10 a @кино", user_id=1, currency_id=2
+            )
+        )
+    assert "2. некорректный ввод" in str(error.value)
+    assert "3. ⚠️ Категория кино не найдена" in str(error.value)
+
+
+@pytest.mark.parametrize(
+    "text, reply",
+    (
+        ("450 кофе @кино", "⚠️ Категория кино не найдена"),
+        ("450 кофе @до", "🤔 Уточните категорию"),
+    ),
+)
+def test_quick_add_error_is_replied(categories, fake_bot, text, reply):
+    _quick_add(text)
+
+    [(method, kwargs)] = fake_bot.calls
+    assert method == "send_message"
+    assert kwargs["text"].startswith(reply)
+
+
+def test_quick_add_lines_report_is_replied(categories, fake_bot):
+    _quick_add("450 кофе @еда\nкофе\n10 a @кино")
+
+    [(method, kwargs)] = fake_bot.calls
+    assert method == "send_message"
+    assert kwargs["text"].startswith("⚠️ Расходы не были сохранены")
+    assert "2. некорректный ввод" in kwargs["text"]
+    assert "3. ⚠️ Категория кино не найдена" in kwargs["text"]
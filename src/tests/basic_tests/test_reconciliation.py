@@ -0,0 +1,257 @@
+import asyncio
+from datetime import date
+
+from sqlalchemy import create_engine, insert
+
+from src.domain.money import EquitySource
+from src.domain.reconciliation import (
+    Checkpoint,
+    CheckpointRange,
+    EntryDiscrepancy,
+    ReconciliationCRUD,
+    ReconciliationReport,
+)
+from src.domain.reconciliation import services as reconciliation_services
+from src.infrastructure.database import CostSchema, EquityMovementSchema
+
+
+class _Snapshots:
+    """Snapshots by movements ids over movements of one currency."""
+
+    def __init__(self, movements: dict[int, int], snapshots: dict[int, int]):
+        self.movements = movements
+        self.snapshots = snapshots
+
+    async def base_snapshot_id(self, before: int) -> int:
+        return max((id_ for id_ in self.snapshots if id_ <= before), default=0)
+
+    async def snapshot(self, movement_id: int) -> dict[int, int]:
+        return {1: self.snapshots[movement_id]}
+
+    async def snapshots_ids(
+        self, snapshots: CheckpointRange, outstanding=()
+    ) -> list[int]:
+        return sorted(
+            id_
+            for id_ in self.snapshots
+            if snapshots.last_id < id_ <= snapshots.horizon_id
+            or id_ in outstanding
+        )
+
+    async def movements_totals(self, after: int, until: int) -> dict[int, int]:
+        return {
+            1: sum(
+                value
+                for id_, value in self.movements.items()
+                if after < id_ <= until
+            )
+        }
+
+
+def test_broken_snapshot_does_not_become_base():
+    crud = _Snapshots(
+        movements={1: 100, 2: -30, 3: 50, 4: -20},
+        snapshots={2: 70, 3: 999, 4: 100},
+    )
+
+    discrepancies = asyncio.run(
+        reconciliation_services._check_snapshots(
+            crud, CheckpointRange(last_id=0, horizon_id=4)
+        )
+    )
+
+    assert [(item.movement_id, item.expected) for item in discrepancies] == [
+        (3, 120)
+    ]
+
+
+def test_checked_snapshots_are_skipped():
+    crud = _Snapshots(movements={1: 100, 2: 5}, snapshots={1: 0, 2: 105})
+
+    discrepancies = asyncio.run(
+        reconciliation_services._check_snapshots(
+            crud, CheckpointRange(last_id=1, horizon_id=2)
+        )
+    )
+
+    assert [(item.movement_id, item.expected) for item in discrepancies] == [
+        (2, 5)
+    ]
+
+
+def test_outstanding_snapshots_are_checked_again():
+    crud = _Snapshots(
+        movements={1: 100, 2: -30, 3: 50, 4: -20},
+        snapshots={1: 100, 2: 0, 3: 120, 4: 100},
+    )
+
+    discrepancies = asyncio.run(
+        reconciliation_services._check_snapshots(
+            crud, CheckpointRange(last_id=3, horizon_id=4), outstanding=[2]
+        )
+    )
+
+    assert [(item.movement_id, item.expected) for item in discrepancies] == [
+        (2, 70)
+    ]
+
+
+class _Checkpoints:
+    """Checkpoints and outstanding ids which are kept between runs."""
+
+    def __init__(self, max_ids: dict[Checkpoint, int]):
+        self.max_ids_ = max_ids
+        self.checkpoints_: dict[Checkpoint, CheckpointRange] = {}
+        self.outstanding_: dict[Checkpoint, list[int]] = {}
+        self.checked: dict[EquitySource, list[int]] = {}
+
+    async def checkpoints(self):
+        return self.checkpoints_
+
+    async def outstanding(self):
+        return self.outstanding_
+
+    async def max_ids(self):
+        return self.max_ids_
+
+    async def entries_discrepancies(
+        self, source, entries, movements, outstanding
+    ):
+        self.checked[source] = list(outstanding)
+        if source != EquitySource.COSTS or 3 not in (
+            *outstanding,
+            *range(entries.last_id + 1, entries.horizon_id + 1),
+        ):
+            return []
+
+        return [
+            EntryDiscrepancy(
+                source=source, entry_id=3, currency_id=1, expected=-5, actual=0
+            )
+        ]
+
+    async def base_snapshot_id(self, before):
+        return 0
+
+    async def snapshots_ids(self, snapshots, outstanding):
+        return []
+
+    async def save_checkpoints(self, checkpoints):
+        self.checkpoints_ = checkpoints
+
+    async def save_outstanding(self, outstanding):
+        self.outstanding_ = {
+            name: sorted(ids) for name, ids in outstanding.items()
+        }
+
+
+def test_unrepaired_discrepancies_do_not_hold_checkpoints(monkeypatch):
+    crud = _Checkpoints({name: 5 for name in Checkpoint})
+    monkeypatch.setattr(
+        reconciliation_services, "ReconciliationCRUD", lambda: crud
+    )
+
+    report = asyncio.run(reconciliation_services.reconcile())
+
+    assert [item.entry_id for item in report.entries] == [3]
+    assert crud.outstanding_ == {Checkpoint.COSTS: [3]}
+    assert all(
+        range_ == CheckpointRange(last_id=5, horizon_id=5)
+        for range_ in crud.checkpoints_.values()
+    )
+
+    crud.max_ids_ = {name: 9 for name in Checkpoint}
+    report = asyncio.run(reconciliation_services.reconcile())
+
+    assert crud.checked[EquitySource.COSTS] == [3]
+    assert [item.entry_id for item in report.entries] == [3]
+    assert crud.checkpoints_[Checkpoint.COSTS] == CheckpointRange(
+        last_id=5, horizon_id=9
+    )
+
+
+def test_report_lists_discrepancies():
+    report = ReconciliationReport(
+        ranges={"costs": CheckpointRange(last_id=10, horizon_id=20)},
+        entries=[
+            {
+                "source": "costs",
+                "entry_id": 15,
+                "currency_id": 2,
+                "expected": -500,
+                "actual": 0,
+            }
+        ],
+    )
+
+    assert report.repr().splitlines() == [
+        "costs: 10 < id <= 20",
+        "Расхождения записей 👉 1",
+        "Расхождения снимков 👉 0",
+        "",
+        "costs #15, валюта 2: ожидалось -500, в движениях 0",
+    ]
+
+
+class _SyncSession:
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def execute(self, query):
+        return self.connection.execute(query)
+
+
+def test_entries_discrepancies():
+    engine = create_engine("sqlite://")
+    CostSchema.metadata.create_all(
+        engine,
+        tables=[CostSchema.__table__, EquityMovementSchema.__table__],
+    )
+    day = date(2024, 4, 1)
+
+    with engine.connect() as connection:
+        connection.execute(
+            insert(CostSchema),
+            [
+                dict(id=id_, name="", value=value, date=day, currency_id=1)
+                for id_, value in ((1, 100), (2, 50), (3, 70))
+            ],
+        )
+        connection.execute(
+            insert(EquityMovementSchema),
+            [
+                dict(
+                    id=id_,
+                    entry_id=entry_id,
+                    currency_id=currency_id,
+                    value=value,
+                    date=day,
+                    source=EquitySource.COSTS,
+                )
+                for id_, entry_id, currency_id, value in (
+                    (1, 1, 1, -100),
+                    (2, 3, 1, -60),
+                    # The orphan movement of the entry
+                    (3, 2, 2, -5),
+                    # The compensation of the reconciled entry
+                    (4, 1, 1, 100),
+                    # The movement beyond the horizon of entries
+                    (5, 5, 1, -1),
+                )
+            ],
+        )
+
+        crud = ReconciliationCRUD()
+        crud._session = _SyncSession(connection)
+        discrepancies = asyncio.run(
+            crud.entries_discrepancies(
+                EquitySource.COSTS,
+                entries=CheckpointRange(last_id=1, horizon_id=3),
+                movements=CheckpointRange(last_id=2, horizon_id=10),
+            )
+        )
+
+    assert [
+        (item.entry_id, item.currency_id, item.expected, item.actual)
+        for item in discrepancies
+    ] == [(1, 1, -100, 0), (2, 1, -50, 0), (2, 2, 0, -5), (3, 1, -70, -60)]
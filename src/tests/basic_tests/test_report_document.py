@@ -0,0 +1,61 @@
+import asyncio
+import importlib
+from datetime import date
+
+from src import settings
+
+from src.application.messages import Messages
+from src.benchmarks.micro import yearly_dataset
+
+
+def test_detailed_document_has_all_lines():
+    analytics = yearly_dataset(users=1).analytics
+    analytics.costs[0].name = "<script>"
+
+    document = analytics.get_detailed_document(
+        date(2023, 1, 1), date(2023, 12, 31)
+    )
+    with document.file:
+        content = document.file.read().decode()
+
+    assert document.file_name == "report 2023-01-01 - 2023-12-31.html"
+    assert content.count("<tr>") == (
+        len(analytics.costs)
+        + len(analytics.incomes)
+        + len(analytics.currency_exchanges)
+    )
+    assert "&lt;script&gt;" in content
+    assert "<script>" not in content
+
+
+def test_document_is_sent_once(fake_bot):
+    document = yearly_dataset(users=1).analytics.get_detailed_document(
+        date(2023, 1, 1), date(2023, 12, 31)
+    )
+
+    with document.file:
+        asyncio.run(
+            Messages.send_document(
+                chat_id=1,
+                document=document.file,
+                file_name=document.file_name,
+                keyboard=None,
+            )
+        )
+
+    [(method, kwargs)] = fake_bot.calls
+    assert method == "send_document"
+    assert kwargs["visible_file_name"] == document.file_name
+
+
+def test_document_max_lines_setting(monkeypatch):
+    monkeypatch.setenv("TELEGRAM_REPORT_DOCUMENT_MAX_LINES", "")
+    reloaded = importlib.reload(settings)
+    assert reloaded.TELEGRAM_REPORT_DOCUMENT_MAX_LINES is None
+
+    monkeypatch.setenv("TELEGRAM_REPORT_DOCUMENT_MAX_LINES", "50")
+    reloaded = importlib.reload(settings)
+    assert reloaded.TELEGRAM_REPORT_DOCUMENT_MAX_LINES == 50
+
+    monkeypatch.delenv("TELEGRAM_REPORT_DOCUMENT_MAX_LINES")
+    importlib.reload(settings)
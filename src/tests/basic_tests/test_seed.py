@@ -0,0 +1,64 @@
+import asyncio
+from collections import Counter
+from datetime import date
+
+from src.benchmarks.seed import LedgerGenerator, _insert_equity
+
+
+def _generator(seed: int) -> LedgerGenerator:
+    return LedgerGenerator(
+        seed=seed,
+        users={1: 10, 2: 11},
+        categories=list(range(1, 11)),
+        currencies={10: 1.0, 11: 0.011},
+        first_date=date(2023, 1, 1),
+        last_date=date(2023, 12, 31),
+        costs_per_day=3,
+    )
+
+
+def test_ledger_is_reproducible_by_seed():
+    first, second = _generator(seed=1), _generator(seed=1)
+
+    assert list(first.costs()) == list(second.costs())
+    assert list(first.incomes()) == list(second.incomes())
+    assert list(first.exchanges()) == list(second.exchanges())
+    assert list(_generator(seed=2).costs()) != list(_generator(seed=1).costs())
+
+
+def test_ledger_distributions():
+    generator = _generator(seed=1)
+    costs = list(generator.costs())
+    categories = Counter(cost[4] for cost in costs)
+    (top_category, top_amount), *_, (_, last_amount) = (
+        categories.most_common()
+    )
+
+    assert 2 * 365 * 3 * 0.9 < len(costs) < 2 * 365 * 3 * 1.1
+    assert top_category == generator.categories[0]
+    assert top_amount > 5 * last_amount
+    assert {cost[2].month for cost in costs} == set(range(1, 13))
+    assert {income[2] for income in generator.incomes()} >= {"REVENUE"}
+
+
+def test_equity_is_derived_from_entries_of_the_run():
+    class Connection:
+        def __init__(self):
+            self.statements: list[tuple[str, tuple]] = []
+
+        async def execute(self, query: str, *args):
+            self.statements.append((query, args))
+
+    connection = Connection()
+    asyncio.run(
+        _insert_equity(
+            connection, {"costs": 30, "incomes": 20, "currency_exchange": 10}
+        )
+    )
+    (movements, movements_args), (snapshot, _) = connection.statements
+
+    assert movements.startswith("INSERT INTO equity_movements")
+    assert movements.count("WHERE id > $") == 4
+    assert movements_args == (30, 20, 10)
+    assert snapshot.startswith("INSERT INTO equity_snapshots")
+    assert "ON CONFLICT" in snapshot
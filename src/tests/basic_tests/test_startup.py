@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from src.application.startup import StartupReport
+
+
+def test_startup_report_measures_phases():
+    report = StartupReport()
+
+    with report.measure("imports"):
+        pass
+
+    assert [phase.name for phase in report.phases] == ["imports"]
+    assert report.phases[0].duration >= 0
+    assert report.ready
+
+
+def test_startup_report_keeps_failed_phase():
+    report = StartupReport()
+
+    with pytest.raises(ValueError):
+        with report.measure("bot"):
+            raise ValueError("no token")
+
+    assert report.phases[0].error
+    assert not report.ready
+
+
+def test_warm_up_errors_are_reported_only():
+    report = StartupReport()
+
+    async def _broken():
+        raise ConnectionRefusedError
+
+    asyncio.run(report.measure_coro("pool", _broken()))
+
+    assert report.phases[0].name == "pool"
+    assert "ConnectionRefusedError" in report.represent()
@@ -1,10 +1,6 @@
 #!/bin/sh
 
-echo "Waiting for database to be ready..."
-sleep 5
-
-echo "Running database migrations..."
-alembic upgrade head
-
+# NOTE: The bot waits for the database and applies migrations on startup
+#       only if the schema is not on the head revision
 echo "Starting Budget Planning Bot..."
-python3 -m src.run
\ No newline at end of file
+python3 -m src.run